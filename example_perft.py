@@ -0,0 +1,27 @@
+import argparse
+import time
+
+import tilewe
+
+def run_perft(): 
+    parser = argparse.ArgumentParser(description="Counts move generation nodes and reports nodes/sec")
+    parser.add_argument("--depth", type=int, default=3, help="maximum depth to search")
+    parser.add_argument("--players", type=int, default=4, help="number of players")
+    parser.add_argument("--divide", action="store_true", help="print the node count after each root move")
+    args = parser.parse_args()
+
+    board = tilewe.Board(args.players)
+
+    for depth in range(1, args.depth + 1): 
+        start = time.perf_counter()
+        nodes = board.perft(depth)
+        seconds = time.perf_counter() - start
+
+        print(f"Depth {depth}: {nodes:>12} nodes in {seconds:8.3f}s ({nodes / max(seconds, 1e-9):,.0f} nodes/sec)")
+
+    if args.divide: 
+        for move, nodes in sorted(board.perft(args.depth, divide=True).items(), key=lambda x: str(x[0])): 
+            print(f"{str(move):12} {nodes}")
+
+if __name__ == '__main__':
+    run_perft()
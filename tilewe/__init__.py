@@ -3,6 +3,9 @@ import sys
 if sys.version_info[0] != 3 or sys.version_info[1] < 10:
     raise Exception("Requires Python 3.10+")
 
+from array import array  # noqa: E402
+from typing import Iterator  # noqa: E402
+
 Tile = int
 Piece = int 
 Rotation = int 
@@ -83,6 +86,9 @@ COLOR_NAMES = [
     'blue', 'yellow', 'red', 'green'
 ]
 
+# number of 20x20 planes returned by Board.feature_planes
+FEATURE_PLANE_COUNT: int = 4 * COLOR_COUNT
+
 PIECES = [
     O1, I2, I3, L3, O4, I4, L4, 
     Z4, T4, F5, I5, L5, N5, P5, 
@@ -141,8 +147,29 @@ def piece_contacts(piece: Piece, rotation: Rotation) -> list[Tile]:
     """
     ...
 
+def unpack_moves(moves) -> tuple[array, array, array, array]: 
+    """
+    Splits packed moves (or any iterable of moves) into arrays of pieces ('B'), 
+    rotations ('B'), contacts ('H'), and to_tiles ('H')
+    """
+    ...
+
+def move_to_index(move: 'Move | int') -> int: 
+    """
+    Gets a move's index in the action space, between 0 and ACTION_COUNT. 
+    Rotations that cover the same tiles share an index
+    """
+    ...
+
+def index_to_move(index: int) -> 'Move': 
+    """Gets the move with an action index, using the first rotation that covers its tiles"""
+    ...
+
 class Move: 
-    """Represents a board move"""
+    """
+    Represents a board move. Moves are immutable and shared: constructing or
+    generating the same move again returns the same object
+    """
 
     def __init__(piece: Piece, rotation: Rotation, contact: Tile, to_tile: Tile): 
         """Creates a move"""
@@ -168,6 +195,16 @@ class Move:
         """Tile that the move's contact will be placed at"""
         ...
 
+    @property 
+    def packed(self) -> int: 
+        """The move packed into a single integer"""
+        ...
+
+    @classmethod 
+    def from_packed(cls, value: int) -> 'Move': 
+        """Creates a move from its packed integer form"""
+        ...
+
 class Board: 
     """Represents a tilewe board"""
 
@@ -210,20 +247,86 @@ class Board:
         """Whether the game is done"""
         ...
 
-    def generate_legal_moves(self, for_player: Color=None) -> list[Move]: 
-        """Generates moves"""
+    @property 
+    def zobrist(self) -> int: 
+        """
+        64-bit hash of the position (tiles, used pieces, turn, and player count), 
+        updated incrementally by push and pop. Boards hash by this key and compare 
+        equal when they hold the same position, even if reached by different move orders
+        """
+        ...
+
+    @property 
+    def move_cache(self) -> bool: 
+        """
+        Set to True to keep each player's legal moves per open corner and only regenerate 
+        corners near the tiles that changed since, which makes generating and counting 
+        moves after push and pop incremental. Cached moves are grouped by corner, so 
+        `generate_legal_moves` may return them in a different order. Copies keep the setting
+        """
+        ...
+
+    @move_cache.setter 
+    def move_cache(self, enabled: bool) -> None: 
+        ...
+
+    def generate_legal_moves(
+        self, 
+        for_player: Color=None, 
+        unique: bool=True, 
+        pieces: list[Piece]=None, 
+        corners: list[Tile]=None
+    ) -> list[Move]: 
+        """
+        Generates moves, `unique` skips rotations that cover the same 
+        tiles as an earlier rotation of the same piece. `pieces` and `corners` 
+        limit generation to those pieces and open corners
+        """
         ... 
 
-    def push(self, move: Move) -> None: 
-        """Play a move"""
+    def iter_legal_moves(
+        self, 
+        for_player: Color=None, 
+        pieces: list[Piece]=None, 
+        corners: list[Tile]=None, 
+        unique: bool=True
+    ) -> Iterator[Move]: 
+        """
+        Lazily generates the same moves as `generate_legal_moves`, one open corner and piece at
+        a time, so stopping early skips the rest of the work. `pieces` and `corners` limit the
+        search to those pieces and open corners. Pushing or popping moves during iteration 
+        raises a RuntimeError on the next step
+        """
+        ...
+
+    def generate_legal_moves_packed(
+        self, 
+        for_player: Color=None, 
+        unique: bool=True, 
+        pieces: list[Piece]=None, 
+        corners: list[Tile]=None
+    ) -> array: 
+        """Generates moves as an array('I') of packed moves"""
+        ... 
+
+    def reset(self, n_players: int=None) -> None: 
+        """Starts a new game on this board, keeping the number of players by default"""
+        ...
+
+    def load_from(self, other: 'Board') -> None: 
+        """Overwrites this board with a copy of `other`'s state, like `other.copy()` without a new object"""
+        ...
+
+    def push(self, move: Move | int) -> None: 
+        """Play a move or a packed move"""
         ...
 
     def pop(self) -> None: 
         """Undo a move"""
         ...
 
-    def n_legal_moves(self, for_player: Color=None) -> int: 
-        """Gets total number of legal moves for a player"""
+    def n_legal_moves(self, for_player: Color=None, pieces: list[Piece]=None, corners: list[Tile]=None) -> int: 
+        """Gets total number of legal moves for a player, optionally only for some pieces and open corners"""
         ...
 
     def n_remaining_pieces(self, for_player: Color=None) -> int: 
@@ -254,8 +357,181 @@ class Board:
         """Whether a move is legal for a player"""
         ...
 
+    def feature_planes(self, planes=None, pieces=None, perspective: bool=True) -> tuple[memoryview, memoryview]: 
+        """
+        Gets the board as FEATURE_PLANE_COUNT x 20 x 20 planes indexed by [plane][y][x], in groups 
+        of 4 (one per player): claimed tiles, open corners, forbidden tiles (claimed or next to 
+        the player's own tiles) and side to move (all ones for the player to move), along with a 
+        4 x 21 mask of each player's remaining pieces. Missing players are all zeros. 
+        With `perspective` player slots start from the current player instead of BLUE. 
+        Writes into `planes` and `pieces` if given (writable uint8 or float32 buffers of the same 
+        size, such as numpy arrays) and returns them, otherwise returns new uint8 views
+        """
+        ...
+
+    def perft(self, depth: int, divide: bool=False) -> int | dict[Move, int]: 
+        """
+        Counts the positions reached after exactly `depth` moves (unique rotations only), 
+        or with `divide` the count after each legal move. Useful for testing and benchmarking 
+        move generation, see example_perft.py
+        """
+        ...
+
+    def legal_move_mask(self, for_player: Color=None, packed: bool=False) -> memoryview | bytes: 
+        """
+        Gets a ACTION_COUNT bool mask of legal moves indexed by `move_to_index`, or with 
+        `packed` a bitset where action `i` is bit `i % 8` of byte `i // 8`
+        """
+        ...
+
+    def to_array(self) -> memoryview: 
+        """
+        Returns a read-only 20x20 uint8 view of each tile's color, indexed by 
+        [y][x] so that row 0 is rank 1. The view tracks later pushes and pops
+        """
+        ...
+
+    def corner_masks(self) -> memoryview: 
+        """Returns a n_players x 20 x 20 uint8 mask of each player's open corners"""
+        ...
+
+    def copy(self) -> 'Board': 
+        """Returns a clone of the current board state"""
+        ...
+
+    def score_moves(self, weights: list[float] | array, moves: list[Move | int]=None) -> array: 
+        """
+        Sums `weights` (400 values ordered by tile) over the tiles each move covers, 
+        returning an array('d') with one total per move. Defaults to all legal moves in 
+        `generate_legal_moves` order
+        """
+        ...
+
+    def move_effects(self, move: Move | int) -> dict[str, list]: 
+        """
+        Gets what a legal move would change without playing it: the `tiles` it claims, 
+        the `new_corners` it opens for the current player, and per player lists of 
+        `removed_corners` that it covers (or, for the current player, borders)
+        """
+        ...
+
+    def move_effects_batch(self, moves: list[Move | int]=None) -> dict[str, memoryview]: 
+        """
+        Counts the same effects for many moves (default all legal moves), returning n_moves 
+        int views for `tiles` and `new_corners` and a n_moves x n_players int view for `removed_corners`
+        """
+        ...
+
+    def playout(self, n: int=1, seed: int=None, weighted: bool=False) -> tuple[array, array]: 
+        """
+        Plays `n` random games to completion from the current position without modifying the board,
+        returning each player's total final score and total wins (ties split the win) over all games.
+        `weighted` favors larger pieces, `seed` defaults to a value drawn from the `random` module
+        """
+        ...
+
+    def evaluate_moves(self, moves: list[Move | int]=None, features: list[str]=None) -> dict[str, memoryview]: 
+        """
+        Evaluates the board after each move (default all legal moves) without modifying it.
+        Returns n_moves x n_players int views for `scores`, `corners` and `legal_moves`, 
+        a n_moves x n_players bool view for `can_play`, a n_moves bool view for `finished`
+        and a n_moves uint64 view for `zobrist` (the board's `zobrist` after each move)
+        """
+        ...
+
+class VectorBoard: 
+    """Represents many independent tilewe boards that are stepped together"""
+
+    def __init__(self, n_boards: int, n_players: int=4): 
+        """Creates `n_boards` boards"""
+        ...
+
+    def __len__(self) -> int: 
+        """Number of boards"""
+        ...
+
+    @property 
+    def n_boards(self) -> int: 
+        """Number of boards"""
+        ...
+
+    @property 
+    def n_players(self) -> int: 
+        """Number of players on each board"""
+        ...
+
+    @property 
+    def finished(self) -> memoryview: 
+        """n_boards bool view of whether each game is done"""
+        ...
+
+    @property 
+    def current_players(self) -> memoryview: 
+        """n_boards int view of the player to move on each board"""
+        ...
+
+    @property 
+    def scores(self) -> memoryview: 
+        """n_boards x n_players int view of each board's scores"""
+        ...
+
+    def step(self, moves: array | list[Move | int | None]) -> None: 
+        """
+        Plays one move on every board, given as packed moves (such as an array('I')) or Moves. 
+        Entries for finished boards are ignored, if any other move is illegal no board is changed
+        """
+        ...
+
+    def reset(self, mask: list[bool]=None) -> None: 
+        """Restarts the boards where `mask` is true, or every board"""
+        ...
+
+    def generate_legal_moves_packed(self) -> tuple[array, array]: 
+        """
+        Returns packed legal moves for every board along with n_boards + 1 offsets, where
+        the moves for board `i` are `moves[offsets[i]:offsets[i + 1]]`
+        """
+        ...
+
+    def legal_move_masks(self) -> memoryview: 
+        """n_boards x ACTION_COUNT bool mask of each board's legal moves, see `move_to_index`"""
+        ...
+
+    def board(self, index: int) -> Board: 
+        """Returns a copy of one of the boards"""
+        ...
+
 from ctilewe import *  # noqa: E402, F401, F403
+import ctilewe  # noqa: E402
+
+# number of action indices (one per distinct piece, rotation, contact, and to_tile placement)
+ACTION_COUNT: int = ctilewe.ACTION_COUNT
 
 N_PIECE_TILES:    list[int] = [n_piece_tiles(piece)    for piece in range(PIECE_COUNT)]  # noqa: E241, E272
 N_PIECE_CORNERS:  list[int] = [n_piece_corners(piece)  for piece in range(PIECE_COUNT)]  # noqa: E241, E272
 N_PIECE_CONTACTS: list[int] = [n_piece_contacts(piece) for piece in range(PIECE_COUNT)]  # noqa: E241, E272
+
+def _piece_corner_coords(tiles: tuple[Tile, ...]) -> tuple[tuple[int, int], ...]: 
+    # open corners touch a tile diagonally but no tile along an edge, so they can reach -1
+    coords = {tile_to_coords(tile) for tile in tiles}
+    corners = set()
+    for x, y in coords: 
+        for dx, dy in [(-1, -1), (1, -1), (-1, 1), (1, 1)]: 
+            cx, cy = x + dx, y + dy
+            if not any(c in coords for c in [(cx, cy), (cx - 1, cy), (cx + 1, cy), (cx, cy - 1), (cx, cy + 1)]): 
+                corners.add((cx, cy))
+    return tuple(sorted(corners, key=lambda c: (c[1], c[0])))
+
+# geometry of each piece and rotation, indexed [piece][rotation] 
+PIECE_TILES: tuple[tuple[tuple[Tile, ...], ...], ...] = tuple(
+    tuple(tuple(piece_tiles(piece, rot)) for rot in ROTATIONS) for piece in PIECES
+)
+PIECE_CONTACTS: tuple[tuple[tuple[Tile, ...], ...], ...] = tuple(
+    tuple(tuple(piece_contacts(piece, rot)) for rot in ROTATIONS) for piece in PIECES
+)
+PIECE_CORNERS: tuple[tuple[tuple[tuple[int, int], ...], ...], ...] = tuple(
+    tuple(_piece_corner_coords(tiles) for tiles in rots) for rots in PIECE_TILES
+)
+PIECE_UNIQUE_ROTATIONS: tuple[tuple[bool, ...], ...] = tuple(
+    tuple(sorted(rots[rot]) not in [sorted(prev) for prev in rots[:rot]] for rot in ROTATIONS) for rots in PIECE_TILES
+)
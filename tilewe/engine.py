@@ -1,5 +1,11 @@
 from typing import Callable
+from collections import OrderedDict
+from array import array
+from multiprocessing.pool import Pool, ThreadPool
+import multiprocessing
+import threading
 import random
+import copy
 import time
 import math
 
@@ -17,27 +23,100 @@ class Engine:
     at None/0.0. If you think your engine would have a 75% win rate against
     an "average" opponent, you should set it to 200.0.
 
+    Time is measured with `time.monotonic`. Each search has a hard deadline,
+    `end_at`, which is the time given minus `safety_margin` seconds for returning
+    the move, and an earlier soft deadline, `soft_end_at`, after `soft_fraction`
+    of that time. Engines should stop searching once `out_of_time` is true and
+    shouldn't start another iteration of an iterative search once
+    `past_soft_deadline` is true. `time_up` is a cheaper `out_of_time` for checking
+    every node which only reads the clock once `poll_nodes` positions worth of work
+    have been done since the last read, so pass it the number of positions about
+    to be evaluated when checking before a batch.
+
+    Engines should draw random numbers from `rng`, which is the global `random`
+    module unless an engine is given its own `random.Random`.
+
     For extension examples, see the Sample Engines below.
     For construction examples, see the tilewe.tournament.Tournament class.
     """
+
+    rng = random
     
     def __init__(self, name: str, estimated_elo: float=None): 
         self.name = name  
         self.estimated_elo = estimated_elo
         self.seconds = 0 
-        self.end_at = time.time() 
+
+        # time management
+        self.safety_margin: float = 0.02
+        self.soft_fraction: float = 0.6
+        self.poll_nodes: int = 16
+        self.set_deadlines(time.monotonic())
+
+    def set_deadlines(self, end_at: float, soft_end_at: float=None) -> None: 
+        self.end_at = end_at 
+        self.soft_end_at = end_at if soft_end_at is None else soft_end_at 
+        self._polls_left = 0 
 
     def out_of_time(self) -> bool: 
-        return time.time() >= self.end_at 
+        return time.monotonic() >= self.end_at 
+
+    def past_soft_deadline(self) -> bool: 
+        return time.monotonic() >= self.soft_end_at 
+
+    def time_up(self, work: int=1) -> bool: 
+        self._polls_left -= work
+        if self._polls_left > 0:
+            return False
+
+        # keep reading the clock once out of time in case the deadline is moved
+        if time.monotonic() >= self.end_at:
+            return True
+
+        self._polls_left = self.poll_nodes
+        return False
+
+    def search(
+        self, 
+        board: tilewe.Board, 
+        seconds: float=1.0, 
+        clock: float=None, 
+        moves_to_go: int=None
+    ) -> tilewe.Move: 
+        """
+        Searches for a move in at most `seconds`. When playing with a clock for the
+        whole game, pass the time left on it as `clock` to spread it over the
+        `moves_to_go` moves left (by default the player's remaining pieces).
+
+        The board may be reused by the caller: a Tournament gives each player the
+        same board object every turn, updated to the current position, so engines
+        should copy it rather than keep a reference to it between searches.
+        """
+
+        start = time.monotonic()
 
-    def search(self, board: tilewe.Board, seconds: float=1.0) -> tilewe.Move: 
-        self.end_at = time.time() + seconds 
+        if clock is not None:
+            if moves_to_go is None:
+                moves_to_go = board.n_remaining_pieces(for_player=board.current_player)
+            seconds = min(seconds, clock / max(1, moves_to_go))
+
+        # keep back the safety margin unless it would take most of the time
+        usable = max(seconds - self.safety_margin, seconds / 2)
+        self.set_deadlines(start + usable, start + usable * self.soft_fraction)
         self.seconds = seconds 
         return self.on_search(board, seconds) 
 
     def on_search(self, board: tilewe.Board, seconds: float) -> tilewe.Move: 
         raise NotImplementedError() 
 
+    def rate_moves(self, board: tilewe.Board, moves: list[tilewe.Move]) -> list[float]: 
+        """
+        Optional, rates each of the given legal moves for the current player before
+        `end_at` (higher is better). Engines that implement this can be searched
+        on multiple cores with `ParallelEngine`
+        """
+        raise NotImplementedError() 
+
 """
 Sample Engines
 
@@ -52,6 +131,9 @@ Approximate strength ordering:
     LargestPieceEngine, moderate
     MaximizeMoveDifferenceEngine, surprisingly strong
     SimpleSearchEngine, strong given a good eval function
+    AlphaBetaEngine, stronger than SimpleSearchEngine given the time to search deeper
+    MCTSEngine, gets stronger the more time it is given
+    ParallelEngine, stronger than the engine it runs given more cores
 """
 
 class MoveExecutor(object):
@@ -81,7 +163,7 @@ class RandomEngine(Engine):
         super().__init__(name, -100.0 if estimated_elo is None else estimated_elo)
 
     def on_search(self, board: tilewe.Board, _seconds: float) -> tilewe.Move: 
-        return random.choice(board.generate_legal_moves()) 
+        return self.rng.choice(board.generate_legal_moves()) 
 
 class OpenCornersEngine(Engine): 
     """
@@ -103,16 +185,15 @@ class OpenCornersEngine(Engine):
 
     def on_search(self, board: tilewe.Board, _seconds: float) -> tilewe.Move:
         moves = board.generate_legal_moves() 
-        random.shuffle(moves) 
+        self.rng.shuffle(moves) 
         
         player = board.current_player
 
-        def corners_after_move(m: tilewe.Move) -> int: 
-            with MoveExecutor(board, m):
-                corners = board.n_player_corners(player) 
-                return corners
+        # change in the player's open corners after each move, without playing them
+        effects = board.move_effects_batch(moves)
+        new_corners, removed_corners = effects["new_corners"], effects["removed_corners"]
 
-        return self.func(moves, key=corners_after_move)
+        return moves[self.func(range(len(moves)), key=lambda i: new_corners[i] - removed_corners[i, player])]
 
 class PieceSizeEngine(Engine): 
     """
@@ -137,7 +218,7 @@ class PieceSizeEngine(Engine):
 
     def on_search(self, board: tilewe.Board, _seconds: float) -> tilewe.Move:
         moves = board.generate_legal_moves() 
-        random.shuffle(moves) 
+        self.rng.shuffle(moves) 
 
         def score(m: tilewe.Move): 
             pc = m.piece
@@ -172,20 +253,21 @@ class MoveDifferenceEngine(Engine):
 
     def on_search(self, board: tilewe.Board, _seconds: float) -> tilewe.Move:
         moves = board.generate_legal_moves() 
-        random.shuffle(moves) 
+        self.rng.shuffle(moves) 
         
         player = board.current_player
         N = board.n_players
 
-        def eval_after_move(m: tilewe.Move) -> int: 
-            with MoveExecutor(board, m):
-                total = 0
-                for color in range(N): 
-                    n_moves = board.n_legal_moves(for_player=color)
-                    total += n_moves * (1 if color == player else -1)
-                return total
+        # legal move counts for every player after each move, in one native call
+        legal_moves = board.evaluate_moves(moves, features=["legal_moves"])["legal_moves"]
 
-        return self.func(moves, key=eval_after_move)
+        def eval_after_move(i: int) -> int: 
+            total = 0
+            for color in range(N): 
+                total += legal_moves[i, color] * (1 if color == player else -1)
+            return total
+
+        return moves[self.func(range(len(moves)), key=eval_after_move)]
     
 class TileWeightEngine(Engine):
     """
@@ -290,24 +372,17 @@ class TileWeightEngine(Engine):
 
         cur_player = board.current_player
 
-        def evaluate_move_weight(move: tilewe.Move) -> float: 
-            total: float = 0
-
-            offset = move.to_tile - move.contact 
-            for tile in tilewe.piece_tiles(move.piece, move.rotation): 
-                total += self.weights[tile + offset]
-
-            return total
-
-        moves = board.generate_legal_moves()
-        random.shuffle(moves)
-
         if board.ply < board.n_players:
             #  prune to one corner to reduce moves to evaluate
-            corner = board.player_corners(cur_player)[0]
-            moves = [i for i in moves if i.to_tile == corner]
+            corners = board.player_corners(cur_player)[:1]
+            moves = board.generate_legal_moves(corners=corners)
+        else:
+            moves = board.generate_legal_moves()
+        self.rng.shuffle(moves)
 
-        return max(moves, key=evaluate_move_weight)
+        # sum the weights of the tiles covered by each move
+        scores = board.score_moves(self.weights, moves)
+        return moves[max(range(len(moves)), key=scores.__getitem__)]
 
 class SimpleSearchEngine(Engine): 
     """
@@ -315,6 +390,14 @@ class SimpleSearchEngine(Engine):
     Only searches a single ply deep and the eval function takes a board
     and which player to evaluate positively for.
     Strength depends entirely on the quality of the evaluation function!
+
+    Setting `eval_cache_size` keeps up to that many evaluations keyed by the
+    position's zobrist key and the player, dropping the least recently used,
+    so positions reached again are not evaluated again. The evaluation must
+    only depend on the position. The default evaluation looks up a batch of
+    moves by their native zobrist keys and only evaluates the ones it misses.
+
+    Assigning `eval_function` replaces the evaluation, which stays cached.
     """
 
     def __init__(
@@ -322,72 +405,729 @@ class SimpleSearchEngine(Engine):
         name: str=None,
         eval_board: Callable[[tilewe.Board, tilewe.Color], float]=None,
         estimated_elo: float=None,
+        eval_cache_size: int=0,
     ):
         name = name or "SimpleSearch"
 
         if eval_board is None:
             estimated_elo = 75.0 if estimated_elo is None else estimated_elo
-            self.eval_function = self.default_eval
+            self.board_eval = self.default_eval
         else:
             estimated_elo = 0.0 if estimated_elo is None else estimated_elo
-            self.eval_function = eval_board
+            self.board_eval = eval_board
+
+        if eval_cache_size < 0:
+            raise ValueError("Invalid eval_cache_size, must not be negative")
+
+        self.eval_cache: OrderedDict[tuple[int, tilewe.Color], float] = OrderedDict()
+        self.eval_cache_size = eval_cache_size
+        self.eval_cache_hits: int = 0
+        self.eval_cache_misses: int = 0
         
         super().__init__(name, estimated_elo)
 
-    def default_eval(self, board: tilewe.Board, player: tilewe.Color) -> float:
+    @property
+    def eval_function(self) -> Callable[[tilewe.Board, tilewe.Color], float]:
+        return self.cached_eval if self.eval_cache_size > 0 else self.board_eval
+
+    @eval_function.setter
+    def eval_function(self, eval_board: Callable[[tilewe.Board, tilewe.Color], float]) -> None:
+        self.board_eval = eval_board
+
+    @property
+    def eval_cache_hit_rate(self) -> float:
+        lookups = self.eval_cache_hits + self.eval_cache_misses
+        return self.eval_cache_hits / lookups if lookups > 0 else 0.0
+
+    def clear_eval_cache(self) -> None:
+        self.eval_cache.clear()
+        self.eval_cache_hits = 0
+        self.eval_cache_misses = 0
+
+    def cache_lookup(self, key: tuple[int, tilewe.Color]) -> float | None:
+        value = self.eval_cache.get(key)
+
+        if value is None:
+            self.eval_cache_misses += 1
+        else:
+            self.eval_cache.move_to_end(key)
+            self.eval_cache_hits += 1
+
+        return value
+
+    def cache_store(self, key: tuple[int, tilewe.Color], value: float) -> None:
+        self.eval_cache[key] = value
+        if len(self.eval_cache) > self.eval_cache_size:
+            self.eval_cache.popitem(last=False)
+
+    def cached_eval(self, board: tilewe.Board, player: tilewe.Color) -> float:
+        key = (board.zobrist, player)
+        value = self.cache_lookup(key)
+
+        if value is None:
+            value = self.board_eval(board, player)
+            self.cache_store(key, value)
+
+        return value
+
+    @staticmethod
+    def default_eval_from_stats(
+        player: tilewe.Color, 
+        scores: list[int], 
+        corners: list[int], 
+        can_play: list[bool], 
+        finished: bool
+    ) -> float:
         score = 0.0
+        best_score = max(scores)
 
         # iterate the players to evaluate the state of the board
-        for color in range(0, board.n_players):
+        for color in range(0, len(scores)):
             if color == player:
                 # bonus for score
-                score += board.scores[color] * 0.5
+                score += scores[color] * 0.5
 
                 # bonus for playable corners
-                score += board.n_player_corners(color) * 0.2
+                score += corners[color] * 0.2
 
                 # bonus for winning
-                if board.finished and color in board.winners:
+                if finished and scores[color] == best_score:
                     score += 1000
 
                 # penalty for losing early
-                if not board.finished and not board.can_play(for_player=color):
+                if not finished and not can_play[color]:
                     score -= 1000
             else:
                 # penalty for other players' scores
-                score -= board.scores[color] * 0.1
+                score -= scores[color] * 0.1
                 
                 # penalty for other players' playable corners
-                score -= board.n_player_corners(color) * 0.04
+                score -= corners[color] * 0.04
 
                 # bonus for other players losing early
-                if not board.finished and not board.can_play(for_player=color):
+                if not finished and not can_play[color]:
                     score += 3
 
         return score
 
+    def default_eval(self, board: tilewe.Board, player: tilewe.Color) -> float:
+        N = board.n_players
+        return self.default_eval_from_stats(
+            player, 
+            board.scores, 
+            [board.n_player_corners(color) for color in range(N)], 
+            [board.can_play(for_player=color) for color in range(N)], 
+            board.finished
+        )
+
+    def default_eval_moves(self, board: tilewe.Board, moves: list[tilewe.Move], player: tilewe.Color) -> list[float]:
+        """Evaluates the board after each move with `default_eval` in native batches"""
+
+        features = ["scores", "corners", "can_play", "finished"]
+        values: list[float] = [None] * len(moves)
+        keys: list[int] = None
+        missed = list(range(len(moves)))
+
+        # only evaluate the moves whose resulting positions aren't cached
+        if self.eval_cache_size > 0:
+            keys = board.evaluate_moves(moves, features=["zobrist"])["zobrist"].tolist()
+            values = [self.cache_lookup((key, player)) for key in keys]
+            missed = [i for i, value in enumerate(values) if value is None]
+
+        if missed:
+            stats = board.evaluate_moves([moves[i] for i in missed], features=features)
+            scores, corners, can_play = stats["scores"].tolist(), stats["corners"].tolist(), stats["can_play"].tolist()
+            finished = stats["finished"].tolist()
+
+            for j, i in enumerate(missed):
+                values[i] = self.default_eval_from_stats(player, scores[j], corners[j], can_play[j], finished[j])
+                if keys is not None:
+                    self.cache_store((keys[i], player), values[i])
+
+        return values
+
+    def evaluate_until_timeout(
+        self, 
+        board: tilewe.Board, 
+        moves: list[tilewe.Move], 
+        player: tilewe.Color, 
+        required: int=0
+    ) -> list[float]:
+        """
+        Evaluates the board after each move in order until out of time, checking the time
+        control before each native chunk of moves or custom evaluation once `required` moves
+        are evaluated. Returns the values of the moves evaluated so far
+        """
+
+        values: list[float] = []
+
+        for start in range(0, len(moves), 100):
+            chunk = moves[start:start + 100]
+
+            if self.board_eval == self.default_eval:
+                # evaluate the whole chunk natively
+                if len(values) >= required and self.time_up(len(chunk)):
+                    break
+                values += self.default_eval_moves(board, chunk, player)
+            else:
+                # evaluate the board state after each move
+                for move in chunk:
+                    if len(values) >= required and self.time_up():
+                        return values
+                    with MoveExecutor(board, move):
+                        values.append(self.eval_function(board, player))
+
+        return values
+
+    def rate_moves(self, board: tilewe.Board, moves: list[tilewe.Move]) -> list[float]:
+        values = self.evaluate_until_timeout(board, moves, board.current_player, required=1)
+        return values + [-math.inf] * (len(moves) - len(values))
+
     def on_search(self, board: tilewe.Board, _seconds: float) -> tilewe.Move:
         moves: list[tilewe.Move] = board.generate_legal_moves()
-        player: tilewe.Color = board.current_player
-        moves_evaluated: int = 0
+        values = self.rate_moves(board, moves)
 
         best: float = -math.inf
-        best_move: tilewe.Move = random.choice(moves)
+        best_move: tilewe.Move = self.rng.choice(moves)
+
+        for move, value in zip(moves, values):
+            if value > best:
+                best = value
+                best_move = move
+
+        return best_move
+
+class _SearchTimeout(Exception): 
+    """Raised inside a search to unwind it once the time control runs out"""
+
+class AlphaBetaEngine(SimpleSearchEngine): 
+    """
+    Iterative deepening alpha-beta search using the paranoid assumption: every
+    other player plays to minimize the searching player's evaluation. Searches one
+    ply deeper each iteration until the soft deadline passes, plays the best
+    move of the deepest search (including a partial one if it found a better move),
+    and orders moves by the previous iteration and a transposition table.
+
+    The transposition table is a fixed number of slots indexed by the board's zobrist
+    key. A slot is replaced by deeper results or results from a newer search, so the
+    table stays bounded while keeping the most useful entries across turns.
+    Uses the same evaluation functions as SimpleSearchEngine.
+    """
+
+    EXACT, LOWER, UPPER = range(3)
+
+    def __init__(
+        self,
+        name: str=None,
+        eval_board: Callable[[tilewe.Board, tilewe.Color], float]=None,
+        estimated_elo: float=None,
+        max_depth: int=None,
+        tt_size: int=1 << 16,
+        eval_cache_size: int=0,
+    ):
+        if eval_board is None and estimated_elo is None:
+            estimated_elo = 100.0
+
+        super().__init__(name or "AlphaBeta", eval_board, estimated_elo, eval_cache_size)
+
+        self.max_depth = max_depth
+        self.table: list[tuple] = [None] * tt_size
+        self.age: int = 0
+        self.player: tilewe.Color = 0
+        self.root_best: tilewe.Move = None
+
+        # statistics of the last search
+        self.nodes: int = 0
+        self.table_hits: int = 0
+        self.depth_reached: int = 0
+
+    def evaluate_children(self, board: tilewe.Board, moves: list[tilewe.Move]) -> list[float]:
+        values = self.evaluate_until_timeout(board, moves, self.player)
+        if len(values) < len(moves):
+            raise _SearchTimeout()
+        return values
+
+    def probe(self, key: int) -> tuple:
+        entry = self.table[key % len(self.table)]
+        if entry is not None and entry[0] == key and entry[1] == self.player:
+            self.table_hits += 1
+            return entry
+        return None
+
+    def store(self, key: int, depth: int, value: float, flag: int, move: tilewe.Move) -> None:
+        slot = key % len(self.table)
+        entry = self.table[slot]
+
+        # keep deeper results from the current search, replace anything else
+        if entry is None or entry[6] != self.age or depth >= entry[2]:
+            self.table[slot] = (key, self.player, depth, value, flag, move, self.age)
+
+    def order_moves(self, moves: list[tilewe.Move], first: tilewe.Move) -> list[tilewe.Move]:
+        # the remembered best move first, then larger pieces which tend to be better
+        return sorted(moves, key=lambda m: (m != first, -tilewe.N_PIECE_TILES[m.piece]))
+
+    def alpha_beta(self, board: tilewe.Board, depth: int, alpha: float, beta: float) -> float:
+        self.nodes += 1
+        if self.time_up():
+            raise _SearchTimeout()
+
+        if board.finished:
+            return self.eval_function(board, self.player)
+
+        key = board.zobrist
+        entry = self.probe(key)
+        remembered = None
+        if entry is not None:
+            _, _, entry_depth, value, flag, remembered, _ = entry
+            if entry_depth >= depth:
+                if flag == self.EXACT:
+                    return value
+                elif flag == self.LOWER:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
+
+        moves = board.generate_legal_moves()
+        if len(moves) == 0:
+            return self.eval_function(board, self.player)
+
+        maximizing = board.current_player == self.player
+        start_alpha, start_beta = alpha, beta
+
+        if depth == 1:
+            # the last ply is evaluated in one batch
+            values = self.evaluate_children(board, moves)
+            pick = max if maximizing else min
+            index = pick(range(len(moves)), key=values.__getitem__)
+            best, best_move = values[index], moves[index]
+        else:
+            best, best_move = (-math.inf if maximizing else math.inf), None
+            for move in self.order_moves(moves, remembered):
+                with MoveExecutor(board, move):
+                    value = self.alpha_beta(board, depth - 1, alpha, beta)
+
+                if maximizing and value > best:
+                    best, best_move = value, move
+                    alpha = max(alpha, value)
+                elif not maximizing and value < best:
+                    best, best_move = value, move
+                    beta = min(beta, value)
+
+                if alpha >= beta:
+                    break
+
+        flag = self.UPPER if best <= start_alpha else self.LOWER if best >= start_beta else self.EXACT
+        self.store(key, depth, best, flag, best_move)
+        return best
 
-        # check each legal move
+    def search_root(self, board: tilewe.Board, moves: list[tilewe.Move], depth: int) -> list[float]:
+        if depth == 1:
+            # moves left unevaluated when out of time rate lowest
+            values = SimpleSearchEngine.rate_moves(self, board, moves)
+            self.root_best = moves[max(range(len(moves)), key=values.__getitem__)]
+            return values
+
+        alpha = -math.inf
+        values = []
         for move in moves:
-            moves_evaluated += 1
+            with MoveExecutor(board, move):
+                value = self.alpha_beta(board, depth - 1, alpha, math.inf)
+
+            # moves are searched best first, so any completed improvement can be played
+            if value > alpha:
+                alpha = value
+                self.root_best = move
+            values.append(value)
+
+        return values
+
+    def rate_moves(self, board: tilewe.Board, moves: list[tilewe.Move]) -> list[float]:
+        self.player = board.current_player
+        self.age += 1
+        self.nodes = 0
+        self.table_hits = 0
+        self.depth_reached = 0
+        self.root_best = moves[0]
+
+        # no line can last longer than the pieces left to play
+        remaining = sum(board.n_remaining_pieces(for_player=p) for p in range(board.n_players))
+        max_depth = 1 if len(moves) == 1 else min(remaining, self.max_depth or remaining)
+        order = list(range(len(moves)))
+        ratings = [-math.inf] * len(moves)
+
+        for depth in range(1, max_depth + 1):
+            try:
+                values = self.search_root(board, [moves[i] for i in order], depth)
+            except _SearchTimeout:
+                break
+
+            self.depth_reached = depth
+            for i, value in zip(order, values):
+                ratings[i] = value
+
+            # search the best moves first next iteration
+            order = [order[i] for i in sorted(range(len(order)), key=lambda i: -values[i])]
 
-            # respect the time control
-            if moves_evaluated % 100 == 0 and self.out_of_time():
+            # a deeper iteration started now is unlikely to get far enough to help
+            if self.past_soft_deadline():
                 break
 
-            # evaluate the board state after the move
-            with MoveExecutor(board, move):
-                result: float = self.eval_function(board, player)
+        # the move to play can come from a deeper unfinished iteration, so rate it highest
+        ratings[moves.index(self.root_best)] = max(ratings)
+        return ratings
+
+    def on_search(self, board: tilewe.Board, _seconds: float) -> tilewe.Move:
+        moves: list[tilewe.Move] = board.generate_legal_moves()
+        self.rng.shuffle(moves)
+
+        self.rate_moves(board, moves)
+        return self.root_best
+
+class MCTSEngine(Engine): 
+    """
+    Monte Carlo Tree Search using UCT: repeatedly walks down the tree picking children
+    by their average result plus an exploration bonus (scaled by `exploration`), adds
+    the children of the node it reaches, plays a game out from there, and credits
+    every node on the way with the result for the player who moved into it. Plays
+    the most visited move.
+
+    `rollout` is 'random' or 'weighted' (favors larger pieces) to play games out
+    natively with `Board.playout`, or a function that plays a board out and returns
+    each player's result (1 for a win, split between tied winners, 0 otherwise).
+
+    Nodes are stored in flat arrays indexed by node number with each node's children
+    next to each other, and the part of the tree below the moves played since the
+    last search is kept for the next one, up to `max_nodes` nodes in total.
+    """
+
+    def __init__(
+        self,
+        name: str=None,
+        exploration: float=1.4,
+        rollout: str | Callable[[tilewe.Board], list[float]]='random',
+        max_nodes: int=1_000_000,
+        estimated_elo: float=None,
+    ):
+        if isinstance(rollout, str) and rollout not in ['random', 'weighted']:
+            raise ValueError("Invalid rollout, must be 'random', 'weighted', or a function")
+
+        super().__init__(name or "MCTS", estimated_elo)
+
+        self.exploration = exploration
+        self.rollout = rollout
+        self.max_nodes = max_nodes
+        self.clear_tree()
+
+        # statistics of the last search
+        self.playouts: int = 0
+        self.playouts_per_second: float = 0.0
+
+    def clear_tree(self) -> None:
+        self.parents = array('i')
+        self.moves = array('I')  # packed move into the node
+        self.players = array('b')  # player who made that move
+        self.visits = array('q')
+        self.rewards = array('d')
+        self.first_child = array('i')
+        self.n_children = array('i')  # -1 until the node is expanded
+        self.history: list[int] = None
+
+    def add_node(self, parent: int, move: int, player: int, visits: int=0, reward: float=0.0) -> int:
+        self.parents.append(parent)
+        self.moves.append(move)
+        self.players.append(player)
+        self.visits.append(visits)
+        self.rewards.append(reward)
+        self.first_child.append(0)
+        self.n_children.append(-1)
+        return len(self.parents) - 1
+
+    def expand(self, node: int, board: tilewe.Board, moves: list[int]=None) -> None:
+        moves = board.generate_legal_moves_packed().tolist() if moves is None else list(moves)
+        self.rng.shuffle(moves)
+        self.first_child[node] = len(self.parents)
+        self.n_children[node] = len(moves)
+
+        player = board.current_player
+        for move in moves:
+            self.add_node(node, move, player)
+
+    def find_child(self, node: int, move: int) -> int:
+        if self.n_children[node] > 0:
+            start = self.first_child[node]
+            for child in range(start, start + self.n_children[node]):
+                if self.moves[child] == move:
+                    return child
+        return -1
+
+    def reroot(self, node: int) -> None:
+        # copy the subtree into fresh arrays so storage only holds nodes that can still be reached
+        old = (self.moves, self.players, self.visits, self.rewards, self.first_child, self.n_children)
+        moves, players, visits, rewards, first_child, n_children = old
+        history = self.history
+        self.clear_tree()
+        self.history = history
+
+        self.add_node(-1, moves[node], players[node], visits[node], rewards[node])
+        queue = [(node, 0)]
+        for old_node, new_node in queue:
+            if n_children[old_node] < 0:
+                continue
+
+            start = first_child[old_node]
+            self.first_child[new_node] = len(self.parents)
+            self.n_children[new_node] = n_children[old_node]
+            for child in range(start, start + n_children[old_node]):
+                new_child = self.add_node(new_node, moves[child], players[child], visits[child], rewards[child])
+                queue.append((child, new_child))
+
+    def reuse_tree(self, board: tilewe.Board) -> None:
+        history = [move.packed for move in board.moves]
+
+        # follow the moves played since the last search down the old tree
+        node = 0 if self.history is not None and history[:len(self.history)] == self.history else -1
+        for move in history[len(self.history or []):]:
+            if node < 0:
+                break
+            node = self.find_child(node, move)
+
+        if node < 0:
+            self.clear_tree()
+            self.add_node(-1, 0, -1)
+        elif node > 0:
+            self.reroot(node)
+        self.history = history
+
+    def play_out(self, board: tilewe.Board) -> list[float]:
+        if isinstance(self.rollout, str):
+            return board.playout(1, seed=self.rng.getrandbits(64), weighted=self.rollout == 'weighted')[1]
+        return self.rollout(board)
+
+    def select_child(self, node: int) -> int:
+        start = self.first_child[node]
+        log_visits = math.log(max(1, self.visits[node]))
+        best, best_child = -math.inf, start
+
+        for child in range(start, start + self.n_children[node]):
+            visits = self.visits[child]
+            if visits == 0:
+                return child
+
+            value = self.rewards[child] / visits + self.exploration * math.sqrt(log_visits / visits)
+            if value > best:
+                best, best_child = value, child
+
+        return best_child
+
+    def run(self, board: tilewe.Board, moves: list[int]=None) -> None:
+        """Searches until out of time, from the kept tree or a new one limited to the given root moves"""
+
+        start_time = time.monotonic()
+        if moves is None:
+            self.reuse_tree(board)
+        else:
+            self.clear_tree()
+            self.add_node(-1, 0, -1)
+        self.playouts = 0
+
+        if self.n_children[0] < 0:
+            self.expand(0, board, moves)
+
+        while self.playouts == 0 or not self.out_of_time():
+            # walk down to a leaf, adding children once a node has been visited
+            node, depth = 0, 0
+            while True:
+                if self.n_children[node] < 0 and self.visits[node] > 0 and len(self.parents) < self.max_nodes:
+                    self.expand(node, board)
+                if self.n_children[node] <= 0:
+                    break
+
+                node = self.select_child(node)
+                board.push(self.moves[node])
+                depth += 1
+
+            result = self.play_out(board)
+            for _ in range(depth):
+                board.pop()
+
+            # credit each node with the result of the player who moved into it
+            while node >= 0:
+                self.visits[node] += 1
+                if self.players[node] >= 0:
+                    self.rewards[node] += result[self.players[node]]
+                node = self.parents[node]
+
+            self.playouts += 1
+
+        elapsed = time.monotonic() - start_time
+        self.playouts_per_second = self.playouts / elapsed if elapsed > 0 else 0.0
+
+    def rate_moves(self, board: tilewe.Board, moves: list[tilewe.Move]) -> list[float]:
+        self.run(board, [move.packed for move in moves])
+
+        # average result of each move, which is comparable between separate searches
+        ratings = {}
+        start = self.first_child[0]
+        for child in range(start, start + self.n_children[0]):
+            visits = self.visits[child]
+            ratings[self.moves[child]] = self.rewards[child] / visits if visits > 0 else -math.inf
+
+        # the restricted tree can't be reused by the next search
+        self.history = None
+        return [ratings[move.packed] for move in moves]
+
+    def on_search(self, board: tilewe.Board, _seconds: float) -> tilewe.Move:
+        self.run(board)
+
+        start = self.first_child[0]
+        best = max(range(start, start + self.n_children[0]), key=self.visits.__getitem__)
+        return tilewe.Move.from_packed(self.moves[best])
+
+# the copy of the engine searched by each pool worker
+_worker_state = threading.local()
+
+def _init_worker(engine: Engine) -> None:
+    _worker_state.engine = copy.deepcopy(engine)
+
+def _warm_worker(_: int) -> None:
+    # gives every worker a task once it's running so the first search isn't spent starting them
+    time.sleep(0.01)
+
+def _rate_in_worker(board: tilewe.Board, moves: list[int], deadlines: tuple[float, float], seed: int) -> list[float]:
+    # each task gets its own generator, so threads don't share or reseed the global one
+    engine: Engine = _worker_state.engine
+    engine.rng = random.Random(seed)
+    engine.set_deadlines(*deadlines)
+    return engine.rate_moves(board, [tilewe.Move.from_packed(move) for move in moves])
+
+class ParallelEngine(Engine):
+    """
+    Searches with several copies of another engine at once, using the wrapped
+    engine's `rate_moves`. By default the legal moves are split between the
+    workers and the best rated move is played. With `split=False` every worker
+    rates all of the moves with its own random seed and the ratings are averaged,
+    which suits randomized engines like MCTSEngine.
+
+    The pool of workers is started by `start` when the engine is created (or on the
+    first search after unpickling) and kept until `close` is called, so the engine
+    and its evaluation must be picklable. Processes can't be started from within a
+    Tournament's worker processes, set `use_threads` to use threads instead (which
+    only helps when the search releases the GIL).
+
+    Workers stop searching `margin` seconds early to send back their results, which
+    are collected until half the margin remains. If none arrived, a local copy of
+    the engine rates the moves in the time left and `fell_back` is set.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        name: str=None,
+        n_workers: int=None,
+        use_threads: bool=False,
+        split: bool=True,
+        margin: float=0.05,
+        estimated_elo: float=None,
+    ):
+        if n_workers is not None and n_workers < 1:
+            raise ValueError("Invalid n_workers, must be at least 1")
+
+        super().__init__(name or f"Parallel{engine.name}", engine.estimated_elo if estimated_elo is None else estimated_elo)
+
+        self.engine = engine
+        self.n_workers = n_workers or multiprocessing.cpu_count()
+        self.use_threads = use_threads
+        self.split = split
+        self.margin = margin
+        self.fallback: Engine = copy.deepcopy(engine)
+        self.pool: Pool = None
+
+        # statistics of the last search
+        self.results_used: int = 0
+        self.fell_back: bool = False
+
+        self.start()
+
+    def __getstate__(self) -> dict:
+        # pools can't be pickled, a copy starts its own
+        state = self.__dict__.copy()
+        state['pool'] = None
+        return state
+
+    def __enter__(self) -> 'ParallelEngine':
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        self.close()
+
+    def start(self) -> None:
+        if self.pool is None:
+            pool_type = ThreadPool if self.use_threads else Pool
+            self.pool = pool_type(self.n_workers, initializer=_init_worker, initargs=(self.engine,))
+            self.pool.map(_warm_worker, range(self.n_workers), chunksize=1)
+
+    def close(self) -> None:
+        if getattr(self, 'pool', None) is not None:
+            self.pool.terminate()
+            self.pool = None
+
+    def rate_moves(self, board: tilewe.Board, moves: list[tilewe.Move]) -> list[float]:
+        self.start()
+
+        packed = [move.packed for move in moves]
+        if self.split:
+            # deal the moves out so every worker gets a similar mix
+            tasks = [list(range(i, len(moves), self.n_workers)) for i in range(min(self.n_workers, len(moves)))]
+        else:
+            tasks = [list(range(len(moves)))] * self.n_workers
+
+        # each worker searches its own copy of the board, threads would share it otherwise
+        deadlines = (self.end_at - self.margin, self.soft_end_at - self.margin)
+        results = []
+        for indices in tasks:
+            args = (board.copy(), [packed[i] for i in indices], deadlines, self.rng.getrandbits(32))
+            results.append((indices, self.pool.apply_async(_rate_in_worker, args)))
+
+        totals = [0.0] * len(moves)
+        counts = [0] * len(moves)
+        self.results_used = 0
+        self.fell_back = False
+        collect_until = self.end_at - self.margin / 2
+
+        for indices, result in results:
+            try:
+                values = result.get(max(0.0, collect_until - time.monotonic()))
+            except multiprocessing.TimeoutError:
+                continue
+
+            self.results_used += 1
+            for i, value in zip(indices, values):
+                totals[i] += value
+                counts[i] += 1
+
+        # rate the moves here rather than play a random one when no worker answered in time
+        if self.results_used == 0:
+            self.fell_back = True
+            self.fallback.set_deadlines(self.end_at)
+            return self.fallback.rate_moves(board, moves)
+
+        return [totals[i] / counts[i] if counts[i] > 0 else -math.inf for i in range(len(moves))]
+
+    def on_search(self, board: tilewe.Board, _seconds: float) -> tilewe.Move:
+        moves: list[tilewe.Move] = board.generate_legal_moves()
+        values = self.rate_moves(board, moves)
+
+        best: float = -math.inf
+        best_move: tilewe.Move = self.rng.choice(moves)
 
-                if result > best:
-                    best = result
-                    best_move = move
+        for move, value in zip(moves, values):
+            if value > best:
+                best = value
+                best_move = move
 
         return best_move
@@ -1,10 +1,507 @@
 #define PY_SSIZE_T_CLEAN
 #include <Python.h> 
 
+#include <stdint.h> 
 #include <stdlib.h> 
+#include <string.h> 
 
 #include "Tilewe/Tilewe.h" 
 
+#define BOARD_WIDTH 20 
+#define BOARD_TILES (BOARD_WIDTH * BOARD_WIDTH) 
+#define NUM_PIECES 21 
+#define NUM_COLORS 4 
+#define MAX_PIECE_TILES 5 
+#define NUM_FEATURE_PLANES (4 * NUM_COLORS) 
+
+typedef struct BorrowFlag BorrowFlag; 
+
+// tracks use of an object's board state by code that runs without the GIL: the count is positive 
+// while readers are using it and -1 while it is being modified, conflicting use raises an error 
+// instead of racing (on free-threaded builds the count itself is protected by a mutex)
+struct BorrowFlag 
+{
+    int Count; 
+#ifdef Py_GIL_DISABLED
+    PyMutex Mutex; 
+#endif
+};
+
+// borrows without raising, for callers that can fall back to other work 
+static bool TryBorrow(BorrowFlag* flag, bool write) 
+{
+#ifdef Py_GIL_DISABLED
+    PyMutex_Lock(&flag->Mutex); 
+#endif
+
+    bool available = write ? flag->Count == 0 : flag->Count >= 0; 
+    if (available) 
+    {
+        flag->Count += write ? -1 : 1; 
+    }
+
+#ifdef Py_GIL_DISABLED
+    PyMutex_Unlock(&flag->Mutex); 
+#endif
+
+    return available; 
+}
+
+static bool Borrow(BorrowFlag* flag, bool write) 
+{
+    bool available = TryBorrow(flag, write); 
+
+    if (!available) 
+    {
+        PyErr_SetString(PyExc_RuntimeError, write ? 
+            "board cannot be modified while another thread is using it" : 
+            "board cannot be used while another thread is modifying it"); 
+    }
+
+    return available; 
+}
+
+static void Unborrow(BorrowFlag* flag, bool write) 
+{
+#ifdef Py_GIL_DISABLED
+    PyMutex_Lock(&flag->Mutex); 
+#endif
+
+    flag->Count += write ? 1 : -1; 
+
+#ifdef Py_GIL_DISABLED
+    PyMutex_Unlock(&flag->Mutex); 
+#endif
+}
+
+typedef struct RotPcGeometry RotPcGeometry; 
+
+// flattened copy of a rotated piece's tile sets so hot loops can index them directly
+struct RotPcGeometry 
+{
+    int NumTiles; 
+    int NumContacts; 
+    Tw_Tile Tiles[MAX_PIECE_TILES]; 
+    Tw_Tile Contacts[MAX_PIECE_TILES]; 
+    bool Unique; // false if an earlier rotation of the piece covers the same tiles 
+    int Canonical; // first rotation of the piece that covers the same tiles 
+    int ActionOffset; // first action index of the canonical rotation 
+};
+
+static RotPcGeometry Geometry[NUM_PIECES][Tw_NumRots]; 
+static int NumActions = 0; 
+
+static void InitGeometry(void) 
+{
+    for (Tw_Pc pc = 0; pc < NUM_PIECES; pc++) 
+    {
+        for (int rot = 0; rot < Tw_NumRots; rot++) 
+        {
+            RotPcGeometry* geo = &Geometry[pc][rot]; 
+            geo->NumTiles = 0; 
+            geo->NumContacts = 0; 
+
+            Tw_TileSet_FOR_EACH(Tw_RotPcInfos[Tw_ToRotPc(pc, rot)].Tiles, tile, 
+            {
+                geo->Tiles[geo->NumTiles++] = tile; 
+            });
+
+            Tw_TileSet_FOR_EACH(Tw_RotPcInfos[Tw_ToRotPc(pc, rot)].Contacts, tile, 
+            {
+                geo->Contacts[geo->NumContacts++] = tile; 
+            });
+
+            // tiles are visited in order, so equal shapes produce equal arrays
+            geo->Unique = true; 
+            geo->Canonical = rot; 
+            for (int prev = 0; prev < rot && geo->Unique; prev++) 
+            {
+                if (memcmp(Geometry[pc][prev].Tiles, geo->Tiles, sizeof(geo->Tiles)) == 0) 
+                {
+                    geo->Unique = false; 
+                    geo->Canonical = prev; 
+                }
+            }
+
+            // every contact of a unique rotation can be placed on every tile
+            geo->ActionOffset = geo->Unique ? NumActions : Geometry[pc][geo->Canonical].ActionOffset; 
+            if (geo->Unique) 
+            {
+                NumActions += geo->NumContacts * BOARD_TILES; 
+            }
+        }
+    }
+}
+
+// dense index of a valid move among all distinct placements, moves with equivalent rotations share an index 
+static int MoveActionIndex(Tw_Move move) 
+{
+    Tw_Pc pc = Tw_Move_Pc(move); 
+    const RotPcGeometry* geo = &Geometry[pc][Geometry[pc][Tw_Move_Rot(move)].Canonical]; 
+    Tw_Tile con = Tw_Move_Con(move); 
+
+    for (int i = 0; i < geo->NumContacts; i++) 
+    {
+        if (geo->Contacts[i] == con) 
+        {
+            return geo->ActionOffset + i * BOARD_TILES + Tw_Move_ToTile(move); 
+        }
+    }
+
+    return -1; 
+}
+
+// inverse of MoveActionIndex, the move uses the canonical rotation 
+static Tw_Move ActionIndexMove(long index) 
+{
+    if (index < 0 || index >= NumActions) 
+    {
+        return Tw_NoMove; 
+    }
+
+    for (Tw_Pc pc = 0; pc < NUM_PIECES; pc++) 
+    {
+        for (int rot = 0; rot < Tw_NumRots; rot++) 
+        {
+            const RotPcGeometry* geo = &Geometry[pc][rot]; 
+            long offset = index - geo->ActionOffset; 
+
+            if (geo->Unique && offset >= 0 && offset < geo->NumContacts * BOARD_TILES) 
+            {
+                return Tw_MakeMove_Safe(pc, rot, geo->Contacts[offset / BOARD_TILES], offset % BOARD_TILES); 
+            }
+        }
+    }
+
+    return Tw_NoMove; 
+}
+
+// random keys for hashing positions, generated with a fixed seed so hashes are stable between runs
+static uint64_t ZobristTiles[NUM_COLORS][BOARD_TILES]; 
+static uint64_t ZobristPcs[NUM_COLORS][NUM_PIECES]; 
+static uint64_t ZobristTurn[NUM_COLORS + 1]; 
+static uint64_t ZobristNumPlayers[NUM_COLORS + 1]; 
+
+static uint64_t SplitMix64(uint64_t* state) 
+{
+    uint64_t z = (*state += 0x9E3779B97F4A7C15ull); 
+    z = (z ^ (z >> 30)) * 0xBF58476D1CE4E5B9ull; 
+    z = (z ^ (z >> 27)) * 0x94D049BB133111EBull; 
+    return z ^ (z >> 31); 
+}
+
+static void InitZobrist(void) 
+{
+    uint64_t state = 0x74696C657765ull; // "tilewe" 
+
+    for (int color = 0; color < NUM_COLORS; color++) 
+    {
+        for (int tile = 0; tile < BOARD_TILES; tile++) ZobristTiles[color][tile] = SplitMix64(&state); 
+        for (int pc = 0; pc < NUM_PIECES; pc++) ZobristPcs[color][pc] = SplitMix64(&state); 
+    }
+
+    for (int i = 0; i <= NUM_COLORS; i++) 
+    {
+        ZobristTurn[i] = SplitMix64(&state); 
+        ZobristNumPlayers[i] = SplitMix64(&state); 
+    }
+}
+
+typedef struct MoveBuffer MoveBuffer; 
+
+// growable list of moves, uses the raw allocator so it can be filled without the GIL
+struct MoveBuffer 
+{
+    Tw_Move* Elements; 
+    Py_ssize_t Count; 
+    Py_ssize_t Capacity; 
+};
+
+static void MoveBuffer_Init(MoveBuffer* buf) 
+{
+    buf->Elements = NULL; 
+    buf->Count = 0; 
+    buf->Capacity = 0; 
+}
+
+static void MoveBuffer_Free(MoveBuffer* buf) 
+{
+    PyMem_RawFree(buf->Elements); 
+    MoveBuffer_Init(buf); 
+}
+
+static bool MoveBuffer_Reserve(MoveBuffer* buf, Py_ssize_t capacity) 
+{
+    if (capacity <= buf->Capacity) 
+    {
+        return true; 
+    }
+
+    Py_ssize_t newCapacity = buf->Capacity > 0 ? buf->Capacity * 2 : 256; 
+    while (newCapacity < capacity) 
+    {
+        newCapacity *= 2; 
+    }
+
+    Tw_Move* elements = PyMem_RawRealloc(buf->Elements, newCapacity * sizeof(Tw_Move)); 
+    if (!elements) 
+    {
+        return false; 
+    }
+
+    buf->Elements = elements; 
+    buf->Capacity = newCapacity; 
+    return true; 
+}
+
+static bool MoveBuffer_Add(MoveBuffer* buf, Tw_Move move) 
+{
+    if (buf->Count == buf->Capacity && !MoveBuffer_Reserve(buf, buf->Count + 1)) 
+    {
+        return false; 
+    }
+
+    buf->Elements[buf->Count++] = move; 
+    return true; 
+}
+
+// generates moves for any player using only the wanted pieces and open corners (NULL for all), 
+// returns false if memory runs out
+static bool GenFilteredMovesForPlayer(
+    const Tw_Board* board, 
+    Tw_Color player, 
+    bool unique, 
+    const bool* wantedPcs, 
+    const bool* wantedTiles, 
+    MoveBuffer* out
+) 
+{
+    if (player == board->CurTurn && unique && !wantedPcs && !wantedTiles) 
+    {
+        Tw_MoveList moves; 
+        Tw_InitMoveList(&moves); 
+        Tw_Board_GenMoves(board, &moves); 
+
+        if (!MoveBuffer_Reserve(out, out->Count + moves.Count)) 
+        {
+            return false; 
+        }
+
+        memcpy(out->Elements + out->Count, moves.Elements, moves.Count * sizeof(Tw_Move)); 
+        out->Count += moves.Count; 
+        return true; 
+    }
+
+    Tw_TileList corners; 
+    Tw_InitTileList(&corners); 
+    Tw_Board_PlayerCorners(board, player, &corners); 
+
+    Tw_PcList pcs; 
+    Tw_InitPcList(&pcs); 
+    Tw_Board_PlayerPcs(board, player, &pcs); 
+
+    // same candidates as the library generator: every contact of every piece on every open corner
+    for (int c = 0; c < corners.Count; c++) 
+    {
+        if (wantedTiles && !wantedTiles[corners.Elements[c]]) continue; 
+
+        for (int p = 0; p < pcs.Count; p++) 
+        {
+            if (wantedPcs && !wantedPcs[pcs.Elements[p]]) continue; 
+
+            for (int rot = 0; rot < Tw_NumRots; rot++) 
+            {
+                const RotPcGeometry* geo = &Geometry[pcs.Elements[p]][rot]; 
+                if (unique && !geo->Unique) continue; 
+
+                for (int i = 0; i < geo->NumContacts; i++) 
+                {
+                    Tw_Move move = Tw_MakeMove_Safe(pcs.Elements[p], rot, geo->Contacts[i], corners.Elements[c]); 
+
+                    if (move != Tw_NoMove && Tw_Board_IsLegalForPlayer(board, player, move) && !MoveBuffer_Add(out, move)) 
+                    {
+                        return false; 
+                    }
+                }
+            }
+        }
+    }
+
+    return true; 
+}
+
+static bool GenMovesForPlayer(const Tw_Board* board, Tw_Color player, bool unique, MoveBuffer* out) 
+{
+    return GenFilteredMovesForPlayer(board, player, unique, NULL, NULL, out); 
+}
+
+// a move on a corner only covers tiles within 4 of it and checks the tiles next to those, 
+// so a corner's moves stay the same while nothing within this radius changes 
+#define CACHE_RADIUS 5 
+#define CACHE_WINDOW (2 * CACHE_RADIUS + 1) 
+
+typedef struct CornerMoves CornerMoves; 
+
+// every legal move of one player on one open corner, with the tiles and pieces they were generated from 
+struct CornerMoves 
+{
+    bool Valid; 
+    uint32_t Pcs; 
+    unsigned char Window[CACHE_WINDOW * CACHE_WINDOW]; 
+    MoveBuffer Moves; 
+};
+
+typedef struct LegalMoveCache LegalMoveCache; 
+
+// per player, per corner move lists that are reused until a move lands near the corner, entries are 
+// checked against the board they are used with, so one cache works across push, pop and scratch boards 
+struct LegalMoveCache 
+{
+    CornerMoves Entries[NUM_COLORS][BOARD_TILES]; 
+    BorrowFlag Use; // only one thread can update the cache at a time 
+};
+
+static LegalMoveCache* MoveCache_New(void) 
+{
+    // zeroed entries are invalid and own no moves 
+    return PyMem_RawCalloc(1, sizeof(LegalMoveCache)); 
+}
+
+static void MoveCache_Free(LegalMoveCache* cache) 
+{
+    if (!cache) return; 
+
+    for (int player = 0; player < NUM_COLORS; player++) 
+    {
+        for (int tile = 0; tile < BOARD_TILES; tile++) 
+        {
+            MoveBuffer_Free(&cache->Entries[player][tile].Moves); 
+        }
+    }
+
+    PyMem_RawFree(cache); 
+}
+
+static void ReadWindow(const Tw_Board* board, Tw_Tile corner, unsigned char window[CACHE_WINDOW * CACHE_WINDOW]) 
+{
+    int cx, cy; 
+    Tw_Tile_ToCoords(corner, &cx, &cy); 
+
+    for (int dy = 0; dy < CACHE_WINDOW; dy++) 
+    {
+        for (int dx = 0; dx < CACHE_WINDOW; dx++) 
+        {
+            int x = cx + dx - CACHE_RADIUS; 
+            int y = cy + dy - CACHE_RADIUS; 
+
+            window[dy * CACHE_WINDOW + dx] = Tw_CoordsInBounds(x, y) ? 
+                (unsigned char) Tw_Board_ColorAt(board, Tw_MakeTile(x, y)) : 0xFF; 
+        }
+    }
+}
+
+// gets the cached moves on a corner, regenerating them if the tiles around it changed or pieces came back, 
+// cached moves can include pieces that have since been used, returns NULL if memory runs out 
+static const CornerMoves* MoveCache_Corner(LegalMoveCache* cache, const Tw_Board* board, Tw_Color player, Tw_Tile corner, const Tw_PcList* pcs) 
+{
+    CornerMoves* entry = &cache->Entries[player][corner]; 
+    unsigned char window[CACHE_WINDOW * CACHE_WINDOW]; 
+    ReadWindow(board, corner, window); 
+
+    uint32_t pcsMask = 0; 
+    for (int p = 0; p < pcs->Count; p++) 
+    {
+        pcsMask |= 1u << pcs->Elements[p]; 
+    }
+
+    if (entry->Valid && (pcsMask & ~entry->Pcs) == 0 && memcmp(window, entry->Window, sizeof(window)) == 0) 
+    {
+        return entry; 
+    }
+
+    // same candidates and order as GenFilteredMovesForPlayer, including every rotation 
+    entry->Valid = false; 
+    entry->Moves.Count = 0; 
+
+    for (int p = 0; p < pcs->Count; p++) 
+    {
+        for (int rot = 0; rot < Tw_NumRots; rot++) 
+        {
+            const RotPcGeometry* geo = &Geometry[pcs->Elements[p]][rot]; 
+
+            for (int i = 0; i < geo->NumContacts; i++) 
+            {
+                Tw_Move move = Tw_MakeMove_Safe(pcs->Elements[p], rot, geo->Contacts[i], corner); 
+
+                if (move != Tw_NoMove && Tw_Board_IsLegalForPlayer(board, player, move) && !MoveBuffer_Add(&entry->Moves, move)) 
+                {
+                    return NULL; 
+                }
+            }
+        }
+    }
+
+    entry->Valid = true; 
+    entry->Pcs = pcsMask; 
+    memcpy(entry->Window, window, sizeof(window)); 
+    return entry; 
+}
+
+// same moves as GenFilteredMovesForPlayer without the library generator's ordering, 
+// pass a NULL buffer to only count them, returns -1 if memory runs out 
+static Py_ssize_t MoveCache_GenMoves(
+    LegalMoveCache* cache, 
+    const Tw_Board* board, 
+    Tw_Color player, 
+    bool unique, 
+    const bool* wantedPcs, 
+    const bool* wantedTiles, 
+    MoveBuffer* out
+) 
+{
+    Tw_TileList corners; 
+    Tw_InitTileList(&corners); 
+    Tw_Board_PlayerCorners(board, player, &corners); 
+
+    Tw_PcList pcs; 
+    Tw_InitPcList(&pcs); 
+    Tw_Board_PlayerPcs(board, player, &pcs); 
+
+    uint32_t pcsMask = 0; 
+    for (int p = 0; p < pcs.Count; p++) 
+    {
+        if (!wantedPcs || wantedPcs[pcs.Elements[p]]) pcsMask |= 1u << pcs.Elements[p]; 
+    }
+
+    Py_ssize_t count = 0; 
+    for (int c = 0; c < corners.Count; c++) 
+    {
+        if (wantedTiles && !wantedTiles[corners.Elements[c]]) continue; 
+
+        const CornerMoves* entry = MoveCache_Corner(cache, board, player, corners.Elements[c], &pcs); 
+        if (!entry) 
+        {
+            return -1; 
+        }
+
+        for (Py_ssize_t i = 0; i < entry->Moves.Count; i++) 
+        {
+            Tw_Move move = entry->Moves.Elements[i]; 
+            if (!(pcsMask & (1u << Tw_Move_Pc(move)))) continue; 
+            if (unique && !Geometry[Tw_Move_Pc(move)][Tw_Move_Rot(move)].Unique) continue; 
+
+            if (out && !MoveBuffer_Add(out, move)) 
+            {
+                return -1; 
+            }
+
+            count++; 
+        }
+    }
+
+    return count; 
+}
+
 typedef struct MoveObject MoveObject; 
 
 struct MoveObject 
@@ -13,7 +510,9 @@ struct MoveObject
     Tw_Move Move; 
 };
 
-static int Move_init(MoveObject* self, PyObject* args, PyObject* kwds) 
+static PyObject* GetMoveObject(Tw_Move move); 
+
+static PyObject* Move_new(PyTypeObject* type, PyObject* args, PyObject* kwds) 
 {
     static const char* kwlist[] = 
     {
@@ -28,54 +527,37 @@ static int Move_init(MoveObject* self, PyObject* args, PyObject* kwds)
     if (!PyArg_ParseTupleAndKeywords(args, kwds, "IIII", kwlist, &pc, &rot, &con, &tile)) 
     {
         PyErr_SetString(PyExc_AttributeError, "all parameters must be used"); 
-        return -1;
+        return NULL;
     }
 
-    self->Move = Tw_MakeMove_Safe(pc, rot, con, tile); 
+    Tw_Move move = Tw_MakeMove_Safe(pc, rot, con, tile); 
 
-    if (self->Move == Tw_NoMove) 
+    if (move == Tw_NoMove) 
     {
         PyErr_SetString(PyExc_AttributeError, "move must have a valid piece, rotation, contact, and tile combination"); 
-        return -1; 
+        return NULL; 
     }
 
-    return 0; 
-}
-
-static PyObject* Move_getstate(MoveObject* self, PyObject* Py_UNUSED(ignored)) 
-{
-    return Py_BuildValue("I", (unsigned) self->Move); 
+    return GetMoveObject(move); 
 }
 
-static PyObject* Move_setstate(MoveObject* self, PyObject* state) 
+static PyObject* Move_reduce(MoveObject* self, PyObject* Py_UNUSED(ignored)) 
 {
-    if (!PyLong_CheckExact(state)) 
-    {
-        PyErr_SetString(PyExc_ValueError, "Pickled object is not an int."); 
-        return NULL; 
-    }
-
-    Tw_Move move = (Tw_Move) PyLong_AsUnsignedLong(state); 
-
-    if (move == Tw_NoMove || move != Tw_MakeMove_Safe(
-        Tw_Move_Pc(move), 
-        Tw_Move_Rot(move), 
-        Tw_Move_Con(move), 
-        Tw_Move_ToTile(move)
-    )) 
-    {
-        PyErr_SetString(PyExc_ValueError, "Pickled object is not a valid move."); 
-        return NULL; 
-    }
-
-    Py_RETURN_NONE; 
+    return Py_BuildValue("(O(IIII))", (PyObject*) Py_TYPE(self), 
+        (unsigned) Tw_Move_Pc(self->Move), 
+        (unsigned) Tw_Move_Rot(self->Move), 
+        (unsigned) Tw_Move_Con(self->Move), 
+        (unsigned) Tw_Move_ToTile(self->Move)
+    ); 
 }
 
 static PyObject* Move_richcompare(MoveObject* self, PyObject* obj, int op); 
 
-static PyObject* Move_hash(MoveObject* self, PyObject* Py_UNUSED(ignored)) 
+static Py_hash_t Move_hash(MoveObject* self) 
 {
-    return PyLong_FromUnsignedLong(self->Move); 
+    // -1 is reserved for errors 
+    Py_hash_t hash = (Py_hash_t) self->Move; 
+    return hash == -1 ? -2 : hash; 
 }
 
 static PyObject* Move_str(MoveObject* self, PyObject* Py_UNUSED(ignored)) 
@@ -111,19 +593,27 @@ static PyObject* Move_Tile(MoveObject* self, void* closure)
     return PyLong_FromLong(Tw_Move_ToTile(self->Move)); 
 }
 
+static PyObject* Move_Packed(MoveObject* self, void* closure) 
+{
+    return PyLong_FromUnsignedLong(self->Move); 
+}
+
+static PyObject* Move_FromPacked(PyTypeObject* type, PyObject* value); 
+
 static PyGetSetDef Move_getsets[] = 
 {
     { "piece", Move_Piece, NULL, "Gets the move piece", NULL },
     { "rotation", Move_Rotation, NULL, "Gets the move rotation", NULL },
     { "contact", Move_Contact, NULL, "Gets the move contact tile", NULL },
     { "to_tile", Move_Tile, NULL, "Gets the move open corner", NULL },
+    { "packed", Move_Packed, NULL, "Gets the move as a packed integer", NULL },
     { NULL }
 };
 
 static PyMethodDef Move_methods[] = 
 {
-    { "__getstate__", Move_getstate, METH_NOARGS, "Pickle the move" }, 
-    { "__setstate__", Move_setstate, METH_O, "Un-pickle the move" }, 
+    { "__reduce__", Move_reduce, METH_NOARGS, "Pickle the move" }, 
+    { "from_packed", Move_FromPacked, METH_O | METH_CLASS, "Creates a move from its packed integer form" }, 
     { NULL }
 };
 
@@ -135,8 +625,7 @@ static PyTypeObject MoveType =
     .tp_basicsize = sizeof(MoveObject), 
     .tp_itemsize = 0, 
     .tp_flags = Py_TPFLAGS_DEFAULT, 
-    .tp_new = PyType_GenericNew, 
-    .tp_init = Move_init, 
+    .tp_new = Move_new, 
     .tp_str = Move_str, 
     .tp_repr = Move_str, 
     .tp_hash = Move_hash, 
@@ -145,6 +634,77 @@ static PyTypeObject MoveType =
     .tp_getset = Move_getsets
 };
 
+#define NUM_MOVE_SHAPES (NUM_PIECES * Tw_NumRots * MAX_PIECE_TILES) 
+
+// one shared Move object per distinct move, indexed by MoveCacheIndex and filled in as moves are first seen 
+static PyObject** MoveCache = NULL; 
+
+#ifdef Py_GIL_DISABLED
+static PyMutex MoveCacheMutex; 
+#endif
+
+// index of a valid move's piece, rotation, contact, and tile in the cache, or -1 if it has none 
+static Py_ssize_t MoveCacheIndex(Tw_Move move) 
+{
+    Tw_Pc pc = Tw_Move_Pc(move); 
+    Tw_Rot rot = Tw_Move_Rot(move); 
+    Tw_Tile con = Tw_Move_Con(move); 
+    const RotPcGeometry* geo = &Geometry[pc][rot]; 
+
+    for (int i = 0; i < geo->NumContacts; i++) 
+    {
+        if (geo->Contacts[i] == con) 
+        {
+            return ((Py_ssize_t) (pc * Tw_NumRots + rot) * MAX_PIECE_TILES + i) * BOARD_TILES + Tw_Move_ToTile(move); 
+        }
+    }
+
+    return -1; 
+}
+
+// returns a new reference to the shared Move object for a valid move 
+static PyObject* GetMoveObject(Tw_Move move) 
+{
+    Py_ssize_t index = MoveCacheIndex(move); 
+    PyObject* out = NULL; 
+
+#ifdef Py_GIL_DISABLED
+    PyMutex_Lock(&MoveCacheMutex); 
+#endif
+
+    if (index >= 0 && !MoveCache) 
+    {
+        MoveCache = PyMem_RawCalloc(NUM_MOVE_SHAPES * BOARD_TILES, sizeof(PyObject*)); 
+    }
+
+    if (index >= 0 && MoveCache && MoveCache[index]) 
+    {
+        out = Py_NewRef(MoveCache[index]); 
+    }
+    else 
+    {
+        MoveObject* mv = PyObject_New(MoveObject, &MoveType); 
+
+        if (mv) 
+        {
+            mv->Move = move; 
+            out = (PyObject*) mv; 
+
+            // the cache keeps its own reference so the object lives as long as the module 
+            if (index >= 0 && MoveCache) 
+            {
+                MoveCache[index] = Py_NewRef(out); 
+            }
+        }
+    }
+
+#ifdef Py_GIL_DISABLED
+    PyMutex_Unlock(&MoveCacheMutex); 
+#endif
+
+    return out; 
+}
+
 static PyObject* Move_richcompare(MoveObject* self, PyObject* obj, int op) 
 {
     if (!PyObject_TypeCheck(obj, &MoveType)) 
@@ -180,425 +740,3255 @@ static PyObject* Move_richcompare(MoveObject* self, PyObject* obj, int op)
     return out; 
 }
 
-typedef struct BoardObject BoardObject; 
+static bool MoveFromObject(PyObject* obj, Tw_Move* move); 
 
-struct BoardObject 
+static PyObject* Move_FromPacked(PyTypeObject* type, PyObject* value) 
 {
-    PyObject_HEAD 
-    Tw_Board Board; 
-};
+    Tw_Move move; 
 
-static int Board_init(BoardObject* self, PyObject* args, PyObject* kwds) 
+    if (!PyLong_Check(value) || !MoveFromObject(value, &move)) 
+    {
+        if (!PyErr_Occurred()) PyErr_SetString(PyExc_AttributeError, "packed move must be an int"); 
+        return NULL; 
+    }
+
+    return GetMoveObject(move); 
+}
+
+static bool IsValidMove(Tw_Move move) 
 {
-    static const char* kwlist[] = { "n_players", NULL }; 
+    return move != Tw_NoMove && move == Tw_MakeMove_Safe(
+        Tw_Move_Pc(move), 
+        Tw_Move_Rot(move), 
+        Tw_Move_Con(move), 
+        Tw_Move_ToTile(move)
+    ); 
+}
 
-    int numPlayers = 4; 
-    if (!PyArg_ParseTupleAndKeywords(args, kwds, "|i", kwlist, &numPlayers)) 
+// accepts a Move or its packed integer form 
+static bool MoveFromObject(PyObject* obj, Tw_Move* move) 
+{
+    if (PyObject_TypeCheck(obj, &MoveType)) 
     {
-        return -1; 
+        *move = ((MoveObject*) obj)->Move; 
+        return true; 
     }
 
-    if (numPlayers < 1 || numPlayers > 4) 
+    if (PyLong_Check(obj)) 
     {
-        PyErr_SetString(PyExc_AttributeError, "n_players must be between 1 and 4"); 
-        return -1; 
+        unsigned long value = PyLong_AsUnsignedLong(obj); 
+
+        if (!(value == (unsigned long) -1 && PyErr_Occurred()) && IsValidMove((Tw_Move) value) && value == (Tw_Move) value) 
+        {
+            *move = (Tw_Move) value; 
+            return true; 
+        }
+
+        PyErr_Clear(); 
+        PyErr_SetString(PyExc_AttributeError, "packed move must be valid"); 
+        return false; 
     }
 
-    Tw_InitBoard(&self->Board, numPlayers); 
-    return 0; 
+    PyErr_SetString(PyExc_AttributeError, "Must be a move"); 
+    return false; 
 }
 
-static PyObject* Board_CurrentPlayer(BoardObject* self, void* closure) 
+static PyObject* ArrayModuleType = NULL; // array.array 
+
+// creates an array.array with the given typecode from raw machine values
+static PyObject* NewPackedArray(const char* typecode, const void* data, Py_ssize_t numBytes) 
 {
-    return PyLong_FromLong(self->Board.CurTurn); 
+    return PyObject_CallFunction(ArrayModuleType, "sy#", typecode, (const char*) data, numBytes); 
 }
 
-static PyObject* Board_NumPlayers(BoardObject* self, void* closure) 
+static PyObject* PackMoves(const MoveBuffer* moves) 
 {
-    return PyLong_FromLong(self->Board.NumPlayers); 
+    unsigned* packed = PyMem_Malloc((moves->Count > 0 ? moves->Count : 1) * sizeof(unsigned)); 
+
+    if (!packed) 
+    {
+        return PyErr_NoMemory(); 
+    }
+
+    for (Py_ssize_t i = 0; i < moves->Count; i++) 
+    {
+        packed[i] = (unsigned) moves->Elements[i]; 
+    }
+
+    PyObject* array = NewPackedArray("I", packed, moves->Count * sizeof(unsigned)); 
+    PyMem_Free(packed); 
+    return array; 
 }
 
-static PyObject* Board_Finished(BoardObject* self, void* closure) 
+// reads moves from a buffer of packed 32-bit moves (such as array('I')) or any iterable of moves, 
+// without validation invalid entries are kept as is and None is read as Tw_NoMove 
+static bool MovesFromObject(PyObject* obj, MoveBuffer* out, bool validate) 
 {
-    return PyBool_FromLong(self->Board.Finished); 
+    if (PyObject_CheckBuffer(obj)) 
+    {
+        Py_buffer view; 
+        if (PyObject_GetBuffer(obj, &view, PyBUF_C_CONTIGUOUS | PyBUF_FORMAT) < 0) 
+        {
+            return false; 
+        }
+
+        const char* format = view.format ? view.format : "B"; 
+        if (*format == '@' || *format == '=') format++; 
+
+        if (view.itemsize != sizeof(unsigned) || !strchr("IiLl", *format) || format[1] != '\0') 
+        {
+            PyBuffer_Release(&view); 
+            PyErr_SetString(PyExc_AttributeError, "packed moves must be 32-bit integers"); 
+            return false; 
+        }
+
+        Py_ssize_t count = view.len / view.itemsize; 
+        if (!MoveBuffer_Reserve(out, out->Count + count)) 
+        {
+            PyBuffer_Release(&view); 
+            PyErr_NoMemory(); 
+            return false; 
+        }
+
+        const unsigned* packed = view.buf; 
+        for (Py_ssize_t i = 0; i < count; i++) 
+        {
+            if (validate && !IsValidMove((Tw_Move) packed[i])) 
+            {
+                PyBuffer_Release(&view); 
+                PyErr_SetString(PyExc_AttributeError, "packed move must be valid"); 
+                return false; 
+            }
+
+            out->Elements[out->Count++] = (Tw_Move) packed[i]; 
+        }
+
+        PyBuffer_Release(&view); 
+        return true; 
+    }
+
+    PyObject* seq = PySequence_Fast(obj, "moves must be a buffer of packed moves or an iterable of moves"); 
+    if (!seq) 
+    {
+        return false; 
+    }
+
+    Py_ssize_t count = PySequence_Fast_GET_SIZE(seq); 
+    if (!MoveBuffer_Reserve(out, out->Count + count)) 
+    {
+        Py_DECREF(seq); 
+        PyErr_NoMemory(); 
+        return false; 
+    }
+
+    for (Py_ssize_t i = 0; i < count; i++) 
+    {
+        PyObject* item = PySequence_Fast_GET_ITEM(seq, i); 
+        Tw_Move move; 
+
+        if (!validate && (item == Py_None || PyLong_Check(item))) 
+        {
+            move = item == Py_None ? Tw_NoMove : (Tw_Move) PyLong_AsUnsignedLongMask(item); 
+        }
+        else if (!MoveFromObject(item, &move)) 
+        {
+            Py_DECREF(seq); 
+            return false; 
+        }
+
+        out->Elements[out->Count++] = move; 
+    }
+
+    Py_DECREF(seq); 
+    return true; 
 }
 
-static PyObject* Board_Ply(BoardObject* self, void* closure) 
+typedef struct ArrayObject ArrayObject; 
+
+// owns a block of numeric data that is exposed to Python as a (possibly multi-dimensional) buffer
+struct ArrayObject 
 {
-    return PyLong_FromLong(self->Board.Ply); 
-}
+    PyObject_HEAD 
+    char* Data; 
+    Py_ssize_t Length; 
+    Py_ssize_t ItemSize; 
+    int NumDims; 
+    Py_ssize_t Shape[3]; 
+    Py_ssize_t Strides[3]; 
+    const char* Format; 
+};
 
-static PyObject* Board_Moves(BoardObject* self, void* closure) 
+static void Array_dealloc(ArrayObject* self) 
 {
-    PyObject* list = PyList_New((unsigned) self->Board.Ply); 
+    PyMem_Free(self->Data); 
+    Py_TYPE(self)->tp_free((PyObject*) self); 
+}
 
-    for (int i = 0; i < self->Board.Ply; i++) 
+static int Array_getbuffer(ArrayObject* self, Py_buffer* view, int flags) 
+{
+    if (PyBuffer_FillInfo(view, (PyObject*) self, self->Data, self->Length, 0, flags) < 0) 
     {
-        MoveObject* mv = PyObject_New(MoveObject, &MoveType); 
-        mv->Move = self->Board.History[i].Move; 
+        return -1; 
+    }
+
+    view->itemsize = self->ItemSize; 
+    view->format = (flags & PyBUF_FORMAT) ? (char*) self->Format : NULL; 
 
-        PyList_SetItem(list, i, mv); 
+    if (flags & PyBUF_ND) 
+    {
+        view->ndim = self->NumDims; 
+        view->shape = self->Shape; 
+        view->strides = (flags & PyBUF_STRIDES) == PyBUF_STRIDES ? self->Strides : NULL; 
     }
 
-    return list; 
+    return 0; 
 }
 
-static PyObject* Board_Scores(BoardObject* self, void* closure) 
+static PyBufferProcs Array_as_buffer = 
 {
-    PyObject* list = PyList_New((unsigned) self->Board.NumPlayers); 
+    .bf_getbuffer = Array_getbuffer, 
+    .bf_releasebuffer = NULL
+};
 
-    for (int i = 0; i < self->Board.NumPlayers; i++) 
+static PyTypeObject ArrayType = 
+{
+    .ob_base = PyVarObject_HEAD_INIT(NULL, 0) 
+    .tp_name = "ctilewe.Array", 
+    .tp_doc = PyDoc_STR("Storage for numeric data returned by the board, accessed through memoryview."), 
+    .tp_basicsize = sizeof(ArrayObject), 
+    .tp_itemsize = 0, 
+    .tp_flags = Py_TPFLAGS_DEFAULT, 
+    .tp_dealloc = Array_dealloc, 
+    .tp_as_buffer = &Array_as_buffer
+};
+
+// creates zeroed C-contiguous storage and returns a memoryview of it, the data can be filled in afterwards
+static PyObject* NewArrayView(const char* format, Py_ssize_t itemSize, int numDims, const Py_ssize_t* shape, void** data) 
+{
+    ArrayObject* array = PyObject_New(ArrayObject, &ArrayType); 
+
+    if (!array) 
     {
-        PyList_SetItem(
-            list, 
-            i, 
-            PyLong_FromLong(self->Board.Players[i].Score)
-        );
+        return NULL; 
     }
 
-    return list; 
+    array->Format = format; 
+    array->ItemSize = itemSize; 
+    array->NumDims = numDims; 
+    array->Length = itemSize; 
+
+    for (int i = numDims - 1; i >= 0; i--) 
+    {
+        array->Shape[i] = shape[i]; 
+        array->Strides[i] = array->Length; 
+        array->Length *= shape[i]; 
+    }
+
+    // always allocate at least one byte so empty arrays still have a valid pointer
+    array->Data = PyMem_Calloc(array->Length > 0 ? array->Length : 1, 1); 
+
+    if (!array->Data) 
+    {
+        Py_DECREF(array); 
+        return PyErr_NoMemory(); 
+    }
+
+    *data = array->Data; 
+
+    PyObject* view = PyMemoryView_FromObject((PyObject*) array); 
+    Py_DECREF(array); 
+    return view; 
 }
 
-static PyObject* Board_Winners(BoardObject* self, void* closure) 
+typedef struct BoardObject BoardObject; 
+
+struct BoardObject 
 {
-    PyObject* list = PyList_New(0); 
+    PyObject_HEAD 
+    Tw_Board Board; 
+    unsigned char Colors[BOARD_TILES]; // mirror of each tile's color, exposed through the buffer protocol
+    uint64_t Zobrist; // hash of the placed tiles and used pieces, excludes the turn 
+    BorrowFlag Use; 
+    LegalMoveCache* Cache; // NULL unless move_cache is enabled 
+};
 
-    int best = -1; 
-    for (int i = 0; i < self->Board.NumPlayers; i++) 
-    {
-        int score = self->Board.Players[i].Score; 
+static PyTypeObject BoardType; 
 
-        if (score > best) 
-        {
-            PyList_SetSlice(list, 0, PyList_Size(list), NULL); 
-            best = score; 
-        }
+// gets the board tiles covered by a move, returns the number of tiles 
+static int MoveTiles(Tw_Move move, Tw_Tile tiles[MAX_PIECE_TILES]) 
+{
+    const RotPcGeometry* geo = &Geometry[Tw_Move_Pc(move)][Tw_Move_Rot(move)]; 
+    int count = 0; 
+    int conX, conY, toX, toY; 
+    Tw_Tile_ToCoords(Tw_Move_Con(move), &conX, &conY); 
+    Tw_Tile_ToCoords(Tw_Move_ToTile(move), &toX, &toY); 
 
-        if (score == best) 
+    for (int i = 0; i < geo->NumTiles; i++) 
+    {
+        int x, y; 
+        Tw_Tile_ToCoords(geo->Tiles[i], &x, &y); 
+        x += toX - conX; 
+        y += toY - conY; 
+
+        if (Tw_CoordsInBounds(x, y)) 
         {
-            PyList_Append(list, PyLong_FromLong(i)); 
+            tiles[count++] = Tw_MakeTile(x, y); 
         }
     }
 
-    return list; 
+    return count; 
 }
 
-static PyObject* Board_GenMoves(BoardObject* self, PyObject* Py_UNUSED(ignored)) 
+// zobrist contribution of a move played by a color, xor-ing it in again removes it 
+static uint64_t MoveZobrist(Tw_Move move, Tw_Color color, const Tw_Tile* tiles, int count) 
 {
-    Tw_MoveList moves; 
-    Tw_InitMoveList(&moves); 
-    Tw_Board_GenMoves(&self->Board, &moves); 
+    if (color < 0 || color >= NUM_COLORS) 
+    {
+        return 0; 
+    }
 
-    PyObject* list = PyList_New(moves.Count); 
+    uint64_t key = ZobristPcs[color][Tw_Move_Pc(move)]; 
+    for (int i = 0; i < count; i++) 
+    {
+        key ^= ZobristTiles[color][tiles[i]]; 
+    }
+
+    return key; 
+}
 
-    for (int i = 0; i < moves.Count; i++) 
+// rebuilds the mirrored state from scratch after the underlying board is replaced
+static void Board_SyncMirror(BoardObject* self) 
+{
+    for (Tw_Tile tile = 0; tile < BOARD_TILES; tile++) 
     {
-        MoveObject* mv = PyObject_New(MoveObject, &MoveType); 
-        mv->Move = moves.Elements[i]; 
+        self->Colors[tile] = (unsigned char) Tw_Board_ColorAt(&self->Board, tile); 
+    }
 
-        PyList_SetItem(list, i, mv); 
+    self->Zobrist = 0; 
+    for (int i = 0; i < self->Board.Ply; i++) 
+    {
+        Tw_Move move = self->Board.History[i].Move; 
+        Tw_Tile tiles[MAX_PIECE_TILES]; 
+        int count = MoveTiles(move, tiles); 
+
+        self->Zobrist ^= MoveZobrist(move, self->Colors[Tw_Move_ToTile(move)], tiles, count); 
     }
+}
 
-    return list; 
+static uint64_t Board_PositionKey(const BoardObject* self) 
+{
+    return self->Zobrist ^ ZobristTurn[self->Board.CurTurn] ^ ZobristNumPlayers[self->Board.NumPlayers]; 
 }
 
-static PyObject* Board_Push(BoardObject* self, PyObject* args, PyObject* kwds) 
+// all pushes made through the Python API go through here so the mirrored state stays in sync
+static void Board_DoPush(BoardObject* self, Tw_Move move) 
 {
-    static const char* kwlist[] = 
+    Tw_Tile tiles[MAX_PIECE_TILES]; 
+    int count = MoveTiles(move, tiles); 
+
+    Tw_Board_Push(&self->Board, move); 
+
+    for (int i = 0; i < count; i++) 
     {
-        "move", 
-        NULL
-    };
+        self->Colors[tiles[i]] = (unsigned char) Tw_Board_ColorAt(&self->Board, tiles[i]); 
+    }
+
+    // the contact is always on the board, so its tile holds the color that just moved
+    self->Zobrist ^= MoveZobrist(move, self->Colors[Tw_Move_ToTile(move)], tiles, count); 
+}
 
-    MoveObject* move; 
+static void Board_DoPop(BoardObject* self) 
+{
+    Tw_Move move = self->Board.History[self->Board.Ply - 1].Move; 
+    Tw_Tile tiles[MAX_PIECE_TILES]; 
+    int count = MoveTiles(move, tiles); 
+
+    self->Zobrist ^= MoveZobrist(move, self->Colors[Tw_Move_ToTile(move)], tiles, count); 
+
+    Tw_Board_Pop(&self->Board); 
 
-    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O", kwlist, &move)) 
+    for (int i = 0; i < count; i++) 
     {
-        return NULL; 
+        self->Colors[tiles[i]] = (unsigned char) Tw_Board_ColorAt(&self->Board, tiles[i]); 
     }
+}
+
+static void Board_dealloc(BoardObject* self) 
+{
+    MoveCache_Free(self->Cache); 
+    Py_TYPE(self)->tp_free((PyObject*) self); 
+}
 
-    if (!PyObject_TypeCheck(move, &MoveType)) 
+// starts a new game in place, sets the Python error on failure 
+static bool Board_Reset(BoardObject* self, int numPlayers) 
+{
+    if (numPlayers < 1 || numPlayers > 4) 
     {
-        PyErr_SetString(PyExc_AttributeError, "Must be a move"); 
-        return NULL; 
+        PyErr_SetString(PyExc_AttributeError, "n_players must be between 1 and 4"); 
+        return false; 
     }
 
-    Tw_Board_Push(&self->Board, move->Move); 
+    if (!Borrow(&self->Use, true)) 
+    {
+        return false; 
+    }
 
-    Py_RETURN_NONE; 
+    Tw_InitBoard(&self->Board, numPlayers); 
+    Board_SyncMirror(self); 
+    Unborrow(&self->Use, true); 
+    return true; 
 }
 
-static PyObject* Board_ColorAt(BoardObject* self, PyObject* args, PyObject* kwds) 
+static int Board_init(BoardObject* self, PyObject* args, PyObject* kwds) 
 {
-    static const char* kwlist[] = 
+    static const char* kwlist[] = { "n_players", NULL }; 
+
+    int numPlayers = 4; 
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "|i", kwlist, &numPlayers)) 
     {
-        "tile", 
-        NULL
-    };
+        return -1; 
+    }
 
-    unsigned long tile; 
+    return Board_Reset(self, numPlayers) ? 0 : -1; 
+}
 
-    if (!PyArg_ParseTupleAndKeywords(args, kwds, "I", kwlist, &tile)) 
+static PyObject* Board_ResetMethod(BoardObject* self, PyObject* args, PyObject* kwds) 
+{
+    static const char* kwlist[] = { "n_players", NULL }; 
+
+    PyObject* numPlayersObj = Py_None; 
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "|O", kwlist, &numPlayersObj)) 
     {
         return NULL; 
     }
 
-    return PyLong_FromUnsignedLong(Tw_Board_ColorAt(&self->Board, tile)); 
+    // keep the current number of players by default 
+    int numPlayers = numPlayersObj == Py_None ? self->Board.NumPlayers : PyLong_AsLong(numPlayersObj); 
+    if (numPlayers == -1 && PyErr_Occurred()) 
+    {
+        return NULL; 
+    }
+
+    if (!Board_Reset(self, numPlayers)) 
+    {
+        return NULL; 
+    }
+
+    Py_RETURN_NONE; 
 }
 
-static bool ForPlayerArgHandler(BoardObject* self, PyObject* args, PyObject* kwds, int* player) 
+static PyObject* Board_LoadFrom(BoardObject* self, PyObject* other) 
 {
-    static const char* kwlist[] = 
+    if (!PyObject_TypeCheck(other, &BoardType)) 
     {
-        "for_player", 
-        NULL
-    };
-
-    *player = Tw_Color_None; 
+        PyErr_SetString(PyExc_AttributeError, "other must be a Board"); 
+        return NULL; 
+    }
 
-    if (!PyArg_ParseTupleAndKeywords(args, kwds, "|i", kwlist, player)) 
+    BoardObject* source = (BoardObject*) other; 
+    if (source == self) 
     {
-        *player = -1; 
-        return false;
+        Py_RETURN_NONE; 
     }
 
-    if (*player == Tw_Color_None) 
+    if (!Borrow(&self->Use, true)) 
     {
-        *player = self->Board.CurTurn; 
+        return NULL; 
     }
 
-    if (*player < 0 || *player >= self->Board.NumPlayers) 
+    if (!Borrow(&source->Use, false)) 
     {
-        *player = -1; 
-        PyErr_SetString(PyExc_AttributeError, "for_player must be valid or None"); 
-        return false;
+        Unborrow(&self->Use, true); 
+        return NULL; 
+    }
+
+    // same as copy, but into an existing board, which keeps its own move cache 
+    memcpy(&self->Board, &source->Board, sizeof(Tw_Board)); 
+    memcpy(self->Colors, source->Colors, sizeof(self->Colors)); 
+    self->Zobrist = source->Zobrist; 
+
+    Unborrow(&source->Use, false); 
+    Unborrow(&self->Use, true); 
+    Py_RETURN_NONE; 
+}
+
+static PyObject* Board_CurrentPlayer(BoardObject* self, void* closure) 
+{
+    return PyLong_FromLong(self->Board.CurTurn); 
+}
+
+static PyObject* Board_NumPlayers(BoardObject* self, void* closure) 
+{
+    return PyLong_FromLong(self->Board.NumPlayers); 
+}
+
+static PyObject* Board_Finished(BoardObject* self, void* closure) 
+{
+    return PyBool_FromLong(self->Board.Finished); 
+}
+
+static PyObject* Board_Ply(BoardObject* self, void* closure) 
+{
+    return PyLong_FromLong(self->Board.Ply); 
+}
+
+static PyObject* Board_MoveCacheEnabled(BoardObject* self, void* closure) 
+{
+    return PyBool_FromLong(self->Cache != NULL); 
+}
+
+static int Board_SetMoveCacheEnabled(BoardObject* self, PyObject* value, void* closure) 
+{
+    int enable = value ? PyObject_IsTrue(value) : 0; 
+    if (enable < 0) 
+    {
+        return -1; 
+    }
+
+    if (enable == (self->Cache != NULL)) 
+    {
+        return 0; 
+    }
+
+    if (!Borrow(&self->Use, true)) 
+    {
+        return -1; 
+    }
+
+    if (enable) 
+    {
+        self->Cache = MoveCache_New(); 
+    }
+    else if (Borrow(&self->Cache->Use, true)) 
+    {
+        MoveCache_Free(self->Cache); 
+        self->Cache = NULL; 
+    }
+    else 
+    {
+        Unborrow(&self->Use, true); 
+        return -1; 
+    }
+
+    Unborrow(&self->Use, true); 
+
+    if (enable && !self->Cache) 
+    {
+        PyErr_NoMemory(); 
+        return -1; 
+    }
+
+    return 0; 
+}
+
+static PyObject* Board_ZobristKey(BoardObject* self, void* closure) 
+{
+    return PyLong_FromUnsignedLongLong(Board_PositionKey(self)); 
+}
+
+static Py_hash_t Board_hash(BoardObject* self) 
+{
+    Py_hash_t hash = (Py_hash_t) Board_PositionKey(self); 
+    return hash == -1 ? -2 : hash; 
+}
+
+static bool Board_SamePosition(BoardObject* a, BoardObject* b) 
+{
+    if (Board_PositionKey(a) != Board_PositionKey(b) || 
+        a->Board.NumPlayers != b->Board.NumPlayers || 
+        a->Board.CurTurn != b->Board.CurTurn || 
+        a->Board.Finished != b->Board.Finished || 
+        memcmp(a->Colors, b->Colors, sizeof(a->Colors)) != 0) 
+    {
+        return false; 
+    }
+
+    // the same tiles can be covered by different pieces, so check what remains as well 
+    for (int player = 0; player < a->Board.NumPlayers; player++) 
+    {
+        Tw_PcList aPcs, bPcs; 
+        Tw_InitPcList(&aPcs); 
+        Tw_InitPcList(&bPcs); 
+        Tw_Board_PlayerPcs(&a->Board, player, &aPcs); 
+        Tw_Board_PlayerPcs(&b->Board, player, &bPcs); 
+
+        if (aPcs.Count != bPcs.Count || memcmp(aPcs.Elements, bPcs.Elements, aPcs.Count * sizeof(Tw_Pc)) != 0) 
+        {
+            return false; 
+        }
+    }
+
+    return true; 
+}
+
+static PyObject* Board_richcompare(BoardObject* self, PyObject* obj, int op) 
+{
+    if ((op != Py_EQ && op != Py_NE) || !PyObject_TypeCheck(obj, Py_TYPE(self))) 
+    {
+        Py_RETURN_NOTIMPLEMENTED; 
+    }
+
+    bool same = Board_SamePosition(self, (BoardObject*) obj); 
+    return PyBool_FromLong(op == Py_EQ ? same : !same); 
+}
+
+static PyObject* Board_Moves(BoardObject* self, void* closure) 
+{
+    PyObject* list = PyList_New((unsigned) self->Board.Ply); 
+
+    for (int i = 0; list && i < self->Board.Ply; i++) 
+    {
+        PyObject* mv = GetMoveObject(self->Board.History[i].Move); 
+        if (!mv) 
+        {
+            Py_CLEAR(list); 
+            break; 
+        }
+
+        PyList_SET_ITEM(list, i, mv); 
+    }
+
+    return list; 
+}
+
+static PyObject* Board_Scores(BoardObject* self, void* closure) 
+{
+    PyObject* list = PyList_New((unsigned) self->Board.NumPlayers); 
+
+    for (int i = 0; i < self->Board.NumPlayers; i++) 
+    {
+        PyList_SetItem(
+            list, 
+            i, 
+            PyLong_FromLong(self->Board.Players[i].Score)
+        );
+    }
+
+    return list; 
+}
+
+static PyObject* Board_Winners(BoardObject* self, void* closure) 
+{
+    PyObject* list = PyList_New(0); 
+
+    int best = -1; 
+    for (int i = 0; i < self->Board.NumPlayers; i++) 
+    {
+        int score = self->Board.Players[i].Score; 
+
+        if (score > best) 
+        {
+            PyList_SetSlice(list, 0, PyList_Size(list), NULL); 
+            best = score; 
+        }
+
+        if (score == best) 
+        {
+            PyList_Append(list, PyLong_FromLong(i)); 
+        }
+    }
+
+    return list; 
+}
+
+static bool PlayerFromObject(BoardObject* self, PyObject* obj, int* player); 
+
+// generates moves with the GIL released, sets the Python error on failure 
+static bool Board_GenMovesForPlayer(
+    BoardObject* self, 
+    int player, 
+    bool unique, 
+    const bool* wantedPcs, 
+    const bool* wantedTiles, 
+    MoveBuffer* moves
+) 
+{
+    if (!Borrow(&self->Use, false)) 
+    {
+        return false; 
+    }
+
+    // another thread updating the cache falls back to generating from scratch 
+    LegalMoveCache* cache = self->Cache && TryBorrow(&self->Cache->Use, true) ? self->Cache : NULL; 
+
+    bool success; 
+    Py_BEGIN_ALLOW_THREADS 
+    success = cache ? 
+        MoveCache_GenMoves(cache, &self->Board, (Tw_Color) player, unique, wantedPcs, wantedTiles, moves) >= 0 : 
+        GenFilteredMovesForPlayer(&self->Board, (Tw_Color) player, unique, wantedPcs, wantedTiles, moves); 
+    Py_END_ALLOW_THREADS 
+
+    if (cache) 
+    {
+        Unborrow(&cache->Use, true); 
+    }
+
+    Unborrow(&self->Use, false); 
+
+    if (!success) 
+    {
+        PyErr_NoMemory(); 
+    }
+
+    return success; 
+}
+
+static bool MaskFromObject(PyObject* obj, bool* mask, int size, const char* name); 
+
+static bool GenMovesArgHandler(BoardObject* self, PyObject* args, PyObject* kwds, MoveBuffer* moves) 
+{
+    static const char* kwlist[] = 
+    {
+        "for_player", 
+        "unique", 
+        "pieces", 
+        "corners", 
+        NULL
+    };
+
+    PyObject* playerObj = Py_None; 
+    PyObject* piecesObj = Py_None; 
+    PyObject* cornersObj = Py_None; 
+    int unique = 1; 
+    int player; 
+    bool wantedPcs[NUM_PIECES]; 
+    bool wantedTiles[BOARD_TILES]; 
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "|OpOO", kwlist, &playerObj, &unique, &piecesObj, &cornersObj)) 
+    {
+        return false; 
+    }
+
+    if (!PlayerFromObject(self, playerObj, &player) || 
+        !MaskFromObject(piecesObj, wantedPcs, NUM_PIECES, "pieces must be None or a sequence of pieces") || 
+        !MaskFromObject(cornersObj, wantedTiles, BOARD_TILES, "corners must be None or a sequence of tiles")) 
+    {
+        return false; 
+    }
+
+    return Board_GenMovesForPlayer(
+        self, 
+        player, 
+        unique, 
+        piecesObj == Py_None ? NULL : wantedPcs, 
+        cornersObj == Py_None ? NULL : wantedTiles, 
+        moves
+    ); 
+}
+
+static PyObject* Board_GenMoves(BoardObject* self, PyObject* args, PyObject* kwds) 
+{
+    MoveBuffer moves; 
+    MoveBuffer_Init(&moves); 
+
+    if (!GenMovesArgHandler(self, args, kwds, &moves)) 
+    {
+        MoveBuffer_Free(&moves); 
+        return NULL; 
+    }
+
+    PyObject* list = PyList_New(moves.Count); 
+
+    for (Py_ssize_t i = 0; list && i < moves.Count; i++) 
+    {
+        PyObject* mv = GetMoveObject(moves.Elements[i]); 
+        if (!mv) 
+        {
+            Py_CLEAR(list); 
+            break; 
+        }
+
+        PyList_SET_ITEM(list, i, mv); 
+    }
+
+    MoveBuffer_Free(&moves); 
+    return list; 
+}
+
+static PyObject* Board_GenMovesPacked(BoardObject* self, PyObject* args, PyObject* kwds) 
+{
+    MoveBuffer moves; 
+    MoveBuffer_Init(&moves); 
+
+    if (!GenMovesArgHandler(self, args, kwds, &moves)) 
+    {
+        MoveBuffer_Free(&moves); 
+        return NULL; 
+    }
+
+    PyObject* packed = PackMoves(&moves); 
+    MoveBuffer_Free(&moves); 
+    return packed; 
+}
+
+static PyObject* Board_Push(BoardObject* self, PyObject* args, PyObject* kwds) 
+{
+    static const char* kwlist[] = 
+    {
+        "move", 
+        NULL
+    };
+
+    PyObject* moveObj; 
+    Tw_Move move; 
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O", kwlist, &moveObj)) 
+    {
+        return NULL; 
+    }
+
+    if (!MoveFromObject(moveObj, &move)) 
+    {
+        return NULL; 
+    }
+
+    // a single push or pop is cheaper than releasing and reacquiring the GIL, so it is kept 
+    if (!Borrow(&self->Use, true)) 
+    {
+        return NULL; 
+    }
+
+    Board_DoPush(self, move); 
+    Unborrow(&self->Use, true); 
+
+    Py_RETURN_NONE; 
+}
+
+static PyObject* Board_ColorAt(BoardObject* self, PyObject* args, PyObject* kwds) 
+{
+    static const char* kwlist[] = 
+    {
+        "tile", 
+        NULL
+    };
+
+    unsigned long tile; 
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "I", kwlist, &tile)) 
+    {
+        return NULL; 
+    }
+
+    return PyLong_FromUnsignedLong(Tw_Board_ColorAt(&self->Board, tile)); 
+}
+
+// None (or NO_COLOR) selects the current player 
+static bool PlayerFromObject(BoardObject* self, PyObject* obj, int* player) 
+{
+    *player = Tw_Color_None; 
+
+    if (obj && obj != Py_None) 
+    {
+        *player = PyLong_Check(obj) ? (int) PyLong_AsLong(obj) : -1; 
+        PyErr_Clear(); 
+    }
+
+    if (*player == Tw_Color_None) 
+    {
+        *player = self->Board.CurTurn; 
+    }
+
+    if (*player < 0 || *player >= self->Board.NumPlayers) 
+    {
+        *player = -1; 
+        PyErr_SetString(PyExc_AttributeError, "for_player must be valid or None"); 
+        return false;
+    }
+
+    return true;
+}
+
+static bool ForPlayerArgHandler(BoardObject* self, PyObject* args, PyObject* kwds, int* player) 
+{
+    static const char* kwlist[] = 
+    {
+        "for_player", 
+        NULL
+    };
+
+    PyObject* playerObj = Py_None; 
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "|O", kwlist, &playerObj)) 
+    {
+        *player = -1; 
+        return false;
+    }
+
+    return PlayerFromObject(self, playerObj, player); 
+}
+
+// TODO use better way that doesn't duplicate so much code 
+static bool ForPlayerAndMoveArgHandler(BoardObject* self, PyObject* args, PyObject* kwds, Tw_Move* move, int* player) 
+{
+    static const char* kwlist[] = 
+    {
+        "move", 
+        "for_player", 
+        NULL
+    };
+
+    PyObject* moveObj; 
+    PyObject* playerObj = Py_None; 
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|O", kwlist, &moveObj, &playerObj)) 
+    {
+        *move = (unsigned) Tw_NoMove; 
+        *player = -1; 
+        return false;
+    }
+
+    if (!MoveFromObject(moveObj, move)) 
+    {
+        return false; 
+    }
+
+    if (!PlayerFromObject(self, playerObj, player)) 
+    {
+        *move = (unsigned) Tw_NoMove; 
+        return false; 
+    }
+
+    return true;
+}
+
+static PyObject* Board_NumLegalMoves(BoardObject* self, PyObject* args, PyObject* kwds) 
+{
+    static const char* kwlist[] = 
+    {
+        "for_player", 
+        "pieces", 
+        "corners", 
+        NULL
+    };
+
+    PyObject* playerObj = Py_None; 
+    PyObject* piecesObj = Py_None; 
+    PyObject* cornersObj = Py_None; 
+    int player; 
+    bool wantedPcs[NUM_PIECES]; 
+    bool wantedTiles[BOARD_TILES]; 
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "|OOO", kwlist, &playerObj, &piecesObj, &cornersObj)) 
+    {
+        return NULL; 
+    }
+
+    if (!PlayerFromObject(self, playerObj, &player) || 
+        !MaskFromObject(piecesObj, wantedPcs, NUM_PIECES, "pieces must be None or a sequence of pieces") || 
+        !MaskFromObject(cornersObj, wantedTiles, BOARD_TILES, "corners must be None or a sequence of tiles")) 
+    {
+        return NULL; 
+    }
+
+    // filtered counts generate just the matching moves, and cached counts reuse moves from earlier positions 
+    if (piecesObj != Py_None || cornersObj != Py_None || self->Cache) 
+    {
+        MoveBuffer moves; 
+        MoveBuffer_Init(&moves); 
+
+        bool success = Board_GenMovesForPlayer(
+            self, 
+            player, 
+            true, 
+            piecesObj == Py_None ? NULL : wantedPcs, 
+            cornersObj == Py_None ? NULL : wantedTiles, 
+            &moves
+        ); 
+
+        Py_ssize_t count = moves.Count; 
+        MoveBuffer_Free(&moves); 
+        return success ? PyLong_FromSsize_t(count) : NULL; 
+    }
+
+    if (!Borrow(&self->Use, false)) 
+    {
+        return NULL; 
+    }
+
+    int count; 
+    Py_BEGIN_ALLOW_THREADS 
+    count = Tw_Board_NumMovesForPlayer(&self->Board, (Tw_Color) player); 
+    Py_END_ALLOW_THREADS 
+
+    Unborrow(&self->Use, false); 
+
+    return PyLong_FromLong(count); 
+}
+
+static PyObject* Board_PlayerPcs(BoardObject* self, PyObject* args, PyObject* kwds) 
+{
+    int player;
+    if (!ForPlayerArgHandler(self, args, kwds, &player))
+    {
+        return NULL;
+    }
+
+    // get a list of the player's pieces
+    Tw_PcList pcs;
+    Tw_InitPcList(&pcs);
+    Tw_Board_PlayerPcs(&self->Board, player, &pcs);
+
+    // build Python list of the pieces
+    PyObject* list = PyList_New(pcs.Count); 
+    for (int i = 0; i < pcs.Count; i++) {
+        PyList_SetItem(
+            list, 
+            i, 
+            PyLong_FromUnsignedLong((unsigned long) pcs.Elements[i])
+        ); 
+    }
+
+    return list; 
+}
+
+static PyObject* Board_NumPlayerPcs(BoardObject* self, PyObject* args, PyObject* kwds) 
+{
+    int player;
+    if (!ForPlayerArgHandler(self, args, kwds, &player))
+    {
+        return NULL;
+    }
+
+    return PyLong_FromLong(Tw_Board_NumPlayerPcs(&self->Board, (Tw_Color) player)); 
+}
+
+static PyObject* Board_PlayerCorners(BoardObject* self, PyObject* args, PyObject* kwds) 
+{
+    int player;
+    if (!ForPlayerArgHandler(self, args, kwds, &player))
+    {
+        return NULL;
+    }
+
+    // get a list of the player's open corners
+    Tw_TileList openCorners;
+    Tw_InitTileList(&openCorners);
+    Tw_Board_PlayerCorners(&self->Board, player, &openCorners);
+
+    // build Python list of the open corner tiles
+    PyObject* list = PyList_New(openCorners.Count); 
+    for (int i = 0; i < openCorners.Count; i++) {
+        PyList_SetItem(
+            list, 
+            i, 
+            PyLong_FromUnsignedLong((unsigned long) openCorners.Elements[i])
+        ); 
+    }
+
+    return list; 
+}
+
+static PyObject* Board_PlayerScore(BoardObject* self, PyObject* args, PyObject* kwds) 
+{
+    int player;
+    if (!ForPlayerArgHandler(self, args, kwds, &player))
+    {
+        return NULL;
+    }
+
+    return PyLong_FromLong(self->Board.Players[player].Score); 
+}
+
+static PyObject* Board_CanPlay(BoardObject* self, PyObject* args, PyObject* kwds) 
+{
+    int player;
+    if (!ForPlayerArgHandler(self, args, kwds, &player))
+    {
+        return NULL;
+    }
+
+    return PyBool_FromLong((long) self->Board.Players[player].CanPlay); 
+}
+
+static PyObject* Board_NumPlayerCorners(BoardObject* self, PyObject* args, PyObject* kwds) 
+{
+    int player;
+    if (!ForPlayerArgHandler(self, args, kwds, &player))
+    {
+        return NULL;
+    }
+
+    return PyLong_FromLong(Tw_Board_NumPlayerCorners(&self->Board, player)); 
+}
+
+static PyObject* Board_IsLegal(BoardObject* self, PyObject* args, PyObject* kwds) 
+{
+    int player;
+    Tw_Move move; 
+    if (!ForPlayerAndMoveArgHandler(self, args, kwds, &move, &player))
+    {
+        return NULL;
+    }
+
+    return PyBool_FromLong(Tw_Board_IsLegalForPlayer(&self->Board, (Tw_Color) player, move)); 
+}
+
+static PyObject* Board_Pop(BoardObject* self, PyObject* Py_UNUSED(ignored)) 
+{
+    if (self->Board.Ply <= 0) 
+    {
+        PyErr_SetString(PyExc_IndexError, "no moves to pop"); 
+        return NULL; 
+    }
+
+    if (!Borrow(&self->Use, true)) 
+    {
+        return NULL; 
+    }
+
+    Board_DoPop(self); 
+    Unborrow(&self->Use, true); 
+
+    Py_RETURN_NONE; 
+}
+
+static PyObject* Board_Copy(BoardObject* self, PyObject* Py_UNUSED(ignored)) 
+{
+    BoardObject* copy = (BoardObject*) Py_TYPE(self)->tp_alloc(Py_TYPE(self), 0); 
+
+    if (!copy || !Borrow(&self->Use, false)) 
+    {
+        Py_XDECREF(copy); 
+        return NULL; 
+    }
+
+    // the board is plain data, so a struct copy clones the full state and history
+    memcpy(&copy->Board, &self->Board, sizeof(Tw_Board)); 
+    memcpy(copy->Colors, self->Colors, sizeof(self->Colors)); 
+    copy->Zobrist = self->Zobrist; 
+    Unborrow(&self->Use, false); 
+
+    // clones get their own cache, entries are cheap to rebuild 
+    if (self->Cache && !(copy->Cache = MoveCache_New())) 
+    {
+        Py_DECREF(copy); 
+        return PyErr_NoMemory(); 
+    }
+
+    return (PyObject*) copy; 
+}
+
+static PyObject* Board_DeepCopy(BoardObject* self, PyObject* Py_UNUSED(memo)) 
+{
+    return Board_Copy(self, NULL); 
+}
+
+// the move history is enough to rebuild a board, so it is pickled as little-endian 32-bit packed moves 
+static PyObject* Board_reduce(BoardObject* self, PyObject* Py_UNUSED(ignored)) 
+{
+    Py_ssize_t numBytes = (Py_ssize_t) self->Board.Ply * 4; 
+    PyObject* state = PyBytes_FromStringAndSize(NULL, numBytes); 
+
+    if (!state) 
+    {
+        return NULL; 
+    }
+
+    unsigned char* bytes = (unsigned char*) PyBytes_AS_STRING(state); 
+    for (int i = 0; i < self->Board.Ply; i++) 
+    {
+        uint32_t move = (uint32_t) self->Board.History[i].Move; 
+        bytes[i * 4 + 0] = move & 0xFF; 
+        bytes[i * 4 + 1] = (move >> 8) & 0xFF; 
+        bytes[i * 4 + 2] = (move >> 16) & 0xFF; 
+        bytes[i * 4 + 3] = (move >> 24) & 0xFF; 
+    }
+
+    return Py_BuildValue("(O(i)N)", (PyObject*) Py_TYPE(self), self->Board.NumPlayers, state); 
+}
+
+static PyObject* Board_setstate(BoardObject* self, PyObject* state) 
+{
+    if (!PyBytes_Check(state) || PyBytes_GET_SIZE(state) % 4 != 0) 
+    {
+        PyErr_SetString(PyExc_ValueError, "Pickled board must be bytes of packed moves."); 
+        return NULL; 
+    }
+
+    if (!Borrow(&self->Use, true)) 
+    {
+        return NULL; 
+    }
+
+    const unsigned char* bytes = (const unsigned char*) PyBytes_AS_STRING(state); 
+    Py_ssize_t numMoves = PyBytes_GET_SIZE(state) / 4; 
+    bool valid = true; 
+
+    Tw_InitBoard(&self->Board, self->Board.NumPlayers); 
+    Board_SyncMirror(self); 
+
+    for (Py_ssize_t i = 0; valid && i < numMoves; i++) 
+    {
+        Tw_Move move = (Tw_Move) (
+            (uint32_t) bytes[i * 4 + 0] | 
+            (uint32_t) bytes[i * 4 + 1] << 8 | 
+            (uint32_t) bytes[i * 4 + 2] << 16 | 
+            (uint32_t) bytes[i * 4 + 3] << 24
+        ); 
+
+        valid = !self->Board.Finished && IsValidMove(move) && 
+            Tw_Board_IsLegalForPlayer(&self->Board, self->Board.CurTurn, move); 
+
+        if (valid) 
+        {
+            Board_DoPush(self, move); 
+        }
+    }
+
+    // never leave a partially restored board behind 
+    if (!valid) 
+    {
+        Tw_InitBoard(&self->Board, self->Board.NumPlayers); 
+        Board_SyncMirror(self); 
+    }
+
+    Unborrow(&self->Use, true); 
+
+    if (!valid) 
+    {
+        PyErr_SetString(PyExc_ValueError, "Pickled board contains an illegal move."); 
+        return NULL; 
+    }
+
+    Py_RETURN_NONE; 
+}
+
+typedef enum MoveFeature 
+{
+    MoveFeature_Scores, 
+    MoveFeature_Corners, 
+    MoveFeature_LegalMoves, 
+    MoveFeature_CanPlay, 
+    MoveFeature_Finished, 
+    MoveFeature_Zobrist, 
+    MoveFeature_Count
+} MoveFeature; 
+
+static const char* MoveFeatureNames[MoveFeature_Count] = 
+{
+    "scores", 
+    "corners", 
+    "legal_moves", 
+    "can_play", 
+    "finished", 
+    "zobrist"
+};
+
+static PyObject* Board_EvaluateMoves(BoardObject* self, PyObject* args, PyObject* kwds) 
+{
+    static const char* kwlist[] = 
+    {
+        "moves", 
+        "features", 
+        NULL
+    };
+
+    PyObject* movesObj = Py_None; 
+    PyObject* featuresObj = Py_None; 
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "|OO", kwlist, &movesObj, &featuresObj)) 
+    {
+        return NULL; 
+    }
+
+    // work out which statistics were requested 
+    bool wanted[MoveFeature_Count]; 
+    for (int f = 0; f < MoveFeature_Count; f++) 
+    {
+        wanted[f] = featuresObj == Py_None; 
+    }
+
+    if (featuresObj != Py_None) 
+    {
+        PyObject* seq = PySequence_Fast(featuresObj, "features must be a sequence of feature names"); 
+        if (!seq) 
+        {
+            return NULL; 
+        }
+
+        for (Py_ssize_t i = 0; i < PySequence_Fast_GET_SIZE(seq); i++) 
+        {
+            const char* name = PyUnicode_Check(PySequence_Fast_GET_ITEM(seq, i)) ? 
+                PyUnicode_AsUTF8(PySequence_Fast_GET_ITEM(seq, i)) : NULL; 
+            int f = 0; 
+
+            while (name && f < MoveFeature_Count && strcmp(name, MoveFeatureNames[f]) != 0) 
+            {
+                f++; 
+            }
+
+            if (!name || f == MoveFeature_Count) 
+            {
+                Py_DECREF(seq); 
+                PyErr_Clear(); 
+                PyErr_SetString(PyExc_AttributeError, "features must be 'scores', 'corners', 'legal_moves', 'can_play', 'finished', or 'zobrist'"); 
+                return NULL; 
+            }
+
+            wanted[f] = true; 
+        }
+
+        Py_DECREF(seq); 
+    }
+
+    // each move is played on a scratch copy so the board itself is never modified 
+    Tw_Board* board = PyMem_RawMalloc(sizeof(Tw_Board)); 
+
+    if (!board) 
+    {
+        return PyErr_NoMemory(); 
+    }
+
+    if (!Borrow(&self->Use, false)) 
+    {
+        PyMem_RawFree(board); 
+        return NULL; 
+    }
+
+    memcpy(board, &self->Board, sizeof(Tw_Board)); 
+    uint64_t zobrist = self->Zobrist; 
+    Unborrow(&self->Use, false); 
+
+    // get the moves to evaluate, defaulting to all legal moves in generate_legal_moves order
+    MoveBuffer moves; 
+    MoveBuffer_Init(&moves); 
+
+    if (movesObj == Py_None) 
+    {
+        if (!GenMovesForPlayer(board, board->CurTurn, true, &moves)) 
+        {
+            PyMem_RawFree(board); 
+            MoveBuffer_Free(&moves); 
+            return PyErr_NoMemory(); 
+        }
+    }
+    else if (!MovesFromObject(movesObj, &moves, true)) 
+    {
+        PyMem_RawFree(board); 
+        MoveBuffer_Free(&moves); 
+        return NULL; 
+    }
+
+    for (Py_ssize_t i = 0; i < moves.Count; i++) 
+    {
+        if (!Tw_Board_IsLegalForPlayer(board, board->CurTurn, moves.Elements[i])) 
+        {
+            PyMem_RawFree(board); 
+            MoveBuffer_Free(&moves); 
+            PyErr_SetString(PyExc_AttributeError, "moves must be legal for the current player"); 
+            return NULL; 
+        }
+    }
+
+    // allocate the outputs 
+    int numPlayers = board->NumPlayers; 
+    Py_ssize_t shape[2] = { moves.Count, numPlayers }; 
+    void* data[MoveFeature_Count] = { NULL }; 
+    PyObject* out = PyDict_New(); 
+
+    for (int f = 0; out && f < MoveFeature_Count; f++) 
+    {
+        if (!wanted[f]) continue; 
+
+        PyObject* view; 
+        switch (f) 
+        {
+            case MoveFeature_CanPlay: 
+                view = NewArrayView("?", sizeof(bool), 2, shape, &data[f]); 
+                break; 
+            case MoveFeature_Finished: 
+                view = NewArrayView("?", sizeof(bool), 1, shape, &data[f]); 
+                break; 
+            case MoveFeature_Zobrist: 
+                view = NewArrayView("Q", sizeof(unsigned long long), 1, shape, &data[f]); 
+                break; 
+            default: 
+                view = NewArrayView("i", sizeof(int), 2, shape, &data[f]); 
+                break; 
+        }
+
+        if (!view || PyDict_SetItemString(out, MoveFeatureNames[f], view) < 0) 
+        {
+            Py_CLEAR(out); 
+        }
+
+        Py_XDECREF(view); 
+    }
+
+    if (out) 
+    {
+        int* scores = data[MoveFeature_Scores]; 
+        int* corners = data[MoveFeature_Corners]; 
+        int* legalMoves = data[MoveFeature_LegalMoves]; 
+        bool* canPlay = data[MoveFeature_CanPlay]; 
+        bool* finished = data[MoveFeature_Finished]; 
+        unsigned long long* keys = data[MoveFeature_Zobrist]; 
+        Tw_Color mover = board->CurTurn; 
+
+        // a move only changes the moves on nearby corners, so counting after many moves reuses the rest, 
+        // using the board's own cache when it has one and is not busy 
+        LegalMoveCache* cache = NULL; 
+        bool ownCache = false; 
+
+        if (legalMoves && moves.Count > 1) 
+        {
+            if (self->Cache && TryBorrow(&self->Cache->Use, true)) 
+            {
+                cache = self->Cache; 
+            }
+            else 
+            {
+                cache = MoveCache_New(); 
+                ownCache = true; 
+            }
+        }
+
+        Py_BEGIN_ALLOW_THREADS 
+        for (Py_ssize_t i = 0; i < moves.Count; i++) 
+        {
+            Tw_Board_Push(board, moves.Elements[i]); 
+
+            for (int player = 0; player < numPlayers; player++) 
+            {
+                Py_ssize_t index = i * numPlayers + player; 
+
+                if (scores) scores[index] = board->Players[player].Score; 
+                if (corners) corners[index] = Tw_Board_NumPlayerCorners(board, player); 
+                if (canPlay) canPlay[index] = board->Players[player].CanPlay; 
+
+                if (legalMoves) 
+                {
+                    Py_ssize_t count = cache ? MoveCache_GenMoves(cache, board, player, true, NULL, NULL, NULL) : -1; 
+                    legalMoves[index] = count >= 0 ? (int) count : Tw_Board_NumMovesForPlayer(board, player); 
+                }
+            }
+
+            if (finished) finished[i] = board->Finished; 
+
+            // the same key as the board's zobrist after pushing the move 
+            if (keys) 
+            {
+                Tw_Tile tiles[MAX_PIECE_TILES]; 
+                int count = MoveTiles(moves.Elements[i], tiles); 
+                keys[i] = zobrist ^ MoveZobrist(moves.Elements[i], mover, tiles, count) ^ 
+                    ZobristTurn[board->CurTurn] ^ ZobristNumPlayers[numPlayers]; 
+            }
+
+            Tw_Board_Pop(board); 
+        }
+        Py_END_ALLOW_THREADS 
+
+        if (ownCache) 
+        {
+            MoveCache_Free(cache); 
+        }
+        else if (cache) 
+        {
+            Unborrow(&cache->Use, true); 
+        }
+    }
+
+    PyMem_RawFree(board); 
+    MoveBuffer_Free(&moves); 
+    return out; 
+}
+
+// uniform random integer in [0, bound) 
+static int RandomBelow(uint64_t* state, int bound) 
+{
+    return (int) (((SplitMix64(state) >> 32) * (uint64_t) bound) >> 32); 
+}
+
+// plays random games from the start position on a scratch board, summing final scores and win shares per player
+static bool PlayRandomGames(const Tw_Board* start, Py_ssize_t numGames, uint64_t seed, bool weighted, long long* scores, double* wins) 
+{
+    Tw_Board* board = PyMem_RawMalloc(sizeof(Tw_Board)); 
+    Tw_MoveList* moves = PyMem_RawMalloc(sizeof(Tw_MoveList)); 
+
+    if (!board || !moves) 
+    {
+        PyMem_RawFree(board); 
+        PyMem_RawFree(moves); 
+        return false; 
+    }
+
+    uint64_t state = seed; 
+
+    for (Py_ssize_t game = 0; game < numGames; game++) 
+    {
+        memcpy(board, start, sizeof(Tw_Board)); 
+
+        while (!board->Finished) 
+        {
+            Tw_InitMoveList(moves); 
+            Tw_Board_GenMoves(board, moves); 
+
+            if (moves->Count == 0) 
+            {
+                break; 
+            }
+
+            int choice; 
+            if (weighted) 
+            {
+                // larger pieces are proportionally more likely to be played 
+                int total = 0; 
+                for (int i = 0; i < moves->Count; i++) 
+                {
+                    total += Geometry[Tw_Move_Pc(moves->Elements[i])][Tw_Rot_N].NumTiles; 
+                }
+
+                int target = RandomBelow(&state, total); 
+                for (choice = 0; choice < moves->Count - 1; choice++) 
+                {
+                    target -= Geometry[Tw_Move_Pc(moves->Elements[choice])][Tw_Rot_N].NumTiles; 
+                    if (target < 0) break; 
+                }
+            }
+            else 
+            {
+                choice = RandomBelow(&state, moves->Count); 
+            }
+
+            Tw_Board_Push(board, moves->Elements[choice]); 
+        }
+
+        // ties split the win between every player with the top score 
+        int best = 0, numBest = 0; 
+        for (int player = 0; player < board->NumPlayers; player++) 
+        {
+            int score = board->Players[player].Score; 
+            scores[player] += score; 
+
+            if (numBest == 0 || score > best) 
+            {
+                best = score; 
+                numBest = 1; 
+            }
+            else if (score == best) 
+            {
+                numBest++; 
+            }
+        }
+
+        for (int player = 0; player < board->NumPlayers; player++) 
+        {
+            if (board->Players[player].Score == best) wins[player] += 1.0 / numBest; 
+        }
+    }
+
+    PyMem_RawFree(board); 
+    PyMem_RawFree(moves); 
+    return true; 
+}
+
+static PyObject* Board_Playout(BoardObject* self, PyObject* args, PyObject* kwds) 
+{
+    static const char* kwlist[] = 
+    {
+        "n", 
+        "seed", 
+        "weighted", 
+        NULL
+    };
+
+    Py_ssize_t numGames = 1; 
+    PyObject* seedObj = Py_None; 
+    int weighted = false; 
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "|nOp", kwlist, &numGames, &seedObj, &weighted)) 
+    {
+        return NULL; 
+    }
+
+    if (numGames < 0) 
+    {
+        PyErr_SetString(PyExc_AttributeError, "n must be non-negative"); 
+        return NULL; 
+    }
+
+    // without a seed, draw one from Python's random module so random.seed() makes playouts reproducible 
+    PyObject* seedLong; 
+    if (seedObj == Py_None) 
+    {
+        PyObject* random = PyImport_ImportModule("random"); 
+        seedLong = random ? PyObject_CallMethod(random, "getrandbits", "i", 64) : NULL; 
+        Py_XDECREF(random); 
+    }
+    else if (PyLong_Check(seedObj)) 
+    {
+        seedLong = Py_NewRef(seedObj); 
+    }
+    else 
+    {
+        PyErr_SetString(PyExc_AttributeError, "seed must be an int or None"); 
+        return NULL; 
+    }
+
+    if (!seedLong) 
+    {
+        return NULL; 
+    }
+
+    uint64_t seed = (uint64_t) PyLong_AsUnsignedLongLongMask(seedLong); 
+    Py_DECREF(seedLong); 
+
+    if (PyErr_Occurred()) 
+    {
+        return NULL; 
+    }
+
+    long long scores[NUM_COLORS] = { 0 }; 
+    double wins[NUM_COLORS] = { 0 }; 
+
+    if (!Borrow(&self->Use, false)) 
+    {
+        return NULL; 
+    }
+
+    bool success; 
+    Py_BEGIN_ALLOW_THREADS 
+    success = PlayRandomGames(&self->Board, numGames, seed, weighted, scores, wins); 
+    Py_END_ALLOW_THREADS 
+
+    Unborrow(&self->Use, false); 
+
+    if (!success) 
+    {
+        return PyErr_NoMemory(); 
+    }
+
+    int numPlayers = self->Board.NumPlayers; 
+    PyObject* scoresArray = NewPackedArray("q", scores, numPlayers * sizeof(long long)); 
+    PyObject* winsArray = scoresArray ? NewPackedArray("d", wins, numPlayers * sizeof(double)) : NULL; 
+
+    if (!winsArray) 
+    {
+        Py_XDECREF(scoresArray); 
+        return NULL; 
+    }
+
+    return Py_BuildValue("(NN)", scoresArray, winsArray); 
+}
+
+// reads 400 tile weights from a float32/float64 buffer or any sequence of numbers 
+static bool WeightsFromObject(PyObject* obj, double weights[BOARD_TILES]) 
+{
+    if (PyObject_CheckBuffer(obj)) 
+    {
+        Py_buffer view; 
+        if (PyObject_GetBuffer(obj, &view, PyBUF_C_CONTIGUOUS | PyBUF_FORMAT) < 0) 
+        {
+            return false; 
+        }
+
+        const char* format = view.format ? view.format : "B"; 
+        if (*format == '@' || *format == '=') format++; 
+
+        bool isDoubles = view.itemsize == sizeof(double) && strcmp(format, "d") == 0; 
+        bool isFloats = view.itemsize == sizeof(float) && strcmp(format, "f") == 0; 
+
+        if (!(isDoubles || isFloats) || view.len != BOARD_TILES * view.itemsize) 
+        {
+            PyBuffer_Release(&view); 
+            PyErr_SetString(PyExc_AttributeError, "weights must be a float32 or float64 buffer with 400 elements"); 
+            return false; 
+        }
+
+        for (int i = 0; i < BOARD_TILES; i++) 
+        {
+            weights[i] = isDoubles ? ((const double*) view.buf)[i] : ((const float*) view.buf)[i]; 
+        }
+
+        PyBuffer_Release(&view); 
+        return true; 
+    }
+
+    PyObject* seq = PySequence_Fast(obj, "weights must be a buffer or a sequence of 400 numbers"); 
+    if (!seq) 
+    {
+        return false; 
+    }
+
+    if (PySequence_Fast_GET_SIZE(seq) != BOARD_TILES) 
+    {
+        Py_DECREF(seq); 
+        PyErr_SetString(PyExc_AttributeError, "weights must be a buffer or a sequence of 400 numbers"); 
+        return false; 
+    }
+
+    for (int i = 0; i < BOARD_TILES; i++) 
+    {
+        weights[i] = PyFloat_AsDouble(PySequence_Fast_GET_ITEM(seq, i)); 
+
+        if (weights[i] == -1.0 && PyErr_Occurred()) 
+        {
+            Py_DECREF(seq); 
+            return false; 
+        }
+    }
+
+    Py_DECREF(seq); 
+    return true; 
+}
+
+static PyObject* Board_ScoreMoves(BoardObject* self, PyObject* args, PyObject* kwds) 
+{
+    static const char* kwlist[] = 
+    {
+        "weights", 
+        "moves", 
+        NULL
+    };
+
+    PyObject* weightsObj; 
+    PyObject* movesObj = Py_None; 
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|O", kwlist, &weightsObj, &movesObj)) 
+    {
+        return NULL; 
+    }
+
+    double weights[BOARD_TILES]; 
+    if (!WeightsFromObject(weightsObj, weights)) 
+    {
+        return NULL; 
+    }
+
+    // get the moves to score, defaulting to all legal moves in generate_legal_moves order 
+    MoveBuffer moves; 
+    MoveBuffer_Init(&moves); 
+
+    bool success = movesObj == Py_None ? 
+        Board_GenMovesForPlayer(self, self->Board.CurTurn, true, NULL, NULL, &moves) : 
+        MovesFromObject(movesObj, &moves, true); 
+
+    double* totals = success ? PyMem_RawMalloc((moves.Count + 1) * sizeof(double)) : NULL; 
+
+    if (!totals) 
+    {
+        MoveBuffer_Free(&moves); 
+        return success ? PyErr_NoMemory() : NULL; 
+    }
+
+    // sum the weights of the tiles each move would cover 
+    Py_BEGIN_ALLOW_THREADS 
+    for (Py_ssize_t i = 0; i < moves.Count; i++) 
+    {
+        Tw_Tile tiles[MAX_PIECE_TILES]; 
+        int count = MoveTiles(moves.Elements[i], tiles); 
+        double total = 0; 
+
+        for (int t = 0; t < count; t++) 
+        {
+            total += weights[tiles[t]]; 
+        }
+
+        totals[i] = total; 
+    }
+    Py_END_ALLOW_THREADS 
+
+    PyObject* out = NewPackedArray("d", totals, moves.Count * sizeof(double)); 
+    PyMem_RawFree(totals); 
+    MoveBuffer_Free(&moves); 
+    return out; 
+}
+
+// a move changes at most the tiles it covers and their neighbours 
+#define MAX_MOVE_EFFECTS (4 * MAX_PIECE_TILES + 1) 
+
+typedef struct MoveEffects MoveEffects; 
+
+// what a move would change without playing it: the tiles it claims, the open corners it creates for 
+// the player making it, and the open corners it takes away from each player (including its own) 
+struct MoveEffects 
+{
+    int NumTiles; 
+    Tw_Tile Tiles[MAX_PIECE_TILES]; 
+    int NumNewCorners; 
+    Tw_Tile NewCorners[MAX_MOVE_EFFECTS]; 
+    int NumRemovedCorners[NUM_COLORS]; 
+    Tw_Tile RemovedCorners[NUM_COLORS][MAX_MOVE_EFFECTS]; 
+};
+
+static bool HasTile(const Tw_Tile* tiles, int count, Tw_Tile tile) 
+{
+    for (int i = 0; i < count; i++) 
+    {
+        if (tiles[i] == tile) return true; 
+    }
+
+    return false; 
+}
+
+// marks each player's open corners, shared by every move looked at from the same position 
+static void GetCornerMasks(const Tw_Board* board, bool corners[NUM_COLORS][BOARD_TILES]) 
+{
+    memset(corners, 0, NUM_COLORS * BOARD_TILES * sizeof(bool)); 
+
+    for (int player = 0; player < board->NumPlayers; player++) 
+    {
+        Tw_TileList list; 
+        Tw_InitTileList(&list); 
+        Tw_Board_PlayerCorners(board, player, &list); 
+
+        for (int i = 0; i < list.Count; i++) 
+        {
+            corners[player][list.Elements[i]] = true; 
+        }
+    }
+}
+
+// whether a player has placed any piece yet, before which their only corners are the start corners 
+static bool HasPlacedTiles(const unsigned char colors[BOARD_TILES], Tw_Color player) 
+{
+    for (int tile = 0; tile < BOARD_TILES; tile++) 
+    {
+        if (colors[tile] == (unsigned char) player) return true; 
+    }
+
+    return false; 
+}
+
+static void GetMoveEffects(
+    const unsigned char colors[BOARD_TILES], 
+    const bool corners[NUM_COLORS][BOARD_TILES], 
+    int numPlayers, 
+    Tw_Color player, 
+    bool firstMove, 
+    Tw_Move move, 
+    MoveEffects* out
+) 
+{
+    static const int edges[4][2] = { { 1, 0 }, { -1, 0 }, { 0, 1 }, { 0, -1 } }; 
+    static const int diagonals[4][2] = { { 1, 1 }, { -1, 1 }, { 1, -1 }, { -1, -1 } }; 
+
+    out->NumTiles = MoveTiles(move, out->Tiles); 
+    out->NumNewCorners = 0; 
+
+    // every player loses the corners the piece covers 
+    for (int p = 0; p < numPlayers; p++) 
+    {
+        out->NumRemovedCorners[p] = 0; 
+        if (firstMove && p == player) continue; 
+
+        for (int i = 0; i < out->NumTiles; i++) 
+        {
+            if (corners[p][out->Tiles[i]]) 
+            {
+                out->RemovedCorners[p][out->NumRemovedCorners[p]++] = out->Tiles[i]; 
+            }
+        }
+    }
+
+    // a player's first move leaves none of their start corners open 
+    if (firstMove) 
+    {
+        for (int tile = 0; tile < BOARD_TILES; tile++) 
+        {
+            if (corners[player][tile]) 
+            {
+                out->RemovedCorners[player][out->NumRemovedCorners[player]++] = tile; 
+            }
+        }
+    }
+
+    for (int i = 0; i < out->NumTiles; i++) 
+    {
+        int x, y; 
+        Tw_Tile_ToCoords(out->Tiles[i], &x, &y); 
+
+        // the player also loses corners along the piece's edges 
+        for (int e = 0; e < 4; e++) 
+        {
+            int nx = x + edges[e][0], ny = y + edges[e][1]; 
+            if (!Tw_CoordsInBounds(nx, ny)) continue; 
+
+            Tw_Tile tile = Tw_MakeTile(nx, ny); 
+            if (corners[player][tile] && !HasTile(out->RemovedCorners[player], out->NumRemovedCorners[player], tile)) 
+            {
+                out->RemovedCorners[player][out->NumRemovedCorners[player]++] = tile; 
+            }
+        }
+
+        // and gains empty diagonal tiles that nothing of theirs touches along an edge 
+        for (int d = 0; d < 4; d++) 
+        {
+            int cx = x + diagonals[d][0], cy = y + diagonals[d][1]; 
+            if (!Tw_CoordsInBounds(cx, cy)) continue; 
+
+            Tw_Tile tile = Tw_MakeTile(cx, cy); 
+            if (colors[tile] != (unsigned char) Tw_Color_None || (corners[player][tile] && !firstMove) || 
+                HasTile(out->Tiles, out->NumTiles, tile) || HasTile(out->NewCorners, out->NumNewCorners, tile)) 
+            {
+                continue; 
+            }
+
+            bool touchesOwn = false; 
+            for (int e = 0; e < 4 && !touchesOwn; e++) 
+            {
+                int nx = cx + edges[e][0], ny = cy + edges[e][1]; 
+                if (!Tw_CoordsInBounds(nx, ny)) continue; 
+
+                Tw_Tile next = Tw_MakeTile(nx, ny); 
+                touchesOwn = colors[next] == (unsigned char) player || HasTile(out->Tiles, out->NumTiles, next); 
+            }
+
+            if (!touchesOwn) 
+            {
+                out->NewCorners[out->NumNewCorners++] = tile; 
+            }
+        }
+    }
+}
+
+static PyObject* TileListFromArray(const Tw_Tile* tiles, int count) 
+{
+    PyObject* list = PyList_New(count); 
+
+    for (int i = 0; list && i < count; i++) 
+    {
+        PyList_SET_ITEM(list, i, PyLong_FromLong((long) tiles[i])); 
+    }
+
+    return list; 
+}
+
+static PyObject* Board_MoveEffects(BoardObject* self, PyObject* args, PyObject* kwds) 
+{
+    static const char* kwlist[] = 
+    {
+        "move", 
+        NULL
+    };
+
+    PyObject* moveObj; 
+    Tw_Move move; 
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O", kwlist, &moveObj)) 
+    {
+        return NULL; 
+    }
+
+    if (!MoveFromObject(moveObj, &move) || !Borrow(&self->Use, false)) 
+    {
+        return NULL; 
+    }
+
+    if (!Tw_Board_IsLegalForPlayer(&self->Board, self->Board.CurTurn, move)) 
+    {
+        Unborrow(&self->Use, false); 
+        PyErr_SetString(PyExc_AttributeError, "move must be legal for the current player"); 
+        return NULL; 
+    }
+
+    bool corners[NUM_COLORS][BOARD_TILES]; 
+    MoveEffects effects; 
+    GetCornerMasks(&self->Board, corners); 
+    bool firstMove = !HasPlacedTiles(self->Colors, self->Board.CurTurn); 
+    GetMoveEffects(self->Colors, corners, self->Board.NumPlayers, self->Board.CurTurn, firstMove, move, &effects); 
+
+    int numPlayers = self->Board.NumPlayers; 
+    Unborrow(&self->Use, false); 
+
+    PyObject* removed = PyList_New(numPlayers); 
+    for (int p = 0; removed && p < numPlayers; p++) 
+    {
+        PyList_SET_ITEM(removed, p, TileListFromArray(effects.RemovedCorners[p], effects.NumRemovedCorners[p])); 
+    }
+
+    return Py_BuildValue(
+        "{s:N,s:N,s:N}", 
+        "tiles", TileListFromArray(effects.Tiles, effects.NumTiles), 
+        "new_corners", TileListFromArray(effects.NewCorners, effects.NumNewCorners), 
+        "removed_corners", removed
+    ); 
+}
+
+static PyObject* Board_MoveEffectsBatch(BoardObject* self, PyObject* args, PyObject* kwds) 
+{
+    static const char* kwlist[] = 
+    {
+        "moves", 
+        NULL
+    };
+
+    PyObject* movesObj = Py_None; 
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "|O", kwlist, &movesObj)) 
+    {
+        return NULL; 
+    }
+
+    // get the moves to look at, defaulting to all legal moves in generate_legal_moves order 
+    MoveBuffer moves; 
+    MoveBuffer_Init(&moves); 
+
+    bool success = movesObj == Py_None ? 
+        Board_GenMovesForPlayer(self, self->Board.CurTurn, true, NULL, NULL, &moves) : 
+        MovesFromObject(movesObj, &moves, true); 
+
+    if (!success || !Borrow(&self->Use, false)) 
+    {
+        MoveBuffer_Free(&moves); 
+        return NULL; 
+    }
+
+    for (Py_ssize_t i = 0; i < moves.Count; i++) 
+    {
+        if (!Tw_Board_IsLegalForPlayer(&self->Board, self->Board.CurTurn, moves.Elements[i])) 
+        {
+            Unborrow(&self->Use, false); 
+            MoveBuffer_Free(&moves); 
+            PyErr_SetString(PyExc_AttributeError, "moves must be legal for the current player"); 
+            return NULL; 
+        }
+    }
+
+    int numPlayers = self->Board.NumPlayers; 
+    Py_ssize_t shape[2] = { moves.Count, numPlayers }; 
+    int* tiles = NULL; 
+    int* newCorners = NULL; 
+    int* removedCorners = NULL; 
+
+    PyObject* tilesView = NewArrayView("i", sizeof(int), 1, shape, (void**) &tiles); 
+    PyObject* newView = tilesView ? NewArrayView("i", sizeof(int), 1, shape, (void**) &newCorners) : NULL; 
+    PyObject* removedView = newView ? NewArrayView("i", sizeof(int), 2, shape, (void**) &removedCorners) : NULL; 
+
+    if (removedView) 
+    {
+        Py_BEGIN_ALLOW_THREADS 
+        bool corners[NUM_COLORS][BOARD_TILES]; 
+        GetCornerMasks(&self->Board, corners); 
+        bool firstMove = !HasPlacedTiles(self->Colors, self->Board.CurTurn); 
+
+        for (Py_ssize_t i = 0; i < moves.Count; i++) 
+        {
+            MoveEffects effects; 
+            GetMoveEffects(self->Colors, corners, numPlayers, self->Board.CurTurn, firstMove, moves.Elements[i], &effects); 
+
+            tiles[i] = effects.NumTiles; 
+            newCorners[i] = effects.NumNewCorners; 
+            for (int p = 0; p < numPlayers; p++) 
+            {
+                removedCorners[i * numPlayers + p] = effects.NumRemovedCorners[p]; 
+            }
+        }
+        Py_END_ALLOW_THREADS 
+    }
+
+    Unborrow(&self->Use, false); 
+    MoveBuffer_Free(&moves); 
+
+    if (!removedView) 
+    {
+        Py_XDECREF(tilesView); 
+        Py_XDECREF(newView); 
+        return NULL; 
+    }
+
+    return Py_BuildValue("{s:N,s:N,s:N}", "tiles", tilesView, "new_corners", newView, "removed_corners", removedView); 
+}
+
+typedef enum FeaturePlane 
+{
+    FeaturePlane_Occupied = 0, 
+    FeaturePlane_Corners = NUM_COLORS, 
+    FeaturePlane_Forbidden = 2 * NUM_COLORS, 
+    FeaturePlane_ToMove = 3 * NUM_COLORS
+} FeaturePlane; 
+
+// copies uint8 features into a caller's buffer (uint8 or float32) or a new uint8 view of the given shape 
+static PyObject* WriteFeatures(PyObject* outObj, const unsigned char* features, int numDims, const Py_ssize_t* shape, const char* name) 
+{
+    Py_ssize_t count = 1; 
+    for (int i = 0; i < numDims; i++) 
+    {
+        count *= shape[i]; 
+    }
+
+    if (outObj == Py_None) 
+    {
+        unsigned char* data = NULL; 
+        PyObject* view = NewArrayView("B", 1, numDims, shape, (void**) &data); 
+
+        if (view) 
+        {
+            memcpy(data, features, count); 
+        }
+
+        return view; 
+    }
+
+    Py_buffer view; 
+    if (PyObject_GetBuffer(outObj, &view, PyBUF_WRITABLE | PyBUF_FORMAT | PyBUF_C_CONTIGUOUS) < 0) 
+    {
+        return NULL; 
+    }
+
+    const char* format = view.format ? view.format : "B"; 
+    if (*format == '@' || *format == '=') format++; 
+
+    bool isBytes = view.itemsize == 1 && strcmp(format, "B") == 0; 
+    bool isFloats = view.itemsize == sizeof(float) && strcmp(format, "f") == 0; 
+
+    if (!(isBytes || isFloats) || view.len != count * view.itemsize) 
+    {
+        PyBuffer_Release(&view); 
+        PyErr_Format(PyExc_AttributeError, "%s must be a writable uint8 or float32 buffer with %zd elements", name, count); 
+        return NULL; 
+    }
+
+    if (isBytes) 
+    {
+        memcpy(view.buf, features, count); 
+    }
+    else 
+    {
+        float* data = view.buf; 
+        for (Py_ssize_t i = 0; i < count; i++) 
+        {
+            data[i] = (float) features[i]; 
+        }
+    }
+
+    PyBuffer_Release(&view); 
+    return Py_NewRef(outObj); 
+}
+
+static PyObject* Board_FeaturePlanes(BoardObject* self, PyObject* args, PyObject* kwds) 
+{
+    static const char* kwlist[] = 
+    {
+        "planes", 
+        "pieces", 
+        "perspective", 
+        NULL
+    };
+
+    PyObject* planesObj = Py_None; 
+    PyObject* piecesObj = Py_None; 
+    int perspective = true; 
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "|OOp", kwlist, &planesObj, &piecesObj, &perspective)) 
+    {
+        return NULL; 
+    }
+
+    if (!Borrow(&self->Use, false)) 
+    {
+        return NULL; 
+    }
+
+    const Tw_Board* board = &self->Board; 
+    int numPlayers = board->NumPlayers; 
+
+    // slot i holds player i, or the i-th player after the current player when seen from their perspective 
+    int slotOf[NUM_COLORS]; 
+    for (int player = 0; player < numPlayers; player++) 
+    {
+        slotOf[player] = perspective ? (player - board->CurTurn + numPlayers) % numPlayers : player; 
+    }
+
+    unsigned char planes[NUM_FEATURE_PLANES * BOARD_TILES] = { 0 }; 
+    unsigned char pieces[NUM_COLORS * NUM_PIECES] = { 0 }; 
+
+    for (Tw_Tile tile = 0; tile < BOARD_TILES; tile++) 
+    {
+        int color = self->Colors[tile]; 
+        if (color >= numPlayers) continue; 
+
+        int x, y; 
+        Tw_Tile_ToCoords(tile, &x, &y); 
+        planes[(FeaturePlane_Occupied + slotOf[color]) * BOARD_TILES + tile] = 1; 
+
+        // nobody can play on a claimed tile, and its owner cannot play next to it 
+        for (int slot = 0; slot < numPlayers; slot++) 
+        {
+            planes[(FeaturePlane_Forbidden + slot) * BOARD_TILES + tile] = 1; 
+        }
+
+        static const int dx[4] = { 1, -1, 0, 0 }; 
+        static const int dy[4] = { 0, 0, 1, -1 }; 
+        for (int d = 0; d < 4; d++) 
+        {
+            if (Tw_CoordsInBounds(x + dx[d], y + dy[d])) 
+            {
+                planes[(FeaturePlane_Forbidden + slotOf[color]) * BOARD_TILES + Tw_MakeTile(x + dx[d], y + dy[d])] = 1; 
+            }
+        }
+    }
+
+    for (int player = 0; player < numPlayers; player++) 
+    {
+        int slot = slotOf[player]; 
+
+        Tw_TileList corners; 
+        Tw_InitTileList(&corners); 
+        Tw_Board_PlayerCorners(board, player, &corners); 
+
+        for (int i = 0; i < corners.Count; i++) 
+        {
+            planes[(FeaturePlane_Corners + slot) * BOARD_TILES + corners.Elements[i]] = 1; 
+        }
+
+        Tw_PcList pcs; 
+        Tw_InitPcList(&pcs); 
+        Tw_Board_PlayerPcs(board, player, &pcs); 
+
+        for (int i = 0; i < pcs.Count; i++) 
+        {
+            pieces[slot * NUM_PIECES + pcs.Elements[i]] = 1; 
+        }
+    }
+
+    if (!board->Finished) 
+    {
+        memset(&planes[(FeaturePlane_ToMove + slotOf[board->CurTurn]) * BOARD_TILES], 1, BOARD_TILES); 
+    }
+
+    Unborrow(&self->Use, false); 
+
+    Py_ssize_t planesShape[3] = { NUM_FEATURE_PLANES, BOARD_WIDTH, BOARD_WIDTH }; 
+    Py_ssize_t piecesShape[2] = { NUM_COLORS, NUM_PIECES }; 
+
+    PyObject* planesOut = WriteFeatures(planesObj, planes, 3, planesShape, "planes"); 
+    PyObject* piecesOut = planesOut ? WriteFeatures(piecesObj, pieces, 2, piecesShape, "pieces") : NULL; 
+
+    if (!piecesOut) 
+    {
+        Py_XDECREF(planesOut); 
+        return NULL; 
+    }
+
+    return Py_BuildValue("(NN)", planesOut, piecesOut); 
+}
+
+// reads an optional iterable of ints below size into a mask, None selects everything 
+static bool MaskFromObject(PyObject* obj, bool* mask, int size, const char* name) 
+{
+    if (obj == Py_None) 
+    {
+        memset(mask, true, size * sizeof(bool)); 
+        return true; 
+    }
+
+    memset(mask, false, size * sizeof(bool)); 
+
+    PyObject* seq = PySequence_Fast(obj, name); 
+    if (!seq) 
+    {
+        return false; 
+    }
+
+    for (Py_ssize_t i = 0; i < PySequence_Fast_GET_SIZE(seq); i++) 
+    {
+        PyObject* item = PySequence_Fast_GET_ITEM(seq, i); 
+        long value = PyLong_Check(item) ? PyLong_AsLong(item) : -1; 
+
+        if (value < 0 || value >= size) 
+        {
+            Py_DECREF(seq); 
+            PyErr_Clear(); 
+            PyErr_SetString(PyExc_AttributeError, name); 
+            return false; 
+        }
+
+        mask[value] = true; 
+    }
+
+    Py_DECREF(seq); 
+    return true; 
+}
+
+typedef struct MoveIterObject MoveIterObject; 
+
+// generates a player's legal moves one at a time, corner by corner and piece by piece 
+struct MoveIterObject 
+{
+    PyObject_HEAD 
+    BoardObject* Board; 
+    int Player; 
+    bool Unique; 
+    uint64_t Zobrist; // board key when the iterator was created, used to detect changes 
+    int Ply; 
+    int NumCorners; 
+    int NumPcs; 
+    Tw_Tile Corners[BOARD_TILES]; 
+    Tw_Pc Pcs[NUM_PIECES]; 
+    int Corner, Pc, Rot, Contact; // position of the next candidate move 
+};
+
+static void MoveIter_dealloc(MoveIterObject* self) 
+{
+    Py_XDECREF(self->Board); 
+    Py_TYPE(self)->tp_free((PyObject*) self); 
+}
+
+static PyObject* MoveIter_next(MoveIterObject* self) 
+{
+    BoardObject* board = self->Board; 
+
+    if (!board || !Borrow(&board->Use, false)) 
+    {
+        return NULL; 
+    }
+
+    if (board->Zobrist != self->Zobrist || board->Board.Ply != self->Ply) 
+    {
+        Unborrow(&board->Use, false); 
+        PyErr_SetString(PyExc_RuntimeError, "board changed during iteration"); 
+        return NULL; 
+    }
+
+    Tw_Move found = Tw_NoMove; 
+
+    for (; self->Corner < self->NumCorners; self->Corner++, self->Pc = 0) 
+    {
+        for (; self->Pc < self->NumPcs; self->Pc++, self->Rot = 0) 
+        {
+            for (; self->Rot < Tw_NumRots; self->Rot++, self->Contact = 0) 
+            {
+                const RotPcGeometry* geo = &Geometry[self->Pcs[self->Pc]][self->Rot]; 
+                if (self->Unique && !geo->Unique) continue; 
+
+                while (found == Tw_NoMove && self->Contact < geo->NumContacts) 
+                {
+                    Tw_Move move = Tw_MakeMove_Safe(self->Pcs[self->Pc], self->Rot, geo->Contacts[self->Contact++], self->Corners[self->Corner]); 
+
+                    if (move != Tw_NoMove && Tw_Board_IsLegalForPlayer(&board->Board, self->Player, move)) 
+                    {
+                        found = move; 
+                    }
+                }
+
+                // stay on this rotation in case it has more contacts to try 
+                if (found != Tw_NoMove) break; 
+            }
+
+            if (found != Tw_NoMove) break; 
+        }
+
+        if (found != Tw_NoMove) break; 
+    }
+
+    Unborrow(&board->Use, false); 
+
+    if (found == Tw_NoMove) 
+    {
+        // release the board once exhausted 
+        Py_CLEAR(self->Board); 
+        return NULL; 
+    }
+
+    return GetMoveObject(found); 
+}
+
+static PyTypeObject MoveIterType = 
+{
+    .ob_base = PyVarObject_HEAD_INIT(NULL, 0) 
+    .tp_name = "ctilewe.LegalMoveIterator", 
+    .tp_doc = PyDoc_STR("Lazily generates legal moves for a board."), 
+    .tp_basicsize = sizeof(MoveIterObject), 
+    .tp_itemsize = 0, 
+    .tp_flags = Py_TPFLAGS_DEFAULT, 
+    .tp_dealloc = MoveIter_dealloc, 
+    .tp_iter = PyObject_SelfIter, 
+    .tp_iternext = MoveIter_next
+};
+
+static PyObject* Board_IterLegalMoves(BoardObject* self, PyObject* args, PyObject* kwds) 
+{
+    static const char* kwlist[] = 
+    {
+        "for_player", 
+        "pieces", 
+        "corners", 
+        "unique", 
+        NULL
+    };
+
+    PyObject* playerObj = Py_None; 
+    PyObject* piecesObj = Py_None; 
+    PyObject* cornersObj = Py_None; 
+    int unique = true; 
+    int player; 
+    bool wantedPcs[NUM_PIECES]; 
+    bool wantedTiles[BOARD_TILES]; 
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "|OOOp", kwlist, &playerObj, &piecesObj, &cornersObj, &unique)) 
+    {
+        return NULL; 
+    }
+
+    if (!PlayerFromObject(self, playerObj, &player) || 
+        !MaskFromObject(piecesObj, wantedPcs, NUM_PIECES, "pieces must be None or a sequence of pieces") || 
+        !MaskFromObject(cornersObj, wantedTiles, BOARD_TILES, "corners must be None or a sequence of tiles")) 
+    {
+        return NULL; 
+    }
+
+    MoveIterObject* iter = PyObject_New(MoveIterObject, &MoveIterType); 
+    if (!iter) 
+    {
+        return NULL; 
+    }
+
+    iter->Board = (BoardObject*) Py_NewRef(self); 
+    iter->Player = player; 
+    iter->Unique = unique; 
+    iter->Zobrist = self->Zobrist; 
+    iter->Ply = self->Board.Ply; 
+    iter->NumCorners = 0; 
+    iter->NumPcs = 0; 
+    iter->Corner = iter->Pc = iter->Rot = iter->Contact = 0; 
+
+    // only open corners and remaining pieces that pass the filters are visited 
+    Tw_TileList corners; 
+    Tw_InitTileList(&corners); 
+    Tw_Board_PlayerCorners(&self->Board, player, &corners); 
+
+    for (int i = 0; i < corners.Count; i++) 
+    {
+        if (wantedTiles[corners.Elements[i]]) iter->Corners[iter->NumCorners++] = corners.Elements[i]; 
+    }
+
+    Tw_PcList pcs; 
+    Tw_InitPcList(&pcs); 
+    Tw_Board_PlayerPcs(&self->Board, player, &pcs); 
+
+    for (int i = 0; i < pcs.Count; i++) 
+    {
+        if (wantedPcs[pcs.Elements[i]]) iter->Pcs[iter->NumPcs++] = pcs.Elements[i]; 
+    }
+
+    return (PyObject*) iter; 
+}
+
+// counts the positions reached after exactly depth moves (depth >= 1), the last ply is counted without being played 
+static unsigned long long Perft(Tw_Board* board, int depth, MoveBuffer* buffers, bool* success) 
+{
+    MoveBuffer* moves = &buffers[depth - 1]; 
+    moves->Count = 0; 
+
+    if (board->Finished) 
+    {
+        return 0; 
+    }
+
+    if (!GenMovesForPlayer(board, board->CurTurn, true, moves)) 
+    {
+        *success = false; 
+        return 0; 
+    }
+
+    if (depth == 1) 
+    {
+        return (unsigned long long) moves->Count; 
+    }
+
+    unsigned long long nodes = 0; 
+    for (Py_ssize_t i = 0; *success && i < moves->Count; i++) 
+    {
+        Tw_Board_Push(board, moves->Elements[i]); 
+        nodes += Perft(board, depth - 1, buffers, success); 
+        Tw_Board_Pop(board); 
+    }
+
+    return nodes; 
+}
+
+static PyObject* Board_Perft(BoardObject* self, PyObject* args, PyObject* kwds) 
+{
+    static const char* kwlist[] = 
+    {
+        "depth", 
+        "divide", 
+        NULL
+    };
+
+    int depth; 
+    int divide = false; 
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "i|p", kwlist, &depth, &divide)) 
+    {
+        return NULL; 
+    }
+
+    if (depth < 0) 
+    {
+        PyErr_SetString(PyExc_AttributeError, "depth must be non-negative"); 
+        return NULL; 
+    }
+
+    if (depth == 0) 
+    {
+        return divide ? PyDict_New() : PyLong_FromLong(1); 
+    }
+
+    // one move list per ply plus the root moves and their counts when dividing 
+    Tw_Board* board = PyMem_RawMalloc(sizeof(Tw_Board)); 
+    MoveBuffer* buffers = PyMem_RawCalloc(depth, sizeof(MoveBuffer)); 
+    MoveBuffer roots; 
+    MoveBuffer_Init(&roots); 
+    unsigned long long* counts = NULL; 
+    unsigned long long nodes = 0; 
+    bool success = board && buffers; 
+
+    if (success && !Borrow(&self->Use, false)) 
+    {
+        PyMem_RawFree(board); 
+        PyMem_RawFree(buffers); 
+        return NULL; 
+    }
+
+    if (success) 
+    {
+        memcpy(board, &self->Board, sizeof(Tw_Board)); 
+        Unborrow(&self->Use, false); 
+
+        Py_BEGIN_ALLOW_THREADS 
+        if (!divide) 
+        {
+            nodes = Perft(board, depth, buffers, &success); 
+        }
+        else if (board->Finished || GenMovesForPlayer(board, board->CurTurn, true, &roots)) 
+        {
+            if (board->Finished) roots.Count = 0; 
+            counts = PyMem_RawCalloc(roots.Count > 0 ? roots.Count : 1, sizeof(unsigned long long)); 
+            success = counts != NULL; 
+
+            for (Py_ssize_t i = 0; success && i < roots.Count; i++) 
+            {
+                Tw_Board_Push(board, roots.Elements[i]); 
+                counts[i] = depth == 1 ? 1 : Perft(board, depth - 1, buffers, &success); 
+                Tw_Board_Pop(board); 
+            }
+        }
+        else 
+        {
+            success = false; 
+        }
+        Py_END_ALLOW_THREADS 
+    }
+
+    PyObject* out = NULL; 
+
+    if (!success) 
+    {
+        PyErr_NoMemory(); 
+    }
+    else if (!divide) 
+    {
+        out = PyLong_FromUnsignedLongLong(nodes); 
+    }
+    else 
+    {
+        out = PyDict_New(); 
+
+        for (Py_ssize_t i = 0; out && i < roots.Count; i++) 
+        {
+            PyObject* move = GetMoveObject(roots.Elements[i]); 
+            PyObject* count = move ? PyLong_FromUnsignedLongLong(counts[i]) : NULL; 
+
+            if (!count || PyDict_SetItem(out, move, count) < 0) 
+            {
+                Py_CLEAR(out); 
+            }
+
+            Py_XDECREF(move); 
+            Py_XDECREF(count); 
+        }
+    }
+
+    for (int i = 0; buffers && i < depth; i++) 
+    {
+        MoveBuffer_Free(&buffers[i]); 
+    }
+
+    MoveBuffer_Free(&roots); 
+    PyMem_RawFree(counts); 
+    PyMem_RawFree(buffers); 
+    PyMem_RawFree(board); 
+    return out; 
+}
+
+// marks each move's action index in a bool mask, or in a bitset with bit i in byte i / 8 
+static void SetActionMask(const MoveBuffer* moves, unsigned char* mask, bool packed) 
+{
+    for (Py_ssize_t i = 0; i < moves->Count; i++) 
+    {
+        int index = MoveActionIndex(moves->Elements[i]); 
+        if (index < 0) continue; 
+
+        if (packed) 
+        {
+            mask[index >> 3] |= (unsigned char) (1 << (index & 7)); 
+        }
+        else 
+        {
+            mask[index] = 1; 
+        }
+    }
+}
+
+static PyObject* Board_LegalMoveMask(BoardObject* self, PyObject* args, PyObject* kwds) 
+{
+    static const char* kwlist[] = 
+    {
+        "for_player", 
+        "packed", 
+        NULL
+    };
+
+    PyObject* playerObj = Py_None; 
+    int packed = false; 
+    int player; 
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "|Op", kwlist, &playerObj, &packed)) 
+    {
+        return NULL; 
+    }
+
+    if (!PlayerFromObject(self, playerObj, &player)) 
+    {
+        return NULL; 
+    }
+
+    MoveBuffer moves; 
+    MoveBuffer_Init(&moves); 
+
+    if (!Board_GenMovesForPlayer(self, player, true, NULL, NULL, &moves)) 
+    {
+        MoveBuffer_Free(&moves); 
+        return NULL; 
+    }
+
+    PyObject* out; 
+    if (packed) 
+    {
+        out = PyBytes_FromStringAndSize(NULL, (NumActions + 7) / 8); 
+
+        if (out) 
+        {
+            memset(PyBytes_AS_STRING(out), 0, (NumActions + 7) / 8); 
+            SetActionMask(&moves, (unsigned char*) PyBytes_AS_STRING(out), true); 
+        }
+    }
+    else 
+    {
+        Py_ssize_t shape[1] = { NumActions }; 
+        unsigned char* mask = NULL; 
+        out = NewArrayView("?", sizeof(bool), 1, shape, (void**) &mask); 
+
+        if (out) 
+        {
+            SetActionMask(&moves, mask, false); 
+        }
+    }
+
+    MoveBuffer_Free(&moves); 
+    return out; 
+}
+
+static PyObject* Board_ToArray(BoardObject* self, PyObject* Py_UNUSED(ignored)) 
+{
+    return PyMemoryView_FromObject((PyObject*) self); 
+}
+
+static PyObject* Board_CornerMasks(BoardObject* self, PyObject* Py_UNUSED(ignored)) 
+{
+    Py_ssize_t shape[3] = { self->Board.NumPlayers, BOARD_WIDTH, BOARD_WIDTH }; 
+    unsigned char* masks = NULL; 
+
+    PyObject* view = NewArrayView("B", 1, 3, shape, (void**) &masks); 
+
+    if (!view) 
+    {
+        return NULL; 
+    }
+
+    for (int player = 0; player < self->Board.NumPlayers; player++) 
+    {
+        Tw_TileList openCorners; 
+        Tw_InitTileList(&openCorners); 
+        Tw_Board_PlayerCorners(&self->Board, player, &openCorners); 
+
+        for (int i = 0; i < openCorners.Count; i++) 
+        {
+            masks[player * BOARD_TILES + openCorners.Elements[i]] = 1; 
+        }
+    }
+
+    return view; 
+}
+
+static int Board_getbuffer(BoardObject* self, Py_buffer* view, int flags) 
+{
+    static Py_ssize_t shape[2] = { BOARD_WIDTH, BOARD_WIDTH }; 
+    static Py_ssize_t strides[2] = { BOARD_WIDTH, 1 }; 
+
+    if (PyBuffer_FillInfo(view, (PyObject*) self, self->Colors, BOARD_TILES, 1, flags) < 0) 
+    {
+        return -1; 
+    }
+
+    if (flags & PyBUF_ND) 
+    {
+        view->ndim = 2; 
+        view->shape = shape; 
+        view->strides = (flags & PyBUF_STRIDES) == PyBUF_STRIDES ? strides : NULL; 
+    }
+
+    return 0; 
+}
+
+static PyBufferProcs Board_as_buffer = 
+{
+    .bf_getbuffer = Board_getbuffer, 
+    .bf_releasebuffer = NULL
+};
+
+static PyObject* Board_str(BoardObject* self, PyObject* Py_UNUSED(ignored)) 
+{
+    char buf[Tw_BoardStrSize]; 
+    Tw_Board_ToStr(&self->Board, buf); 
+
+    return PyUnicode_FromString(buf); 
+}
+
+static PyGetSetDef Board_getsets[] = 
+{
+    { "moves", Board_Moves, NULL, "Move history", NULL },
+    { "finished", Board_Finished, NULL, "Whether the game is done", NULL },
+    { "n_players", Board_NumPlayers, NULL, "Number of players", NULL },
+    { "current_player", Board_CurrentPlayer, NULL, "Color of the current player", NULL },
+    { "cur_player", Board_CurrentPlayer, NULL, "Color of the current player", NULL },
+    { "ply", Board_Ply, NULL, "Current board ply", NULL },
+    { "scores", Board_Scores, NULL, "Scores of all players", NULL },
+    { "winners", Board_Winners, NULL, "Gets list of player indices who have the highest score", NULL },
+    { "zobrist", Board_ZobristKey, NULL, "64-bit hash of the position, equal for transposed move orders", NULL },
+    { "move_cache", Board_MoveCacheEnabled, Board_SetMoveCacheEnabled, "Whether legal moves are cached per open corner between positions", NULL },
+    { NULL }
+};
+
+static PyMethodDef Board_methods[] = 
+{
+    { "generate_legal_moves", Board_GenMoves, METH_VARARGS | METH_KEYWORDS, "Returns a list of legal moves" }, 
+    { "gen_moves", Board_GenMoves, METH_VARARGS | METH_KEYWORDS, "Returns a list of legal moves" }, 
+    { "generate_legal_moves_packed", Board_GenMovesPacked, METH_VARARGS | METH_KEYWORDS, "Returns legal moves as an array('I') of packed moves" }, 
+    { "push", Board_Push, METH_VARARGS | METH_KEYWORDS, "Plays a move" }, 
+    { "pop", Board_Pop, METH_NOARGS, "Undoes a move" }, 
+    { "color_at", Board_ColorAt, METH_VARARGS | METH_KEYWORDS, "Color that claimed the tile" }, 
+    { "n_legal_moves", Board_NumLegalMoves, METH_VARARGS | METH_KEYWORDS, "Gets total number of legal moves for a player" }, 
+    { "n_remaining_pieces", Board_NumPlayerPcs, METH_VARARGS | METH_KEYWORDS, "Gets total number of pieces remaining for a player" }, 
+    { "remaining_pieces", Board_PlayerPcs, METH_VARARGS | METH_KEYWORDS, "Gets a list of pieces remaining for a player" }, 
+    { "n_player_corners", Board_NumPlayerCorners, METH_VARARGS | METH_KEYWORDS, "Gets total number of open corners for a player" }, 
+    { "player_corners", Board_PlayerCorners, METH_VARARGS | METH_KEYWORDS, "Gets a list of the open corners for a player" }, 
+    { "player_score", Board_PlayerScore, METH_VARARGS | METH_KEYWORDS, "Gets the score of a player" }, 
+    { "can_play", Board_CanPlay, METH_VARARGS | METH_KEYWORDS, "Whether a player has remaining moves" }, 
+    { "is_legal", Board_IsLegal, METH_VARARGS | METH_KEYWORDS, "Whether a move is legal for a player" }, 
+    { "evaluate_moves", Board_EvaluateMoves, METH_VARARGS | METH_KEYWORDS, "Gets statistics about the board after each of the given moves" }, 
+    { "score_moves", Board_ScoreMoves, METH_VARARGS | METH_KEYWORDS, "Sums tile weights over the tiles covered by each move" }, 
+    { "move_effects", Board_MoveEffects, METH_VARARGS | METH_KEYWORDS, "Gets the tiles a move claims and the open corners it creates and removes" }, 
+    { "move_effects_batch", Board_MoveEffectsBatch, METH_VARARGS | METH_KEYWORDS, "Counts the tiles each move claims and the open corners it creates and removes" }, 
+    { "playout", Board_Playout, METH_VARARGS | METH_KEYWORDS, "Plays random games to completion from the current position" }, 
+    { "feature_planes", Board_FeaturePlanes, METH_VARARGS | METH_KEYWORDS, "Gets the board as feature planes and remaining pieces for neural networks" }, 
+    { "iter_legal_moves", Board_IterLegalMoves, METH_VARARGS | METH_KEYWORDS, "Returns an iterator that generates legal moves as they are needed" }, 
+    { "perft", Board_Perft, METH_VARARGS | METH_KEYWORDS, "Counts the positions reached after a number of moves" }, 
+    { "legal_move_mask", Board_LegalMoveMask, METH_VARARGS | METH_KEYWORDS, "Gets a mask of legal moves over the action space" }, 
+    { "to_array", Board_ToArray, METH_NOARGS, "Returns a read-only 20x20 view of each tile's color" }, 
+    { "corner_masks", Board_CornerMasks, METH_NOARGS, "Returns a n_players x 20 x 20 mask of each player's open corners" }, 
+    { "copy", Board_Copy, METH_NOARGS, "Returns a clone of the current board state" }, 
+    { "load_from", Board_LoadFrom, METH_O, "Overwrites this board with the state of another board" }, 
+    { "reset", Board_ResetMethod, METH_VARARGS | METH_KEYWORDS, "Starts a new game on this board" }, 
+    { "__copy__", Board_Copy, METH_NOARGS, "Returns a clone of the current board state" }, 
+    { "__deepcopy__", Board_DeepCopy, METH_O, "Returns a clone of the current board state" }, 
+    { "__reduce__", Board_reduce, METH_NOARGS, "Pickle the board" }, 
+    { "__setstate__", Board_setstate, METH_O, "Un-pickle the board" }, 
+    { NULL }
+};
+
+static PyTypeObject BoardType = 
+{
+    .ob_base = PyVarObject_HEAD_INIT(NULL, 0) 
+    .tp_name = "ctilewe.Board", 
+    .tp_doc = PyDoc_STR("Public representation of a game Board which is how players or bots interface with the game."), 
+    .tp_basicsize = sizeof(BoardObject), 
+    .tp_itemsize = 0, 
+    .tp_flags = Py_TPFLAGS_DEFAULT, 
+    .tp_new = PyType_GenericNew, 
+    .tp_init = Board_init, 
+    .tp_dealloc = Board_dealloc, 
+    .tp_str = Board_str, 
+    .tp_hash = Board_hash, 
+    .tp_richcompare = Board_richcompare, 
+    .tp_as_buffer = &Board_as_buffer, 
+    .tp_getset = Board_getsets, 
+    .tp_methods = Board_methods
+};
+
+typedef struct VectorBoardObject VectorBoardObject; 
+
+// many independent games stored contiguously so they can be stepped together 
+struct VectorBoardObject 
+{
+    PyObject_HEAD 
+    Tw_Board* Boards; 
+    Py_ssize_t NumBoards; 
+    int NumPlayers; 
+    BorrowFlag Use; 
+};
+
+static void VectorBoard_dealloc(VectorBoardObject* self) 
+{
+    PyMem_RawFree(self->Boards); 
+    Py_TYPE(self)->tp_free((PyObject*) self); 
+}
+
+static int VectorBoard_init(VectorBoardObject* self, PyObject* args, PyObject* kwds) 
+{
+    static const char* kwlist[] = { "n_boards", "n_players", NULL }; 
+
+    Py_ssize_t numBoards; 
+    int numPlayers = 4; 
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "n|i", kwlist, &numBoards, &numPlayers)) 
+    {
+        return -1; 
+    }
+
+    if (numBoards < 1) 
+    {
+        PyErr_SetString(PyExc_AttributeError, "n_boards must be at least 1"); 
+        return -1; 
+    }
+
+    if (numPlayers < 1 || numPlayers > 4) 
+    {
+        PyErr_SetString(PyExc_AttributeError, "n_players must be between 1 and 4"); 
+        return -1; 
+    }
+
+    Tw_Board* boards = PyMem_RawCalloc(numBoards, sizeof(Tw_Board)); 
+    if (!boards) 
+    {
+        PyErr_NoMemory(); 
+        return -1; 
+    }
+
+    for (Py_ssize_t i = 0; i < numBoards; i++) 
+    {
+        Tw_InitBoard(&boards[i], numPlayers); 
+    }
+
+    if (!Borrow(&self->Use, true)) 
+    {
+        PyMem_RawFree(boards); 
+        return -1; 
+    }
+
+    PyMem_RawFree(self->Boards); 
+    self->Boards = boards; 
+    self->NumBoards = numBoards; 
+    self->NumPlayers = numPlayers; 
+    Unborrow(&self->Use, true); 
+    return 0; 
+}
+
+static Py_ssize_t VectorBoard_len(VectorBoardObject* self) 
+{
+    return self->NumBoards; 
+}
+
+static PyObject* VectorBoard_NumBoards(VectorBoardObject* self, void* closure) 
+{
+    return PyLong_FromSsize_t(self->NumBoards); 
+}
+
+static PyObject* VectorBoard_NumPlayers(VectorBoardObject* self, void* closure) 
+{
+    return PyLong_FromLong(self->NumPlayers); 
+}
+
+static PyObject* VectorBoard_Finished(VectorBoardObject* self, void* closure) 
+{
+    if (!Borrow(&self->Use, false)) 
+    {
+        return NULL; 
+    }
+
+    bool* finished = NULL; 
+    PyObject* view = NewArrayView("?", sizeof(bool), 1, &self->NumBoards, (void**) &finished); 
+
+    for (Py_ssize_t i = 0; view && i < self->NumBoards; i++) 
+    {
+        finished[i] = self->Boards[i].Finished; 
+    }
+
+    Unborrow(&self->Use, false); 
+    return view; 
+}
+
+static PyObject* VectorBoard_CurrentPlayers(VectorBoardObject* self, void* closure) 
+{
+    if (!Borrow(&self->Use, false)) 
+    {
+        return NULL; 
+    }
+
+    int* players = NULL; 
+    PyObject* view = NewArrayView("i", sizeof(int), 1, &self->NumBoards, (void**) &players); 
+
+    for (Py_ssize_t i = 0; view && i < self->NumBoards; i++) 
+    {
+        players[i] = self->Boards[i].CurTurn; 
+    }
+
+    Unborrow(&self->Use, false); 
+    return view; 
+}
+
+static PyObject* VectorBoard_Scores(VectorBoardObject* self, void* closure) 
+{
+    if (!Borrow(&self->Use, false)) 
+    {
+        return NULL; 
+    }
+
+    Py_ssize_t shape[2] = { self->NumBoards, self->NumPlayers }; 
+    int* scores = NULL; 
+    PyObject* view = NewArrayView("i", sizeof(int), 2, shape, (void**) &scores); 
+
+    for (Py_ssize_t i = 0; view && i < self->NumBoards; i++) 
+    {
+        for (int player = 0; player < self->NumPlayers; player++) 
+        {
+            scores[i * self->NumPlayers + player] = self->Boards[i].Players[player].Score; 
+        }
+    }
+
+    Unborrow(&self->Use, false); 
+    return view; 
+}
+
+static PyObject* VectorBoard_Step(VectorBoardObject* self, PyObject* args, PyObject* kwds) 
+{
+    static const char* kwlist[] = { "moves", NULL }; 
+
+    PyObject* movesObj; 
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O", kwlist, &movesObj)) 
+    {
+        return NULL; 
+    }
+
+    MoveBuffer moves; 
+    MoveBuffer_Init(&moves); 
+
+    if (!MovesFromObject(movesObj, &moves, false)) 
+    {
+        MoveBuffer_Free(&moves); 
+        return NULL; 
+    }
+
+    if (moves.Count != self->NumBoards) 
+    {
+        MoveBuffer_Free(&moves); 
+        PyErr_SetString(PyExc_AttributeError, "moves must have one entry per board"); 
+        return NULL; 
+    }
+
+    if (!Borrow(&self->Use, true)) 
+    {
+        MoveBuffer_Free(&moves); 
+        return NULL; 
+    }
+
+    // check every move before playing any so a bad batch leaves all boards untouched 
+    Py_ssize_t illegal = -1; 
+
+    Py_BEGIN_ALLOW_THREADS 
+    for (Py_ssize_t i = 0; illegal < 0 && i < self->NumBoards; i++) 
+    {
+        const Tw_Board* board = &self->Boards[i]; 
+        Tw_Move move = moves.Elements[i]; 
+
+        if (!board->Finished && !(IsValidMove(move) && Tw_Board_IsLegalForPlayer(board, board->CurTurn, move))) 
+        {
+            illegal = i; 
+        }
+    }
+
+    // entries for finished boards are ignored 
+    for (Py_ssize_t i = 0; illegal < 0 && i < self->NumBoards; i++) 
+    {
+        if (!self->Boards[i].Finished) 
+        {
+            Tw_Board_Push(&self->Boards[i], moves.Elements[i]); 
+        }
+    }
+    Py_END_ALLOW_THREADS 
+
+    Unborrow(&self->Use, true); 
+    MoveBuffer_Free(&moves); 
+
+    if (illegal >= 0) 
+    {
+        PyErr_Format(PyExc_AttributeError, "move for board %zd must be legal", illegal); 
+        return NULL; 
+    }
+
+    Py_RETURN_NONE; 
+}
+
+static PyObject* VectorBoard_Reset(VectorBoardObject* self, PyObject* args, PyObject* kwds) 
+{
+    static const char* kwlist[] = { "mask", NULL }; 
+
+    PyObject* maskObj = Py_None; 
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "|O", kwlist, &maskObj)) 
+    {
+        return NULL; 
+    }
+
+    if (maskObj == Py_None) 
+    {
+        if (!Borrow(&self->Use, true)) 
+        {
+            return NULL; 
+        }
+
+        for (Py_ssize_t i = 0; i < self->NumBoards; i++) 
+        {
+            Tw_InitBoard(&self->Boards[i], self->NumPlayers); 
+        }
+
+        Unborrow(&self->Use, true); 
+        Py_RETURN_NONE; 
     }
 
-    return true;
-}
-
-// TODO use better way that doesn't duplicate so much code 
-static bool ForPlayerAndMoveArgHandler(BoardObject* self, PyObject* args, PyObject* kwds, Tw_Move* move, int* player) 
-{
-    static const char* kwlist[] = 
+    PyObject* seq = PySequence_Fast(maskObj, "mask must be a sequence with one entry per board"); 
+    if (!seq) 
     {
-        "move", 
-        "for_player", 
-        NULL
-    };
+        return NULL; 
+    }
 
-    MoveObject* moveObj; 
-    *player = Tw_Color_None; 
+    if (PySequence_Fast_GET_SIZE(seq) != self->NumBoards) 
+    {
+        Py_DECREF(seq); 
+        PyErr_SetString(PyExc_AttributeError, "mask must have one entry per board"); 
+        return NULL; 
+    }
 
-    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|i", kwlist, &moveObj, player)) 
+    // read the whole mask first since converting entries can run arbitrary Python code 
+    bool* reset = PyMem_Malloc(self->NumBoards * sizeof(bool)); 
+    if (!reset) 
     {
-        *move = (unsigned) Tw_NoMove; 
-        *player = -1; 
-        return false;
+        Py_DECREF(seq); 
+        return PyErr_NoMemory(); 
     }
 
-    if (!PyObject_TypeCheck(moveObj, &MoveType)) 
+    for (Py_ssize_t i = 0; i < self->NumBoards; i++) 
     {
-        PyErr_SetString(PyExc_AttributeError, "Must be a move"); 
-        return false; 
+        int value = PyObject_IsTrue(PySequence_Fast_GET_ITEM(seq, i)); 
+
+        if (value < 0) 
+        {
+            PyMem_Free(reset); 
+            Py_DECREF(seq); 
+            return NULL; 
+        }
+
+        reset[i] = value; 
     }
 
-    *move = moveObj->Move; 
+    Py_DECREF(seq); 
 
-    if (*player == Tw_Color_None) 
+    if (!Borrow(&self->Use, true)) 
     {
-        *player = self->Board.CurTurn; 
+        PyMem_Free(reset); 
+        return NULL; 
     }
 
-    if (*player < 0 || *player >= self->Board.NumPlayers) 
+    for (Py_ssize_t i = 0; i < self->NumBoards; i++) 
     {
-        *move = (unsigned) Tw_NoMove; 
-        *player = -1; 
-        PyErr_SetString(PyExc_AttributeError, "for_player must be valid or None"); 
-        return false;
+        if (reset[i]) 
+        {
+            Tw_InitBoard(&self->Boards[i], self->NumPlayers); 
+        }
     }
 
-    return true;
+    Unborrow(&self->Use, true); 
+    PyMem_Free(reset); 
+    Py_RETURN_NONE; 
 }
 
-static PyObject* Board_NumLegalMoves(BoardObject* self, PyObject* args, PyObject* kwds) 
+static PyObject* VectorBoard_GenMovesPacked(VectorBoardObject* self, PyObject* Py_UNUSED(ignored)) 
 {
-    int player;
-    if (!ForPlayerArgHandler(self, args, kwds, &player))
+    MoveBuffer moves; 
+    MoveBuffer_Init(&moves); 
+
+    long long* offsets = PyMem_Malloc((self->NumBoards + 1) * sizeof(long long)); 
+    if (!offsets) 
     {
-        return NULL;
+        return PyErr_NoMemory(); 
     }
 
-    return PyLong_FromLong(Tw_Board_NumMovesForPlayer(&self->Board, (Tw_Color) player)); 
-}
+    if (!Borrow(&self->Use, false)) 
+    {
+        PyMem_Free(offsets); 
+        return NULL; 
+    }
 
-static PyObject* Board_PlayerPcs(BoardObject* self, PyObject* args, PyObject* kwds) 
-{
-    int player;
-    if (!ForPlayerArgHandler(self, args, kwds, &player))
+    // moves for board i are moves[offsets[i]:offsets[i + 1]], finished boards have none 
+    bool success = true; 
+    offsets[0] = 0; 
+
+    Py_BEGIN_ALLOW_THREADS 
+    for (Py_ssize_t i = 0; success && i < self->NumBoards; i++) 
     {
-        return NULL;
+        const Tw_Board* board = &self->Boards[i]; 
+
+        success = board->Finished || GenMovesForPlayer(board, board->CurTurn, true, &moves); 
+        offsets[i + 1] = moves.Count; 
     }
+    Py_END_ALLOW_THREADS 
 
-    // get a list of the player's pieces
-    Tw_PcList pcs;
-    Tw_InitPcList(&pcs);
-    Tw_Board_PlayerPcs(&self->Board, player, &pcs);
+    Unborrow(&self->Use, false); 
 
-    // build Python list of the pieces
-    PyObject* list = PyList_New(pcs.Count); 
-    for (int i = 0; i < pcs.Count; i++) {
-        PyList_SetItem(
-            list, 
-            i, 
-            PyLong_FromUnsignedLong((unsigned long) pcs.Elements[i])
-        ); 
+    if (!success) 
+    {
+        PyMem_Free(offsets); 
+        MoveBuffer_Free(&moves); 
+        return PyErr_NoMemory(); 
     }
 
-    return list; 
-}
+    PyObject* movesArray = PackMoves(&moves); 
+    PyObject* offsetsArray = movesArray ? NewPackedArray("q", offsets, (self->NumBoards + 1) * sizeof(long long)) : NULL; 
 
-static PyObject* Board_NumPlayerPcs(BoardObject* self, PyObject* args, PyObject* kwds) 
-{
-    int player;
-    if (!ForPlayerArgHandler(self, args, kwds, &player))
+    PyMem_Free(offsets); 
+    MoveBuffer_Free(&moves); 
+
+    if (!offsetsArray) 
     {
-        return NULL;
+        Py_XDECREF(movesArray); 
+        return NULL; 
     }
 
-    return PyLong_FromLong(Tw_Board_NumPlayerPcs(&self->Board, (Tw_Color) player)); 
+    return Py_BuildValue("(NN)", movesArray, offsetsArray); 
 }
 
-static PyObject* Board_PlayerCorners(BoardObject* self, PyObject* args, PyObject* kwds) 
+static PyObject* VectorBoard_LegalMoveMasks(VectorBoardObject* self, PyObject* Py_UNUSED(ignored)) 
 {
-    int player;
-    if (!ForPlayerArgHandler(self, args, kwds, &player))
+    Py_ssize_t shape[2] = { self->NumBoards, NumActions }; 
+    unsigned char* masks = NULL; 
+    PyObject* view = NewArrayView("?", sizeof(bool), 2, shape, (void**) &masks); 
+
+    if (!view || !Borrow(&self->Use, false)) 
     {
-        return NULL;
+        Py_XDECREF(view); 
+        return NULL; 
     }
 
-    // get a list of the player's open corners
-    Tw_TileList openCorners;
-    Tw_InitTileList(&openCorners);
-    Tw_Board_PlayerCorners(&self->Board, player, &openCorners);
+    // finished boards have no legal moves 
+    MoveBuffer moves; 
+    MoveBuffer_Init(&moves); 
+    bool success = true; 
 
-    // build Python list of the open corner tiles
-    PyObject* list = PyList_New(openCorners.Count); 
-    for (int i = 0; i < openCorners.Count; i++) {
-        PyList_SetItem(
-            list, 
-            i, 
-            PyLong_FromUnsignedLong((unsigned long) openCorners.Elements[i])
-        ); 
+    Py_BEGIN_ALLOW_THREADS 
+    for (Py_ssize_t i = 0; success && i < self->NumBoards; i++) 
+    {
+        const Tw_Board* board = &self->Boards[i]; 
+        moves.Count = 0; 
+
+        success = board->Finished || GenMovesForPlayer(board, board->CurTurn, true, &moves); 
+        SetActionMask(&moves, masks + i * NumActions, false); 
     }
+    Py_END_ALLOW_THREADS 
 
-    return list; 
-}
+    Unborrow(&self->Use, false); 
+    MoveBuffer_Free(&moves); 
 
-static PyObject* Board_PlayerScore(BoardObject* self, PyObject* args, PyObject* kwds) 
-{
-    int player;
-    if (!ForPlayerArgHandler(self, args, kwds, &player))
+    if (!success) 
     {
-        return NULL;
+        Py_DECREF(view); 
+        return PyErr_NoMemory(); 
     }
 
-    return PyLong_FromLong(self->Board.Players[player].Score); 
+    return view; 
 }
 
-static PyObject* Board_CanPlay(BoardObject* self, PyObject* args, PyObject* kwds) 
+static PyObject* VectorBoard_Board(VectorBoardObject* self, PyObject* args, PyObject* kwds) 
 {
-    int player;
-    if (!ForPlayerArgHandler(self, args, kwds, &player))
+    static const char* kwlist[] = { "index", NULL }; 
+
+    Py_ssize_t index; 
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "n", kwlist, &index)) 
     {
-        return NULL;
+        return NULL; 
     }
 
-    return PyBool_FromLong((long) self->Board.Players[player].CanPlay); 
-}
+    if (index < 0) index += self->NumBoards; 
 
-static PyObject* Board_NumPlayerCorners(BoardObject* self, PyObject* args, PyObject* kwds) 
-{
-    int player;
-    if (!ForPlayerArgHandler(self, args, kwds, &player))
+    if (index < 0 || index >= self->NumBoards) 
     {
-        return NULL;
+        PyErr_SetString(PyExc_IndexError, "board index out of range"); 
+        return NULL; 
     }
 
-    return PyLong_FromLong(Tw_Board_NumPlayerCorners(&self->Board, player)); 
-}
+    BoardObject* board = (BoardObject*) BoardType.tp_alloc(&BoardType, 0); 
 
-static PyObject* Board_IsLegal(BoardObject* self, PyObject* args, PyObject* kwds) 
-{
-    int player;
-    Tw_Move move; 
-    if (!ForPlayerAndMoveArgHandler(self, args, kwds, &move, &player))
+    if (!board || !Borrow(&self->Use, false)) 
     {
-        return NULL;
+        Py_XDECREF(board); 
+        return NULL; 
     }
 
-    return PyBool_FromLong(Tw_Board_IsLegalForPlayer(&self->Board, (Tw_Color) player, move)); 
-}
+    memcpy(&board->Board, &self->Boards[index], sizeof(Tw_Board)); 
+    Unborrow(&self->Use, false); 
+    Board_SyncMirror(board); 
 
-static PyObject* Board_Pop(BoardObject* self, PyObject* Py_UNUSED(ignored)) 
-{
-    Tw_Board_Pop(&self->Board); 
-    Py_RETURN_NONE; 
+    return (PyObject*) board; 
 }
 
-static PyObject* Board_str(BoardObject* self, PyObject* Py_UNUSED(ignored)) 
+static PyGetSetDef VectorBoard_getsets[] = 
 {
-    char buf[Tw_BoardStrSize]; 
-    Tw_Board_ToStr(&self->Board, buf); 
-
-    return PyUnicode_FromString(buf); 
-}
+    { "n_boards", VectorBoard_NumBoards, NULL, "Number of boards", NULL }, 
+    { "n_players", VectorBoard_NumPlayers, NULL, "Number of players on each board", NULL }, 
+    { "finished", VectorBoard_Finished, NULL, "Gets a n_boards view of whether each game is done", NULL }, 
+    { "current_players", VectorBoard_CurrentPlayers, NULL, "Gets a n_boards view of the player to move on each board", NULL }, 
+    { "scores", VectorBoard_Scores, NULL, "Gets a n_boards x n_players view of each board's scores", NULL }, 
+    { NULL }
+};
 
-static PyGetSetDef Board_getsets[] = 
+static PyMethodDef VectorBoard_methods[] = 
 {
-    { "moves", Board_Moves, NULL, "Move history", NULL },
-    { "finished", Board_Finished, NULL, "Whether the game is done", NULL },
-    { "n_players", Board_NumPlayers, NULL, "Number of players", NULL },
-    { "current_player", Board_CurrentPlayer, NULL, "Color of the current player", NULL },
-    { "cur_player", Board_CurrentPlayer, NULL, "Color of the current player", NULL },
-    { "ply", Board_Ply, NULL, "Current board ply", NULL },
-    { "scores", Board_Scores, NULL, "Scores of all players", NULL },
-    { "winners", Board_Winners, NULL, "Gets list of player indices who have the highest score", NULL },
+    { "step", VectorBoard_Step, METH_VARARGS | METH_KEYWORDS, "Plays one move on every unfinished board" }, 
+    { "reset", VectorBoard_Reset, METH_VARARGS | METH_KEYWORDS, "Restarts the masked boards, or all boards" }, 
+    { "generate_legal_moves_packed", VectorBoard_GenMovesPacked, METH_NOARGS, "Returns packed legal moves for every board and each board's offset into them" }, 
+    { "legal_move_masks", VectorBoard_LegalMoveMasks, METH_NOARGS, "Returns a n_boards x ACTION_COUNT mask of each board's legal moves" }, 
+    { "board", VectorBoard_Board, METH_VARARGS | METH_KEYWORDS, "Returns a copy of one board as a Board" }, 
     { NULL }
 };
 
-static PyMethodDef Board_methods[] = 
+static PySequenceMethods VectorBoard_as_sequence = 
 {
-    { "generate_legal_moves", Board_GenMoves, METH_VARARGS | METH_KEYWORDS, "Returns a list of legal moves" }, 
-    { "gen_moves", Board_GenMoves, METH_VARARGS | METH_KEYWORDS, "Returns a list of legal moves" }, 
-    { "push", Board_Push, METH_VARARGS | METH_KEYWORDS, "Plays a move" }, 
-    { "pop", Board_Pop, METH_NOARGS, "Undoes a move" }, 
-    { "color_at", Board_ColorAt, METH_VARARGS | METH_KEYWORDS, "Color that claimed the tile" }, 
-    { "n_legal_moves", Board_NumLegalMoves, METH_VARARGS | METH_KEYWORDS, "Gets total number of legal moves for a player" }, 
-    { "n_remaining_pieces", Board_NumPlayerPcs, METH_VARARGS | METH_KEYWORDS, "Gets total number of pieces remaining for a player" }, 
-    { "remaining_pieces", Board_PlayerPcs, METH_VARARGS | METH_KEYWORDS, "Gets a list of pieces remaining for a player" }, 
-    { "n_player_corners", Board_NumPlayerCorners, METH_VARARGS | METH_KEYWORDS, "Gets total number of open corners for a player" }, 
-    { "player_corners", Board_PlayerCorners, METH_VARARGS | METH_KEYWORDS, "Gets a list of the open corners for a player" }, 
-    { "player_score", Board_PlayerScore, METH_VARARGS | METH_KEYWORDS, "Gets the score of a player" }, 
-    { "can_play", Board_CanPlay, METH_VARARGS | METH_KEYWORDS, "Whether a player has remaining moves" }, 
-    { "is_legal", Board_IsLegal, METH_VARARGS | METH_KEYWORDS, "Whether a move is legal for a player" }, 
-    // { "copy", Board_Copy, METH_NOARGS, "Returns a clone of the current board state" }, 
-    { NULL }
+    .sq_length = VectorBoard_len
 };
 
-static PyTypeObject BoardType = 
+static PyTypeObject VectorBoardType = 
 {
     .ob_base = PyVarObject_HEAD_INIT(NULL, 0) 
-    .tp_name = "ctilewe.Board", 
-    .tp_doc = PyDoc_STR("Public representation of a game Board which is how players or bots interface with the game."), 
-    .tp_basicsize = sizeof(BoardObject), 
+    .tp_name = "ctilewe.VectorBoard", 
+    .tp_doc = PyDoc_STR("Many independent game boards that are stepped together."), 
+    .tp_basicsize = sizeof(VectorBoardObject), 
     .tp_itemsize = 0, 
     .tp_flags = Py_TPFLAGS_DEFAULT, 
     .tp_new = PyType_GenericNew, 
-    .tp_init = Board_init, 
-    .tp_str = Board_str, 
-    .tp_getset = Board_getsets, 
-    .tp_methods = Board_methods
+    .tp_init = VectorBoard_init, 
+    .tp_dealloc = VectorBoard_dealloc, 
+    .tp_as_sequence = &VectorBoard_as_sequence, 
+    .tp_getset = VectorBoard_getsets, 
+    .tp_methods = VectorBoard_methods
 };
 
 static bool TileArgHandler(PyObject* args, PyObject* kwds, bool checkBounds, Tw_Tile* tile) 
@@ -857,7 +4247,7 @@ static PyObject* Tilewe_PcContacts(PyObject* self, PyObject* args, PyObject* kwd
 
     PyObject* list = PyList_New(0); 
 
-    Tw_TileSet_FOR_EACH(Tw_RotPcInfos[Tw_ToRotPc(pc, Tw_Rot_N)].Contacts, tile, 
+    Tw_TileSet_FOR_EACH(Tw_RotPcInfos[Tw_ToRotPc(pc, rot)].Contacts, tile, 
     {
         PyList_Append(list, PyLong_FromLong((long) tile)); 
     });
@@ -947,18 +4337,136 @@ static PyObject* Tilewe_PlayRandomGame(PyObject* self, PyObject* args)
     Tw_MoveList moves[1]; 
     Tw_InitBoard(board, 4); 
 
+    Py_BEGIN_ALLOW_THREADS 
     while (!board->Finished) 
     {
         Tw_InitMoveList(moves); 
         Tw_Board_GenMoves(board, moves); 
         Tw_Board_Push(board, moves->Elements[rand() % moves->Count]); 
     }
+    Py_END_ALLOW_THREADS 
 
     Tw_Board_Print(board); 
 
     Py_RETURN_NONE; 
 }
 
+static PyObject* Tilewe_MoveToIndex(PyObject* self, PyObject* args, PyObject* kwds) 
+{
+    static const char* kwlist[] = 
+    {
+        "move", 
+        NULL
+    };
+
+    PyObject* moveObj; 
+    Tw_Move move; 
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O", kwlist, &moveObj)) 
+    {
+        return NULL; 
+    }
+
+    if (!MoveFromObject(moveObj, &move)) 
+    {
+        return NULL; 
+    }
+
+    int index = MoveActionIndex(move); 
+    if (index < 0) 
+    {
+        PyErr_SetString(PyExc_AttributeError, "move must be valid"); 
+        return NULL; 
+    }
+
+    return PyLong_FromLong(index); 
+}
+
+static PyObject* Tilewe_IndexToMove(PyObject* self, PyObject* args, PyObject* kwds) 
+{
+    static const char* kwlist[] = 
+    {
+        "index", 
+        NULL
+    };
+
+    long index; 
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "l", kwlist, &index)) 
+    {
+        return NULL; 
+    }
+
+    Tw_Move move = ActionIndexMove(index); 
+    if (move == Tw_NoMove) 
+    {
+        PyErr_SetString(PyExc_AttributeError, "index must be between 0 and ACTION_COUNT and describe a valid move"); 
+        return NULL; 
+    }
+
+    return GetMoveObject(move); 
+}
+
+static PyObject* Tilewe_UnpackMoves(PyObject* self, PyObject* args, PyObject* kwds) 
+{
+    static const char* kwlist[] = 
+    {
+        "moves", 
+        NULL
+    };
+
+    PyObject* movesObj; 
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O", kwlist, &movesObj)) 
+    {
+        return NULL; 
+    }
+
+    MoveBuffer moves; 
+    MoveBuffer_Init(&moves); 
+    if (!MovesFromObject(movesObj, &moves, true)) 
+    {
+        MoveBuffer_Free(&moves); 
+        return NULL; 
+    }
+
+    Py_ssize_t count = moves.Count > 0 ? moves.Count : 1; 
+    unsigned char* pcs = PyMem_Malloc(count); 
+    unsigned char* rots = PyMem_Malloc(count); 
+    unsigned short* cons = PyMem_Malloc(count * sizeof(unsigned short)); 
+    unsigned short* tiles = PyMem_Malloc(count * sizeof(unsigned short)); 
+    PyObject* out = NULL; 
+
+    if (pcs && rots && cons && tiles) 
+    {
+        for (Py_ssize_t i = 0; i < moves.Count; i++) 
+        {
+            Tw_Move move = moves.Elements[i]; 
+            pcs[i] = (unsigned char) Tw_Move_Pc(move); 
+            rots[i] = (unsigned char) Tw_Move_Rot(move); 
+            cons[i] = (unsigned short) Tw_Move_Con(move); 
+            tiles[i] = (unsigned short) Tw_Move_ToTile(move); 
+        }
+
+        out = Py_BuildValue("(NNNN)", 
+            NewPackedArray("B", pcs, moves.Count), 
+            NewPackedArray("B", rots, moves.Count), 
+            NewPackedArray("H", cons, moves.Count * sizeof(unsigned short)), 
+            NewPackedArray("H", tiles, moves.Count * sizeof(unsigned short))
+        );
+    }
+    else 
+    {
+        PyErr_NoMemory(); 
+    }
+
+    PyMem_Free(pcs); 
+    PyMem_Free(rots); 
+    PyMem_Free(cons); 
+    PyMem_Free(tiles); 
+    MoveBuffer_Free(&moves); 
+    return out; 
+}
+
 static PyMethodDef TileweMethods[] = 
 {
     { "play_random_game", Tilewe_PlayRandomGame, METH_NOARGS, "Plays a random game" }, 
@@ -971,6 +4479,9 @@ static PyMethodDef TileweMethods[] =
     { "n_piece_corners", Tilewe_NumPcCorners, METH_VARARGS | METH_KEYWORDS, "Gets number of corners in a piece" }, 
     { "piece_tiles", Tilewe_PcTiles, METH_VARARGS | METH_KEYWORDS, "Gets tiles in a rotated piece" }, 
     { "piece_contacts", Tilewe_PcContacts, METH_VARARGS | METH_KEYWORDS, "Gets contacts in a rotated piece" }, 
+    { "move_to_index", Tilewe_MoveToIndex, METH_VARARGS | METH_KEYWORDS, "Gets the action index of a move" }, 
+    { "index_to_move", Tilewe_IndexToMove, METH_VARARGS | METH_KEYWORDS, "Gets the move with an action index" }, 
+    { "unpack_moves", Tilewe_UnpackMoves, METH_VARARGS | METH_KEYWORDS, "Splits packed moves into piece, rotation, contact, and to_tile arrays" }, 
     { NULL, NULL, 0, NULL }
 };
 
@@ -986,14 +4497,30 @@ static PyModuleDef TileweModule =
 PyMODINIT_FUNC PyInit_ctilewe(void) 
 {
     Tw_Init(); 
+    InitGeometry(); 
+    InitZobrist(); 
 
     PyObject* m; 
 
+    PyObject* arrayModule = PyImport_ImportModule("array"); 
+    if (!arrayModule) return NULL; 
+    ArrayModuleType = PyObject_GetAttrString(arrayModule, "array"); 
+    Py_DECREF(arrayModule); 
+    if (!ArrayModuleType) return NULL; 
+
     if (PyType_Ready(&BoardType) < 0) return NULL; 
     if (PyType_Ready(&MoveType) < 0) return NULL; 
+    if (PyType_Ready(&ArrayType) < 0) return NULL; 
+    if (PyType_Ready(&VectorBoardType) < 0) return NULL; 
+    if (PyType_Ready(&MoveIterType) < 0) return NULL; 
 
     if (!(m = PyModule_Create(&TileweModule))) return NULL; 
 
+#ifdef Py_GIL_DISABLED
+    // shared board state is guarded by BorrowFlag and the module's tables are only written during init 
+    PyUnstable_Module_SetGIL(m, Py_MOD_GIL_NOT_USED); 
+#endif
+
     Py_INCREF(&BoardType); 
     if (PyModule_AddObject(m, "Board", (PyObject*) &BoardType) < 0) 
     {
@@ -1010,5 +4537,19 @@ PyMODINIT_FUNC PyInit_ctilewe(void)
         return NULL; 
     }
 
+    if (PyModule_AddIntConstant(m, "ACTION_COUNT", NumActions) < 0) 
+    {
+        Py_DECREF(m); 
+        return NULL; 
+    }
+
+    Py_INCREF(&VectorBoardType); 
+    if (PyModule_AddObject(m, "VectorBoard", (PyObject*) &VectorBoardType) < 0) 
+    {
+        Py_DECREF(&VectorBoardType); 
+        Py_DECREF(m); 
+        return NULL; 
+    }
+
     return m; 
 }
@@ -0,0 +1,455 @@
+import unittest
+import random
+import copy
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from array import array
+
+import tilewe
+
+def play_random_moves(board: tilewe.Board, n_moves: int) -> None:
+    # plays up to n_moves seeded random moves, sorted so the game is reproducible
+    for _ in range(n_moves):
+        if board.finished:
+            break
+        board.push(random.choice(sorted(board.generate_legal_moves(), key=lambda m: str(m))))
+
+class TestBoard(unittest.TestCase):
+
+    def test_copy_matches_original(self):
+        random.seed(0)
+        board = tilewe.Board(4)
+        play_random_moves(board, 12)
+
+        for clone in [board.copy(), copy.copy(board), copy.deepcopy(board)]:
+            # assert that the clone has the same state as the original
+            self.assertEqual([str(m) for m in clone.moves], [str(m) for m in board.moves])
+            self.assertEqual(clone.ply, board.ply)
+            self.assertEqual(clone.current_player, board.current_player)
+            self.assertEqual(clone.scores, board.scores)
+            self.assertEqual(str(clone), str(board))
+            self.assertEqual(clone, board)
+            self.assertEqual(clone.zobrist, board.zobrist)
+
+    def test_copy_is_independent(self):
+        random.seed(0)
+        board = tilewe.Board(4)
+        play_random_moves(board, 8)
+
+        clone = board.copy()
+        before = str(board)
+
+        # assert that changes to the clone do not affect the original
+        play_random_moves(clone, 4)
+        self.assertEqual(str(board), before)
+        self.assertEqual(board.ply, 8)
+        self.assertEqual(clone.ply, 12)
+
+        # assert that the clone can undo history it inherited from the original
+        for _ in range(12):
+            clone.pop()
+        self.assertEqual(clone.ply, 0)
+        self.assertEqual(str(clone), str(tilewe.Board(4)))
+        self.assertEqual(str(board), before)
+
+    def test_reset_and_load_from(self):
+        random.seed(13)
+        board = tilewe.Board(4)
+        play_random_moves(board, 10)
+
+        # assert that loading copies the full state and history into an existing board
+        target = tilewe.Board(2)
+        target.load_from(board)
+        self.assertEqual(target, board)
+        self.assertEqual(target.moves, board.moves)
+        self.assertEqual(target.zobrist, board.zobrist)
+        self.assertEqual(str(target), str(board))
+        self.assertEqual(target.to_array().tolist(), board.to_array().tolist())
+
+        # assert that the loaded board is independent and can undo the copied history
+        play_random_moves(target, 2)
+        self.assertEqual(board.ply, 10)
+        for _ in range(12):
+            target.pop()
+        self.assertEqual(target, tilewe.Board(4))
+
+        # assert that reset starts a new game in place
+        board.reset()
+        self.assertEqual(board, tilewe.Board(4))
+        self.assertEqual(board.ply, 0)
+        self.assertEqual(board.zobrist, tilewe.Board(4).zobrist)
+        board.reset(n_players=3)
+        self.assertEqual(board, tilewe.Board(3))
+        self.assertEqual(board.n_players, 3)
+
+        self.assertRaises(AttributeError, board.reset, 5)
+        self.assertRaises(AttributeError, board.load_from, "board")
+
+    def test_pickle_round_trip(self):
+        random.seed(8)
+        board = tilewe.Board(3)
+        play_random_moves(board, 15)
+
+        clone = pickle.loads(pickle.dumps(board))
+
+        # assert that the unpickled board has the same state and history
+        self.assertEqual(clone, board)
+        self.assertEqual(clone.n_players, 3)
+        self.assertEqual(clone.moves, board.moves)
+        self.assertEqual(str(clone), str(board))
+        self.assertEqual(clone.zobrist, board.zobrist)
+
+        # assert that the history is stored compactly and bad states are rejected
+        self.assertLess(len(pickle.dumps(board)), 200)
+        self.assertRaises(ValueError, tilewe.Board().__setstate__, b"\xff\xff\xff\xff")
+        self.assertRaises(ValueError, tilewe.Board().__setstate__, "moves")
+
+    def test_to_array_matches_color_at(self):
+        random.seed(1)
+        board = tilewe.Board(4)
+        play_random_moves(board, 16)
+
+        view = board.to_array()
+        self.assertEqual(view.shape, (20, 20))
+        self.assertTrue(view.readonly)
+
+        # assert that the view is indexed by [y][x] and matches color_at for every tile
+        for tile in tilewe.TILES:
+            x, y = tilewe.tile_to_coords(tile)
+            self.assertEqual(view[y, x], board.color_at(tile))
+
+    def test_to_array_tracks_push_and_pop(self):
+        random.seed(2)
+        board = tilewe.Board(4)
+        view = board.to_array()
+
+        # assert that the view is a live view of the board
+        self.assertEqual(sum(1 for row in view.tolist() for c in row if c != tilewe.NO_COLOR), 0)
+        play_random_moves(board, 8)
+        self.assertEqual(sum(1 for row in view.tolist() for c in row if c != tilewe.NO_COLOR), sum(board.scores))
+
+        for _ in range(8):
+            board.pop()
+        self.assertEqual(sum(1 for row in view.tolist() for c in row if c != tilewe.NO_COLOR), 0)
+
+        # assert that popping past the start of the game is an error
+        self.assertRaises(IndexError, board.pop)
+
+    def test_corner_masks(self):
+        random.seed(3)
+        board = tilewe.Board(3)
+        play_random_moves(board, 9)
+
+        masks = board.corner_masks()
+        self.assertEqual(masks.shape, (3, 20, 20))
+
+        # assert that each player's mask is exactly their open corners
+        for player in range(board.n_players):
+            corners = sorted(
+                tilewe.coords_to_tile((x, y)) for y in range(20) for x in range(20) if masks[player, y, x]
+            )
+            self.assertEqual(corners, sorted(board.player_corners(player)))
+
+    def test_feature_planes(self):
+        random.seed(9)
+        board = tilewe.Board(3)
+        play_random_moves(board, 10)
+        n = tilewe.COLOR_COUNT
+
+        planes, pieces = board.feature_planes(perspective=False)
+        self.assertEqual(planes.shape, (tilewe.FEATURE_PLANE_COUNT, 20, 20))
+        self.assertEqual(pieces.shape, (4, 21))
+
+        # assert that each plane matches the single tile queries
+        for player in range(board.n_players):
+            corners = board.player_corners(player)
+            remaining = board.remaining_pieces(player)
+
+            for tile in tilewe.TILES:
+                x, y = tilewe.tile_to_coords(tile)
+                claimed = board.color_at(tile) != tilewe.NO_COLOR
+                next_to_own = any(
+                    tilewe.coords_in_bounds((x + dx, y + dy)) and 
+                    board.color_at(tilewe.coords_to_tile((x + dx, y + dy))) == player
+                    for dx, dy in [(1, 0), (-1, 0), (0, 1), (0, -1)]
+                )
+                self.assertEqual(planes[player, y, x], board.color_at(tile) == player)
+                self.assertEqual(planes[n + player, y, x], tile in corners)
+                self.assertEqual(planes[2 * n + player, y, x], claimed or next_to_own)
+                self.assertEqual(planes[3 * n + player, y, x], player == board.current_player)
+
+            for piece in tilewe.PIECES:
+                self.assertEqual(pieces[player, piece], piece in remaining)
+
+        # assert that missing players are empty
+        planes_list, pieces_list = planes.tolist(), pieces.tolist()
+        for group in range(4):
+            self.assertFalse(any(v for row in planes_list[group * n + 3] for v in row))
+        self.assertFalse(any(pieces_list[3]))
+
+        # assert that perspective rotates players so the current player comes first
+        rotated, rotated_pieces = [view.tolist() for view in board.feature_planes()]
+        for player in range(board.n_players):
+            slot = (player - board.current_player) % board.n_players
+            for group in range(4):
+                self.assertEqual(rotated[group * n + slot], planes_list[group * n + player])
+            self.assertEqual(rotated_pieces[slot], pieces_list[player])
+
+        # assert that caller buffers are filled in place
+        out_planes = array('f', [0.0]) * (tilewe.FEATURE_PLANE_COUNT * 400)
+        out_pieces = bytearray(4 * 21)
+        result = board.feature_planes(out_planes, out_pieces, perspective=False)
+        self.assertIs(result[0], out_planes)
+        self.assertIs(result[1], out_pieces)
+        self.assertEqual(list(out_planes), [float(v) for v in planes.tobytes()])
+        self.assertEqual(bytes(out_pieces), pieces.tobytes())
+        self.assertRaises(AttributeError, board.feature_planes, array('d', [0.0]) * (tilewe.FEATURE_PLANE_COUNT * 400))
+        self.assertRaises(AttributeError, board.feature_planes, bytearray(10))
+
+    def test_zobrist_push_pop(self):
+        random.seed(4)
+        board = tilewe.Board(4)
+        keys = [board.zobrist]
+
+        for _ in range(10):
+            play_random_moves(board, 1)
+            keys.append(board.zobrist)
+
+        # assert that every position along the game has a different key
+        self.assertEqual(len(set(keys)), len(keys))
+
+        # assert that popping restores the earlier keys
+        for ply in range(10, 0, -1):
+            self.assertEqual(board.zobrist, keys[ply])
+            board.pop()
+        self.assertEqual(board.zobrist, keys[0])
+        self.assertEqual(board.zobrist, tilewe.Board(4).zobrist)
+
+        # assert that the number of players is part of the position
+        self.assertNotEqual(tilewe.Board(2).zobrist, tilewe.Board(4).zobrist)
+        self.assertNotEqual(tilewe.Board(2), tilewe.Board(4))
+
+    def test_zobrist_transposition(self):
+        board = tilewe.Board(1)
+        board.push(tilewe.Move(tilewe.O1, tilewe.NORTH, tilewe.A01, tilewe.A01))
+        board.push(tilewe.Move(tilewe.I2, tilewe.NORTH, tilewe.A01, tilewe.B02))
+
+        # find two moves that can be played in either order
+        moves = sorted(board.generate_legal_moves(), key=lambda m: str(m))
+        pair = None
+        for first in moves:
+            board.push(first)
+            for second in board.generate_legal_moves():
+                board.pop()
+                legal_first = board.is_legal(second)
+                board.push(first)
+                if second.piece != first.piece and legal_first:
+                    pair = (first, second)
+                    break
+            board.pop()
+            if pair is not None:
+                break
+        self.assertIsNotNone(pair)
+
+        a = board.copy()
+        a.push(pair[0])
+        a.push(pair[1])
+
+        b = board.copy()
+        b.push(pair[1])
+        b.push(pair[0])
+
+        # assert that both orders reach the same position with the same hash
+        self.assertEqual(a.zobrist, b.zobrist)
+        self.assertEqual(hash(a), hash(b))
+        self.assertEqual(a, b)
+        self.assertEqual(len({a, b}), 1)
+
+        # assert that different positions compare unequal
+        a.pop()
+        self.assertNotEqual(a, b)
+        self.assertNotEqual(a.zobrist, b.zobrist)
+
+    def test_evaluate_moves_matches_push_pop(self):
+        random.seed(5)
+        board = tilewe.Board(3)
+        play_random_moves(board, 9)
+        before = str(board)
+
+        moves = board.generate_legal_moves()
+        stats = board.evaluate_moves(moves)
+        self.assertEqual(stats["scores"].shape, (len(moves), 3))
+        self.assertEqual(stats["finished"].shape, (len(moves),))
+
+        # assert that each row matches the board state after pushing that move
+        for i, move in enumerate(moves):
+            board.push(move)
+            for player in range(board.n_players):
+                self.assertEqual(stats["scores"][i, player], board.scores[player])
+                self.assertEqual(stats["corners"][i, player], board.n_player_corners(player))
+                self.assertEqual(stats["legal_moves"][i, player], board.n_legal_moves(for_player=player))
+                self.assertEqual(stats["can_play"][i, player], board.can_play(for_player=player))
+            self.assertEqual(stats["finished"][i], board.finished)
+            self.assertEqual(stats["zobrist"][i], board.zobrist)
+            board.pop()
+
+        # assert that the board is unchanged and features can be selected
+        self.assertEqual(str(board), before)
+        self.assertEqual(list(board.evaluate_moves(moves[:2], features=["corners"])), ["corners"])
+        self.assertEqual(board.evaluate_moves([], features=["scores"])["scores"].shape, (0, 3))
+        self.assertRaises(AttributeError, board.evaluate_moves, moves, ["bogus"])
+
+    def test_score_moves(self):
+        random.seed(10)
+        board = tilewe.Board(4)
+        play_random_moves(board, 12)
+        weights = [random.randint(-50, 50) for _ in tilewe.TILES]
+
+        def expected(move: tilewe.Move) -> float:
+            offset = move.to_tile - move.contact
+            return float(sum(weights[tile + offset] for tile in tilewe.piece_tiles(move.piece, move.rotation)))
+
+        moves = board.generate_legal_moves()
+        scores = board.score_moves(weights)
+        self.assertEqual(scores.typecode, 'd')
+
+        # assert that each total matches summing the weights in Python
+        self.assertEqual(list(scores), [expected(move) for move in moves])
+        self.assertEqual(board.score_moves(array('f', weights), moves[:3]).tolist(), scores.tolist()[:3])
+        self.assertEqual(board.score_moves(array('d', weights), board.generate_legal_moves_packed()), scores)
+
+        # assert that bad weights are rejected
+        self.assertRaises(AttributeError, board.score_moves, weights[:399])
+        self.assertRaises(AttributeError, board.score_moves, array('i', weights))
+
+    def test_move_effects(self):
+        random.seed(12)
+
+        # assert that the effects match pushing each move, both for a first move and a later one
+        for n_moves in [0, 14]:
+            board = tilewe.Board(4)
+            play_random_moves(board, n_moves)
+            before = str(board)
+            player = board.current_player
+            corners_before = [set(board.player_corners(p)) for p in range(4)]
+
+            moves = board.generate_legal_moves()
+            batch = board.move_effects_batch(moves)
+            self.assertEqual(batch["removed_corners"].shape, (len(moves), 4))
+
+            for i, move in enumerate(moves):
+                effects = board.move_effects(move)
+                board.push(move)
+
+                offset = move.to_tile - move.contact
+                corners_after = [set(board.player_corners(p)) for p in range(4)]
+                tiles = [t + offset for t in tilewe.PIECE_TILES[move.piece][move.rotation]]
+                self.assertEqual(sorted(effects["tiles"]), sorted(tiles))
+                self.assertEqual(sorted(effects["new_corners"]), sorted(corners_after[player] - corners_before[player]))
+                for p in range(4):
+                    self.assertEqual(sorted(effects["removed_corners"][p]), sorted(corners_before[p] - corners_after[p]))
+
+                n_corners = len(corners_before[player]) - len(effects["removed_corners"][player]) + len(effects["new_corners"])
+                self.assertEqual(n_corners, board.n_player_corners(player))
+
+                self.assertEqual(batch["tiles"][i], len(effects["tiles"]))
+                self.assertEqual(batch["new_corners"][i], len(effects["new_corners"]))
+                self.assertEqual(batch["removed_corners"].tolist()[i], [len(r) for r in effects["removed_corners"]])
+                board.pop()
+
+            self.assertEqual(str(board), before)
+
+        # assert that the board is unchanged and illegal moves are rejected
+        self.assertEqual(board.move_effects_batch()["tiles"].tolist(), batch["tiles"].tolist())
+        board.push(moves[0])
+        self.assertRaises(AttributeError, board.move_effects, moves[0])
+        self.assertRaises(AttributeError, board.move_effects_batch, [moves[0]])
+
+    def test_move_cache(self):
+        random.seed(11)
+        board = tilewe.Board(4)
+        cached = tilewe.Board(4)
+        cached.move_cache = True
+        self.assertFalse(board.move_cache)
+        self.assertTrue(cached.move_cache)
+
+        def assert_same_moves():
+            for player in range(4):
+                for unique in [True, False]:
+                    expected = board.generate_legal_moves(for_player=player, unique=unique)
+                    self.assertEqual(sorted(cached.generate_legal_moves(for_player=player, unique=unique)), sorted(expected))
+                self.assertEqual(cached.n_legal_moves(for_player=player), board.n_legal_moves(for_player=player))
+                self.assertEqual(
+                    sorted(cached.generate_legal_moves(for_player=player, pieces=[tilewe.L5, tilewe.T4, tilewe.O1])), 
+                    sorted(board.generate_legal_moves(for_player=player, pieces=[tilewe.L5, tilewe.T4, tilewe.O1]))
+                )
+
+        # assert that cached moves stay correct as moves are played and undone
+        for _ in range(30):
+            if board.finished:
+                break
+            move = random.choice(sorted(board.generate_legal_moves()))
+            board.push(move)
+            cached.push(move)
+            assert_same_moves()
+
+            if random.random() < 0.3:
+                board.pop()
+                cached.pop()
+                assert_same_moves()
+
+        # assert that copies keep the cache and evaluate_moves counts match either way
+        clone = cached.copy()
+        self.assertTrue(clone.move_cache)
+        moves = board.generate_legal_moves()
+        self.assertEqual(
+            clone.evaluate_moves(moves, ["legal_moves"])["legal_moves"].tolist(), 
+            board.evaluate_moves(moves, ["legal_moves"])["legal_moves"].tolist()
+        )
+
+        clone.move_cache = False
+        self.assertFalse(clone.move_cache)
+        self.assertEqual(clone.generate_legal_moves(), board.generate_legal_moves())
+
+    def test_playout(self):
+        random.seed(6)
+        board = tilewe.Board(3)
+        play_random_moves(board, 30)
+        before = str(board)
+
+        scores, wins = board.playout(8, seed=1)
+        self.assertEqual(len(scores), 3)
+        self.assertAlmostEqual(sum(wins), 8)
+
+        # assert that playouts are reproducible and do not modify the board
+        self.assertEqual(board.playout(8, seed=1), (scores, wins))
+        self.assertEqual(board.playout(8, seed=1, weighted=True), board.playout(8, seed=1, weighted=True))
+        self.assertEqual(str(board), before)
+
+        # assert that every game scores at least the current score
+        for player in range(board.n_players):
+            self.assertGreaterEqual(scores[player], board.scores[player] * 8)
+
+        # assert that playouts from a finished game return its result
+        while not board.finished:
+            board.push(board.generate_legal_moves()[0])
+        scores, wins = board.playout(4)
+        self.assertEqual(list(scores), [score * 4 for score in board.scores])
+        self.assertEqual([player for player in range(3) if wins[player] > 0], board.winners)
+
+    def test_threads_share_board(self):
+        random.seed(7)
+        board = tilewe.Board(4)
+        play_random_moves(board, 8)
+
+        def work(seed: int):
+            return board.generate_legal_moves_packed().tolist(), board.n_legal_moves(), board.playout(2, seed=seed)
+
+        # assert that reading the board from several threads at once matches reading it serially
+        with ThreadPoolExecutor(4) as pool:
+            results = list(pool.map(work, range(8)))
+        self.assertEqual(results, [work(seed) for seed in range(8)])
+        self.assertEqual(board.ply, 8)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,10 +1,12 @@
 import unittest 
 import logging
 import random
+import threading
+import time
 import sys
 
 import tilewe
-from tilewe.engine import RandomEngine
+from tilewe.engine import RandomEngine, SimpleSearchEngine, AlphaBetaEngine, MCTSEngine, ParallelEngine
 
 class TestGameplay(unittest.TestCase): 
 
@@ -102,6 +104,277 @@ class TestGameplay(unittest.TestCase):
             taken_start_corners = sum([1 for c in start_corners if board.color_at(c) != tilewe.NO_COLOR])
             self.assertEqual(taken_start_corners, board.n_players)
 
+    def test_alpha_beta_matches_minimax(self):
+        random.seed(1)
+        board = tilewe.Board(3)
+        while board.n_legal_moves() > 12 or board.ply < 30:
+            board.push(random.choice(sorted(board.generate_legal_moves(), key=lambda m: str(m))))
+        before = str(board)
+
+        engine = AlphaBetaEngine(max_depth=2)
+        player = board.current_player
+
+        def minimax(depth: int) -> float:
+            # plain paranoid minimax without pruning or the transposition table
+            if depth == 0 or board.finished:
+                return engine.default_eval(board, player)
+            values = []
+            for move in board.generate_legal_moves():
+                board.push(move)
+                values.append(minimax(depth - 1))
+                board.pop()
+            return max(values) if board.current_player == player else min(values)
+
+        expected = minimax(2)
+        move = engine.search(board, 60)
+
+        # assert that the search reached full depth and chose a move with the minimax value
+        self.assertEqual(engine.depth_reached, 2)
+        self.assertEqual(str(board), before)
+        board.push(move)
+        self.assertAlmostEqual(minimax(1), expected)
+        board.pop()
+
+        # assert that searching again reuses the transposition table
+        engine.search(board, 60)
+        self.assertGreater(engine.table_hits, 0)
+
+    def test_alpha_beta_custom_eval_respects_time(self):
+        random.seed(6)
+        board = tilewe.Board(4)
+
+        def slow_eval(b: tilewe.Board, player: tilewe.Color) -> float:
+            time.sleep(0.001)
+            return b.scores[player]
+
+        # assert that evaluating every root move one at a time still stops in time
+        engine = AlphaBetaEngine(eval_board=slow_eval)
+        start = time.monotonic()
+        move = engine.search(board, 0.2)
+        self.assertLess(time.monotonic() - start, 0.25)
+        self.assertTrue(board.is_legal(move))
+
+    def test_mcts_reuses_tree(self):
+        random.seed(2)
+        board = tilewe.Board(2)
+        engine = MCTSEngine()
+
+        for _ in range(4):
+            before = str(board)
+            move = engine.search(board, 0.2)
+
+            # assert that the search plays a legal move without changing the board
+            self.assertEqual(str(board), before)
+            self.assertTrue(board.is_legal(move))
+            self.assertGreater(engine.playouts, 0)
+            self.assertGreater(engine.playouts_per_second, 0)
+            board.push(move)
+
+        # assert that the subtree of the moves played since the last search is kept
+        move = engine.search(board, 0.2)
+        child = engine.find_child(0, move.packed)
+        self.assertGreaterEqual(child, 0)
+        kept = engine.visits[child]
+        self.assertGreater(kept, 0)
+
+        board.push(move)
+        engine.search(board, 0.2)
+        self.assertEqual(engine.visits[0], kept + engine.playouts)
+        self.assertEqual(len(engine.parents), len(engine.visits))
+
+        # assert that custom rollouts are used
+        calls = []
+
+        def rollout(b: tilewe.Board) -> list[float]:
+            calls.append(b.ply)
+            return [1.0] + [0.0] * (b.n_players - 1)
+        engine = MCTSEngine(rollout=rollout)
+        engine.search(board, 0.05)
+        self.assertEqual(len(calls), engine.playouts)
+        self.assertRaises(ValueError, MCTSEngine, rollout="greedy")
+
+    def test_parallel_matches_single(self):
+        random.seed(3)
+        board = tilewe.Board(4)
+        for _ in range(6):
+            board.push(random.choice(board.generate_legal_moves()))
+
+        engine = SimpleSearchEngine()
+        engine.set_deadlines(float('inf'))
+        moves = board.generate_legal_moves()
+        expected = engine.rate_moves(board, moves)
+
+        for use_threads in [True, False]:
+            with ParallelEngine(engine, n_workers=3, use_threads=use_threads) as parallel:
+                for _ in range(2):
+                    # assert that the merged ratings of split moves match a single search
+                    before = str(board)
+                    parallel.set_deadlines(time.monotonic() + 60)
+                    self.assertEqual(parallel.rate_moves(board, moves), expected)
+                    self.assertEqual(parallel.results_used, 3)
+                    self.assertEqual(str(board), before)
+
+                    move = parallel.search(board, 2.0)
+                    self.assertEqual(expected[moves.index(move)], max(expected))
+                    self.assertEqual(parallel.results_used, 3)
+                    self.assertFalse(parallel.fell_back)
+
+        # assert that the workers are started up front, so the first short search gets their results
+        with ParallelEngine(SimpleSearchEngine(), n_workers=2) as parallel:
+            move = parallel.search(board, 0.3)
+            self.assertEqual(parallel.results_used, 2)
+            self.assertEqual(expected[moves.index(move)], max(expected))
+
+        # assert that every worker rating all moves averages their ratings
+        with ParallelEngine(MCTSEngine(), n_workers=2, use_threads=True, split=False, margin=0.5) as parallel:
+            # assert that workers use their own generators and leave the global one alone
+            parallel.rng = random.Random(0)
+            state = random.getstate()
+            self.assertTrue(board.is_legal(parallel.search(board, 1.0)))
+            self.assertEqual(parallel.results_used, 2)
+            self.assertEqual(random.getstate(), state)
+
+        # assert that the moves are still rated when every worker misses the deadline
+        class LateEngine(SimpleSearchEngine):
+            def rate_moves(self, board: tilewe.Board, moves: list[tilewe.Move]) -> list[float]:
+                if threading.current_thread() is not threading.main_thread():
+                    time.sleep(0.5)
+                return super().rate_moves(board, moves)
+
+        with ParallelEngine(LateEngine(), n_workers=2, use_threads=True, margin=0.2) as parallel:
+            start = time.monotonic()
+            move = parallel.search(board, 0.3)
+            self.assertLess(time.monotonic() - start, 0.35)
+            self.assertEqual(parallel.results_used, 0)
+            self.assertTrue(parallel.fell_back)
+            self.assertEqual(expected[moves.index(move)], max(expected))
+
+        self.assertRaises(ValueError, ParallelEngine, engine, n_workers=0)
+
+    def test_time_management(self):
+        board = tilewe.Board(4)
+        engine = RandomEngine()
+
+        # assert that the hard and soft deadlines keep back the safety margin
+        start = time.monotonic()
+        engine.search(board, 1.0)
+        self.assertEqual(engine.seconds, 1.0)
+        self.assertAlmostEqual(engine.end_at - start, 1.0 - engine.safety_margin, delta=0.01)
+        self.assertAlmostEqual(engine.soft_end_at - start, (1.0 - engine.safety_margin) * engine.soft_fraction, delta=0.01)
+        self.assertFalse(engine.out_of_time())
+        self.assertFalse(engine.past_soft_deadline())
+
+        # assert that a game clock is spread over the remaining pieces
+        engine.search(board, 10.0, clock=42.0)
+        self.assertEqual(engine.seconds, 2.0)
+        engine.search(board, 10.0, clock=42.0, moves_to_go=6)
+        self.assertEqual(engine.seconds, 7.0)
+        engine.search(board, 1.0, clock=42.0)
+        self.assertEqual(engine.seconds, 1.0)
+
+        # assert that tiny limits are not swallowed by the margin
+        start = time.monotonic()
+        engine.search(board, 0.01)
+        self.assertAlmostEqual(engine.end_at - start, 0.005, delta=0.002)
+
+        # assert that node checks only read the clock every poll_nodes calls
+        engine.poll_nodes = 4
+        engine.set_deadlines(time.monotonic() + 60)
+        self.assertEqual([engine.time_up() for _ in range(5)], [False] * 5)
+        engine.set_deadlines(time.monotonic() - 1)
+        self.assertTrue(engine.time_up())
+        engine.set_deadlines(time.monotonic() + 60)
+        self.assertFalse(engine.time_up())
+        engine.end_at = time.monotonic() - 1
+        self.assertEqual([engine.time_up() for _ in range(4)], [False, False, False, True])
+        self.assertTrue(engine.time_up())
+
+        # assert that work counts towards the next clock read
+        engine.set_deadlines(time.monotonic() + 60)
+        self.assertFalse(engine.time_up())
+        engine.end_at = time.monotonic() - 1
+        self.assertTrue(engine.time_up(engine.poll_nodes))
+
+        # assert that real searches finish within their time
+        random.seed(7)
+        for _ in range(40):
+            board.push(random.choice(board.generate_legal_moves()))
+
+        for seconds in [0.1, 0.3]:
+            engine = AlphaBetaEngine()
+            start = time.monotonic()
+            move = engine.search(board, seconds)
+            self.assertLess(time.monotonic() - start, seconds + 0.05)
+            self.assertTrue(board.is_legal(move))
+
+    def test_eval_cache(self):
+        random.seed(4)
+        board = tilewe.Board(4)
+        for _ in range(8):
+            board.push(random.choice(board.generate_legal_moves()))
+
+        calls = []
+
+        def evaluate(b: tilewe.Board, player: tilewe.Color) -> float:
+            calls.append(b.zobrist)
+            return b.scores[player] - max(b.scores)
+
+        # assert that cached ratings match uncached ones and repeats are lookups
+        moves = board.generate_legal_moves()
+        uncached = SimpleSearchEngine(eval_board=evaluate)
+        uncached.set_deadlines(float('inf'))
+        expected = uncached.rate_moves(board, moves)
+
+        calls.clear()
+        engine = SimpleSearchEngine(eval_board=evaluate, eval_cache_size=len(moves))
+        engine.set_deadlines(float('inf'))
+        self.assertEqual(engine.rate_moves(board, moves), expected)
+        self.assertEqual(engine.eval_cache_misses, len(calls))
+        self.assertEqual(engine.eval_cache_hits + engine.eval_cache_misses, len(moves))
+
+        calls.clear()
+        self.assertEqual(engine.rate_moves(board, moves), expected)
+        self.assertEqual(calls, [])
+        self.assertGreaterEqual(engine.eval_cache_hit_rate, 0.5)
+
+        # assert that the least recently used evaluation is dropped when full
+        engine.eval_cache_size = 2
+        engine.clear_eval_cache()
+        positions = [board.copy() for _ in range(3)]
+        for position, move in zip(positions, moves):
+            position.push(move)
+        for position in positions[:2] + positions[:1] + positions[2:]:
+            engine.eval_function(position, 0)
+        self.assertEqual(list(engine.eval_cache), [(positions[0].zobrist, 0), (positions[2].zobrist, 0)])
+        self.assertEqual((engine.eval_cache_hits, engine.eval_cache_misses), (1, 3))
+
+        # assert that assigning eval_function replaces the evaluation on every path
+        assigned = SimpleSearchEngine(eval_cache_size=len(moves))
+        assigned.eval_function = evaluate
+        assigned.set_deadlines(float('inf'))
+        calls.clear()
+        self.assertEqual(assigned.rate_moves(board, moves), expected)
+        self.assertEqual(assigned.eval_cache_misses, len(calls))
+
+        # assert that the default evaluation's native batches are cached as well
+        for make_engine in [SimpleSearchEngine, lambda **kwargs: AlphaBetaEngine(max_depth=1, **kwargs)]:
+            plain = make_engine()
+            plain.set_deadlines(float('inf'))
+            default_expected = plain.rate_moves(board, moves)
+
+            cached = make_engine(eval_cache_size=len(moves))
+            for _ in range(2):
+                cached.set_deadlines(float('inf'))
+                self.assertEqual(cached.rate_moves(board, moves), default_expected)
+            self.assertGreater(cached.eval_cache_hits, 0)
+            self.assertGreaterEqual(cached.eval_cache_hit_rate, 0.5)
+
+        # assert that the player is part of the key and caching is opt-in
+        engine.eval_function(positions[0], 1)
+        self.assertEqual(engine.eval_cache_misses, 4)
+        self.assertEqual(SimpleSearchEngine().eval_function.__name__, "default_eval")
+        self.assertRaises(ValueError, SimpleSearchEngine, eval_cache_size=-1)
+
 if __name__ == "__main__":
     # enables logging if file run directly instead of through pytest
     logging.basicConfig(stream=sys.stderr)
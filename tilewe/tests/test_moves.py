@@ -1,4 +1,6 @@
 import unittest 
+import pickle
+import copy
 
 import tilewe
 
@@ -145,5 +147,210 @@ class TestMoves(unittest.TestCase):
 
             board.push(unique_moves[0])
 
+    def test_packed_moves_match_moves(self):
+        board = tilewe.Board(4)
+
+        for _ in range(8):
+            moves = board.generate_legal_moves()
+            packed = board.generate_legal_moves_packed()
+
+            # assert that packed moves are the same moves in the same order
+            self.assertEqual(packed.typecode, 'I')
+            self.assertEqual(list(packed), [mv.packed for mv in moves])
+
+            # assert that unpacking gives each move's fields
+            pieces, rotations, contacts, to_tiles = tilewe.unpack_moves(packed)
+            self.assertEqual(list(pieces), [mv.piece for mv in moves])
+            self.assertEqual(list(rotations), [mv.rotation for mv in moves])
+            self.assertEqual(list(contacts), [mv.contact for mv in moves])
+            self.assertEqual(list(to_tiles), [mv.to_tile for mv in moves])
+
+            # assert that packed moves round trip and can be played directly
+            self.assertEqual(tilewe.Move.from_packed(packed[-1]), moves[-1])
+            board.push(packed[-1])
+            self.assertEqual(board.moves[-1], moves[-1])
+
+        # assert that invalid packed moves are rejected
+        self.assertRaises(AttributeError, lambda: board.push(-1))
+        self.assertRaises(AttributeError, lambda: board.push(2 ** 40))
+
+    def test_legal_moves_for_player(self):
+        board = tilewe.Board(4)
+        board.push(board.generate_legal_moves()[0])
+
+        for player in range(board.n_players):
+            moves = board.generate_legal_moves(for_player=player)
+            packed = board.generate_legal_moves_packed(for_player=player)
+
+            # assert that moves are generated for the requested player
+            self.assertEqual(len(moves), board.n_legal_moves(for_player=player))
+            self.assertEqual(list(packed), [mv.packed for mv in moves])
+            for mv in moves:
+                self.assertTrue(board.is_legal(mv, for_player=player))
+
+        # assert that the current player's moves are the same whichever way they're requested
+        self.assertEqual(board.generate_legal_moves(for_player=None), board.generate_legal_moves())
+        self.assertEqual(
+            sorted(board.generate_legal_moves(for_player=board.current_player)), 
+            sorted(board.generate_legal_moves())
+        )
+
+    def test_filtered_legal_moves(self):
+        board = tilewe.Board(3)
+        for index in [3, 17, 8, 40]:
+            board.push(sorted(board.generate_legal_moves())[index])
+
+        pieces = [tilewe.X5, tilewe.L4, tilewe.O1, tilewe.I5]
+        for player in range(board.n_players):
+            corners = board.player_corners(player)[::2]
+            for unique in [True, False]:
+                moves = board.generate_legal_moves(for_player=player, unique=unique)
+                filtered = board.generate_legal_moves(for_player=player, unique=unique, pieces=pieces, corners=corners)
+
+                # assert that filters keep exactly the matching moves in generation order
+                self.assertEqual(filtered, [m for m in moves if m.piece in pieces and m.to_tile in corners])
+                self.assertEqual(
+                    board.generate_legal_moves_packed(for_player=player, unique=unique, corners=corners).tolist(), 
+                    [m.packed for m in moves if m.to_tile in corners]
+                )
+
+            self.assertEqual(
+                board.n_legal_moves(for_player=player, pieces=pieces), 
+                len(board.generate_legal_moves(for_player=player, pieces=pieces))
+            )
+
+        # assert that empty filters find nothing and bad filters are rejected
+        self.assertEqual(board.generate_legal_moves(pieces=[]), [])
+        self.assertEqual(board.n_legal_moves(corners=[]), 0)
+        self.assertRaises(AttributeError, board.generate_legal_moves, pieces=[21])
+        self.assertRaises(AttributeError, board.n_legal_moves, corners=[400])
+
+    def test_piece_geometry_tables(self):
+        # assert that the tables match the module functions for every piece and rotation
+        for piece in tilewe.PIECES:
+            for rot in tilewe.ROTATIONS:
+                self.assertEqual(list(tilewe.PIECE_TILES[piece][rot]), tilewe.piece_tiles(piece, rot))
+                self.assertEqual(list(tilewe.PIECE_CONTACTS[piece][rot]), tilewe.piece_contacts(piece, rot))
+                self.assertEqual(len(tilewe.PIECE_TILES[piece][rot]), tilewe.N_PIECE_TILES[piece])
+                self.assertEqual(len(tilewe.PIECE_CONTACTS[piece][rot]), tilewe.N_PIECE_CONTACTS[piece])
+                self.assertEqual(len(tilewe.PIECE_CORNERS[piece][rot]), tilewe.N_PIECE_CORNERS[piece])
+
+        # assert that contacts follow the rotation and unique rotations match move generation
+        self.assertNotEqual(tilewe.piece_contacts(tilewe.V5, tilewe.NORTH), tilewe.piece_contacts(tilewe.V5, tilewe.EAST))
+        self.assertEqual(sum(sum(flags) for flags in tilewe.PIECE_UNIQUE_ROTATIONS), 91)
+
+        board = tilewe.Board(1)
+        unique = {(m.piece, m.rotation) for m in board.generate_legal_moves(unique=True)}
+        for piece, rot in unique:
+            self.assertTrue(tilewe.PIECE_UNIQUE_ROTATIONS[piece][rot])
+
+    def test_moves_are_shared(self):
+        board = tilewe.Board(4)
+        moves = board.generate_legal_moves()
+
+        # assert that the same move is always the same object
+        for a, b in zip(moves, board.generate_legal_moves()):
+            self.assertIs(a, b)
+
+        move = tilewe.Move(tilewe.O1, tilewe.NORTH, tilewe.A01, tilewe.A01)
+        self.assertIs(move, tilewe.Move.from_packed(move.packed))
+        self.assertIn(move, moves)
+
+        board.push(move)
+        self.assertIs(board.moves[0], move)
+
+        # assert that moves survive pickling and copying
+        self.assertIs(pickle.loads(pickle.dumps(move)), move)
+        self.assertIs(copy.deepcopy(move), move)
+
+    def test_iter_legal_moves(self):
+        board = tilewe.Board(3)
+        for index in [3, 40, 17, 25, 8]:
+            board.push(sorted(board.generate_legal_moves())[index])
+
+        # assert that the iterator yields exactly the generated moves
+        for player in range(board.n_players):
+            for unique in [True, False]:
+                self.assertEqual(
+                    sorted(board.iter_legal_moves(for_player=player, unique=unique)), 
+                    sorted(board.generate_legal_moves(for_player=player, unique=unique))
+                )
+
+        # assert that the filters limit the pieces and corners
+        moves = board.generate_legal_moves()
+        corners = board.player_corners()[:2]
+        self.assertEqual(
+            sorted(board.iter_legal_moves(pieces=[tilewe.I2, tilewe.L5])), 
+            sorted(m for m in moves if m.piece in [tilewe.I2, tilewe.L5])
+        )
+        self.assertEqual(sorted(board.iter_legal_moves(corners=corners)), sorted(m for m in moves if m.to_tile in corners))
+        self.assertEqual(list(board.iter_legal_moves(pieces=[])), [])
+        self.assertRaises(AttributeError, board.iter_legal_moves, pieces=[tilewe.PIECE_COUNT])
+
+        # assert that changing the board stops the iteration
+        moves = board.iter_legal_moves()
+        board.push(next(moves))
+        self.assertRaises(RuntimeError, next, moves)
+
+    def test_perft(self):
+        board = tilewe.Board(3)
+        board.push(board.generate_legal_moves()[10])
+
+        expected = {}
+        for move in board.generate_legal_moves():
+            board.push(move)
+            expected[move] = board.n_legal_moves()
+            board.pop()
+
+        # assert that perft matches counting moves one by one
+        self.assertEqual(board.perft(0), 1)
+        self.assertEqual(board.perft(1), board.n_legal_moves())
+        self.assertEqual(board.perft(2), sum(expected.values()))
+        self.assertEqual(board.perft(2, divide=True), expected)
+        self.assertEqual(board.perft(1, divide=True), dict.fromkeys(expected, 1))
+        self.assertEqual(board.ply, 1)
+        self.assertRaises(AttributeError, board.perft, -1)
+
+    def test_move_hash(self):
+        moves = tilewe.Board(4).generate_legal_moves()
+
+        # assert that moves hash by value so they work as dictionary keys
+        self.assertEqual({move: i for i, move in enumerate(moves)}[moves[-1]], len(moves) - 1)
+        self.assertEqual(hash(moves[-1]), hash(tilewe.Move.from_packed(moves[-1].packed)))
+
+    def test_action_indices(self):
+        board = tilewe.Board(4)
+        moves = board.generate_legal_moves()
+        indices = [tilewe.move_to_index(move) for move in moves]
+
+        # assert that indices are distinct, in range, and convert back to the same move
+        self.assertEqual(len(set(indices)), len(moves))
+        self.assertTrue(all(0 <= index < tilewe.ACTION_COUNT for index in indices))
+        for move, index in zip(moves, indices):
+            self.assertEqual(tilewe.index_to_move(index), move)
+            self.assertEqual(tilewe.move_to_index(move.packed), index)
+
+        # assert that rotations covering the same tiles share an index
+        all_rotations = board.generate_legal_moves(unique=False)
+        self.assertEqual({tilewe.move_to_index(move) for move in all_rotations}, set(indices))
+
+        self.assertRaises(AttributeError, tilewe.index_to_move, -1)
+        self.assertRaises(AttributeError, tilewe.index_to_move, tilewe.ACTION_COUNT)
+
+    def test_legal_move_mask(self):
+        board = tilewe.Board(3)
+        board.push(board.generate_legal_moves()[5])
+
+        for player in range(board.n_players):
+            indices = sorted(tilewe.move_to_index(move) for move in board.generate_legal_moves(for_player=player))
+            mask = board.legal_move_mask(for_player=player)
+            bits = board.legal_move_mask(for_player=player, packed=True)
+
+            # assert that both mask forms mark exactly the legal moves
+            self.assertEqual(len(mask), tilewe.ACTION_COUNT)
+            self.assertEqual([i for i, legal in enumerate(mask.tolist()) if legal], indices)
+            self.assertEqual(len(bits), (tilewe.ACTION_COUNT + 7) // 8)
+            self.assertEqual([i for i in range(tilewe.ACTION_COUNT) if bits[i // 8] >> (i % 8) & 1], indices)
+
 if __name__ == '__main__': 
     unittest.main() 
@@ -0,0 +1,66 @@
+import unittest
+import random
+from array import array
+
+import tilewe
+
+class TestVectorBoard(unittest.TestCase):
+
+    def test_matches_individual_boards(self):
+        random.seed(0)
+        vec = tilewe.VectorBoard(6, n_players=3)
+        boards = [tilewe.Board(3) for _ in range(6)]
+
+        self.assertEqual(len(vec), 6)
+        self.assertEqual(vec.scores.shape, (6, 3))
+
+        while not all(vec.finished.tolist()):
+            moves, offsets = vec.generate_legal_moves_packed()
+            masks = vec.legal_move_masks().tolist()
+            self.assertEqual(len(offsets), 7)
+
+            step = array('I')
+            for i, board in enumerate(boards):
+                legal = moves[offsets[i]:offsets[i + 1]]
+
+                # assert that each board's moves match the single board generator
+                self.assertEqual(sorted(legal), sorted(board.generate_legal_moves_packed()))
+                expected_mask = [False] * tilewe.ACTION_COUNT if board.finished else board.legal_move_mask().tolist()
+                self.assertEqual(masks[i], expected_mask)
+
+                if board.finished:
+                    step.append(0)
+                else:
+                    step.append(random.choice(legal))
+                    board.push(step[-1])
+
+            vec.step(step)
+
+            # assert that the batched state matches the individual boards
+            self.assertEqual(vec.finished.tolist(), [board.finished for board in boards])
+            self.assertEqual(vec.scores.tolist(), [board.scores for board in boards])
+            self.assertEqual(vec.current_players.tolist(), [board.current_player for board in boards])
+
+        for i, board in enumerate(boards):
+            self.assertEqual(vec.board(i), board)
+
+    def test_step_and_reset(self):
+        vec = tilewe.VectorBoard(3, n_players=4)
+        first = tilewe.Board(4).generate_legal_moves()[0]
+
+        # assert that a batch with an illegal move leaves every board untouched
+        vec.step([first, first, first])
+        self.assertRaises(AttributeError, vec.step, [first, first, first])
+        self.assertRaises(AttributeError, vec.step, [first])
+        self.assertEqual([vec.board(i).ply for i in range(3)], [1, 1, 1])
+
+        # assert that only the masked boards are reset
+        vec.reset([False, True, False])
+        self.assertEqual([vec.board(i).ply for i in range(3)], [1, 0, 1])
+        vec.reset()
+        self.assertEqual([vec.board(i).ply for i in range(3)], [0, 0, 0])
+        self.assertEqual(vec.board(-1), tilewe.Board(4))
+        self.assertRaises(IndexError, vec.board, 3)
+
+if __name__ == '__main__':
+    unittest.main()
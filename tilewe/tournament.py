@@ -344,12 +344,7 @@ class Tournament:
 
         with multiprocessing.Pool(n_threads, initializer=init_func, initargs=init_args) as pool: 
             try:
-                for winners, scores, moves, player_to_engine, time_sec in pool.imap_unordered(self._play_game, args): 
-
-                    # re-build the board state from the moves
-                    board = tilewe.Board(len(player_to_engine))
-                    for move in moves: 
-                        board.push(move) 
+                for winners, scores, board, player_to_engine, time_sec in pool.imap_unordered(self._play_game, args): 
 
                     # at least one player always wins, otherwise the game crashed 
                     if len(winners) > 0:
@@ -475,16 +470,16 @@ class Tournament:
         board = tilewe.Board(n_players=len(player_to_engine))
         try: 
             engine_to_player = { value: key for key, value in enumerate(player_to_engine) }
+            board_copies = [tilewe.Board(n_players=len(player_to_engine)) for _ in player_to_engine]
             while not board.finished: 
 
-                # ghetto board copy to avoid exposing the real board to the engine
-                board_copy = tilewe.Board(n_players=len(player_to_engine))
-                for move in board.moves: 
-                    board_copy.push(move) 
+                # copy the board to avoid exposing the real board to the engine, reusing one board object 
+                # per player so that a board given to an engine only changes when it's that engine's turn again 
+                board_copy = board_copies[board.current_player]
+                board_copy.load_from(board)
                 engine = self.engines[player_to_engine[board_copy.current_player]]
 
                 move = engine.search(board_copy, self.move_seconds) 
-                # move = engine.search(board.copy_current_state(), self.move_seconds) 
                 # TODO test legality 
                 board.push(move) 
             end_time = time.time()
@@ -493,7 +488,7 @@ class Tournament:
             winners = [ player_to_engine[x] for x in board.winners ]
             scores = [ board.scores[engine_to_player[i]] if i in engine_to_player else 0 for i in range(len(self.engines)) ]
 
-            return winners, scores, board.moves, player_to_engine, end_time - start_time
+            return winners, scores, board, player_to_engine, end_time - start_time
         
         except BaseException: 
             traceback.print_exc()